@@ -4,6 +4,17 @@ import pytest
 from eaf.state import State
 
 import xoinvader.app
+from xoinvader.common import Snapshot
+
+
+@pytest.fixture(autouse=True, scope="session")
+def snapshot_path(tmp_path_factory):
+    """Keep snapshot written by tests out of user cache."""
+
+    path = Snapshot.path
+    Snapshot.path = tmp_path_factory.mktemp("snapshot") / "snapshot"
+    yield
+    Snapshot.path = path
 
 
 @pytest.fixture
@@ -4,11 +4,26 @@ from math import isclose
 
 import pytest
 
-from xoinvader import animation
-from xoinvader.animation import Animation, AnimationManager
+from xoinvader import animation, utils
+from xoinvader.animation import (
+    Animation,
+    AnimationClip,
+    AnimationManager,
+    AnimationSystem,
+    Track,
+)
 from xoinvader.utils import Point
 
 
+BACKENDS = (
+    False,
+    pytest.param(
+        True,
+        marks=pytest.mark.skipif(animation.numpy is None, reason="NumPy is not installed"),
+    ),
+)
+
+
 # pylint: disable=invalid-name,protected-access,missing-docstring
 # pylint: disable=too-few-public-methods
 class GameObject:
@@ -90,13 +105,85 @@ def test_animation_interp_loop(loop) -> None:
     animgr.update(200)
 
     # if not looped - animation stops
-    # TODO: test StopIteration, now animgr suppresses it
     if loop:
         assert isclose(obj.attr, 0.5, abs_tol=0.01)
         animgr.update(13)
+        assert not animgr.finished
     else:
         assert obj.attr == 1
+        assert animgr.finished
         animgr.update(13)
+        assert obj.attr == 1
+
+
+def test_animation_skips_keyframes() -> None:
+    obj = GameObject()
+    keyframes = [(0.0, 0), (0.1, 1), (0.2, 2), (0.3, 3), (1.0, 4)]
+
+    anim = Animation("discrete", obj, "attr", keyframes)
+    anim.update(250)
+    assert obj.attr == 2
+    anim.update(1000)
+    assert obj.attr == 4
+    with pytest.raises(StopIteration):
+        anim.update(1)
+
+    anim = Animation("interp", obj, "attr", keyframes, interp=True)
+    anim.update(250)
+    assert isclose(obj.attr, 2.5)
+    anim.update(400)
+    assert isclose(obj.attr, 3.5)
+
+
+def test_animation_clip() -> None:
+    with pytest.raises(ValueError):
+        AnimationClip([])
+
+    clip = AnimationClip([(0.0, Point(0, 0)), (1.0, Point(10, 0))], interp=True)
+    first, second = GameObject(), GameObject()
+    anims = [
+        Animation("a", first, "attr", clip=clip, offset=Point(0, 5)),
+        Animation("b", second, "attr", clip=clip, offset=Point(100, 5)),
+    ]
+    assert all(anim.clip is clip for anim in anims)
+
+    for anim in anims:
+        anim.update(500)
+    assert first.attr == Point(5.0, 5)
+    assert second.attr == Point(105.0, 5)
+
+    with pytest.raises(StopIteration):
+        anims[0].update(500)
+    assert first.attr == Point(10, 5)
+    first.attr.x = 0
+    assert clip.track.values[-1] == Point(10, 0)
+
+    discrete = AnimationClip([(0.0, 1), (1.0, 2)])
+    obj = GameObject()
+    anim = Animation("c", obj, "attr", clip=discrete, offset=10)
+    anim.update(1000)
+    assert obj.attr == 12
+
+
+def test_track() -> None:
+    track = Track([(0.5, 1), (1.0, 2), (1.0, 4), (2.0, 0)], interp=True)
+
+    assert len(track) == 4
+    assert track.duration == 2.0
+    assert track.index_at(0.0) == -1
+    assert track.index_at(1.0) == 2
+    assert track.value_at(0.0) == 1
+    assert track.value_at(0.75) == 1.5
+    assert track.value_at(1.0) == 4.0
+    assert track.value_at(1.5) == 2.0
+    assert track.value_at(3.0) == 0
+
+    track = Track([(0.0, Point(0, 0)), (2.0, Point(4, 2))], interp=True)
+    assert track.value_at(1.0) == Point(2.0, 1.0)
+
+    assert Track([(0.0, "a"), (1.0, "b")]).values == ["a", "b"]
+    with pytest.raises(animation.InterpolationUnknownTypes):
+        Track([(0.0, 1), (1.0, Point())], interp=True)
 
 
 def test_animation_manager() -> None:
@@ -125,6 +212,125 @@ def test_animation_manager() -> None:
     assert animgr.update(13) is None
 
 
+def test_animation_graph() -> None:
+    obj = GameObject()
+    animgr = AnimationManager()
+    animgr.add("intro", obj, "attr", keyframes=[(0.0, 0), (0.2, 2)], interp=True)
+    animgr.add("idle", obj, "attr", keyframes=[(0.0, 5), (1.0, 6)], loop=True)
+    animgr.add("hit", obj, "attr", keyframes=[(0.0, 10)])
+
+    with pytest.raises(ValueError):
+        animgr.add_transition("intro", "missing")
+    with pytest.raises(ValueError):
+        animgr.add_transition("intro", "idle", blend=-1)
+
+    animgr.add_transition("intro", "idle")
+    animgr.add_transition(None, "hit", event="damage")
+    animgr.add_transition("hit", "idle")
+
+    assert not animgr.trigger("unknown")
+    animgr.update(100)
+    assert obj.attr == 1
+    animgr.update(100)
+    assert obj.attr == 2 and animgr.animation == "idle"
+    animgr.update(1)
+    assert obj.attr == 5
+
+    assert animgr.trigger("damage")
+    assert animgr.animation == "hit"
+    animgr.update(1)
+    assert obj.attr == 10
+
+    # Discrete animation finishes on update after its last keyframe.
+    animgr.update(1)
+    assert animgr.animation == "idle"
+    animgr.update(1)
+    assert obj.attr == 5
+    assert not animgr.finished
+
+
+def test_animation_graph_blend() -> None:
+    obj = GameObject()
+    animgr = AnimationManager()
+    animgr.add("low", obj, "attr", keyframes=[(0.0, 0), (1.0, 0)], interp=True, loop=True)
+    animgr.add("high", obj, "attr", keyframes=[(0.0, 10), (1.0, 10)], interp=True, loop=True)
+    animgr.add_transition("low", "high", event="up", blend=0.4)
+
+    animgr.update(100)
+    assert obj.attr == 0
+    animgr.trigger("up")
+    animgr.update(100)
+    assert isclose(obj.attr, 2.5)
+    animgr.update(200)
+    assert isclose(obj.attr, 7.5)
+    animgr.update(100)
+    assert obj.attr == 10
+
+
+def test_animation_graph_finished(monkeypatch) -> None:
+    obj = GameObject()
+    animgr = AnimationManager()
+    animgr.add("once", obj, "attr", keyframes=[(0.0, 1)])
+
+    animgr.update(1)
+    animgr.update(1)
+    assert animgr.finished
+
+    calls = []
+    monkeypatch.setattr(animgr._animation, "update", calls.append)
+    animgr.update(1)
+    assert not calls
+
+
+@pytest.mark.parametrize("vectorize", BACKENDS)
+def test_animation_graph_batched(vectorize) -> None:
+    system = AnimationSystem(vectorize)
+    obj = GameObject()
+    animgr = AnimationManager(system)
+    animgr.add("path", obj, "attr", keyframes=PATH, interp=True)
+    back = [(0.0, Point(-5, 7)), (4.0, Point(-5, -1))]
+    animgr.add("back", obj, "attr", keyframes=back, interp=True)
+    animgr.add_transition("path", "back", blend=0.5)
+
+    for _ in range(2):
+        system.update(1000)
+        animgr.update(1000)
+
+    assert animgr.animation == "back"
+    assert animgr._animation in system
+    assert obj.attr == Point(-5, 7)
+
+    system.update(250)
+    animgr.update(250)
+    assert obj.attr == Point(-5.0, 6.75, 0.0)
+
+    for _ in range(4):
+        system.update(1000)
+        animgr.update(1000)
+    assert animgr.finished
+    assert obj.attr == Point(-5, -1)
+    assert not system
+
+
+@pytest.mark.parametrize("vectorize", BACKENDS)
+def test_animation_graph_restart(vectorize) -> None:
+    system = AnimationSystem(vectorize)
+    obj = GameObject()
+    animgr = AnimationManager(system)
+    animgr.add("path", obj, "attr", keyframes=PATH, interp=True)
+    animgr.add_transition("path", "path", event="restart")
+
+    system.update(1000)
+    animgr.update(1000)
+    assert obj.attr == Point(3, 1)
+
+    assert animgr.trigger("restart")
+    assert animgr._animation in system
+    system.update(750)
+    animgr.update(750)
+    assert obj.attr == Point(1.5, 0.5)
+
+
 @pytest.mark.parametrize(
     ("values", "types", "expected"),
     (
@@ -189,3 +395,147 @@ def test_interpolate_positive(args, result) -> None:
 def test_interpolate_negative(args, expected_error) -> None:
     with pytest.raises(expected_error):
         animation.interpolate(*args)
+
+
+PATH = [(0.5, Point(0, 0)), (1.0, Point(3, 1)), (2.0, Point(-5, 7))]
+
+
+@pytest.mark.parametrize("vectorize", BACKENDS)
+@pytest.mark.parametrize("loop", (True, False))
+def test_animation_system(vectorize, loop) -> None:
+    clip = AnimationClip(PATH, interp=True, loop=loop)
+    system = AnimationSystem(vectorize)
+    batched = [GameObject() for _ in range(3)]
+    single = [GameObject() for _ in range(3)]
+
+    managers = []
+    for index, (first, second) in enumerate(zip(batched, single)):
+        offset = Point(index * 10, 1)
+        manager = AnimationManager(system)
+        manager.add("path", first, "attr", clip=clip, offset=offset)
+        managers.append(manager)
+        anim = Animation("path", second, "attr", clip=clip, offset=offset)
+        second.anim = anim
+
+    assert len(system) == 3
+    assert managers[0]._animation in system
+
+    for dt in (100, 500, 33, 700, 1000, 1, 250, 1500):
+        system.update(dt)
+        for manager in managers:
+            manager.update(dt)
+        for obj in single:
+            try:
+                obj.anim.update(dt)
+            except StopIteration:
+                pass
+
+        for first, second in zip(batched, single):
+            assert repr(first.attr) == repr(second.attr)
+
+    assert len(system) == (3 if loop else 0)
+
+    managers[0].stop()
+    managers[0].stop()
+    assert managers[0]._animation not in system
+
+
+def test_animation_system_manager() -> None:
+    system = AnimationSystem(vectorize=False)
+    obj = GameObject()
+    manager = AnimationManager(system)
+
+    manager.add("discrete", obj, "attr", keyframes=[(0.0, Point()), (1.0, Point(1, 1))])
+    manager.add("path", obj, "attr", keyframes=PATH, interp=True)
+    assert not system
+    manager.update(1)
+    assert obj.attr == Point()
+
+    manager.animation = "path"
+    assert len(system) == 1
+    system.update(750)
+    manager.update(750)
+    assert obj.attr == Point(1.5, 0.5)
+
+    # Removed animation continues on its own from the same time.
+    manager.animation = "discrete"
+    assert not system
+    assert manager._animations["path"]._elapsed == 0.75
+
+    assert not AnimationSystem.accepts(Animation("n", obj, "attr", [(0.0, 1), (1.0, 2)], True))
+    assert not AnimationSystem.accepts(Animation("p", obj, "attr", [(0.0, Point())], True))
+
+
+def test_animation_system_no_numpy(monkeypatch) -> None:
+    monkeypatch.setattr(utils, "numpy", None)
+    assert not AnimationSystem()._vectorize
+    with pytest.raises(ValueError):
+        AnimationSystem(vectorize=True)
+
+
+@pytest.mark.parametrize("easing", sorted(animation.EASINGS))
+def test_easing_table(easing) -> None:
+    table = animation.easing_table(easing, size=10)
+    assert len(table) == 11
+    assert isclose(table[0], 0.0, abs_tol=1e-9)
+    assert isclose(table[-1], 1.0)
+    assert list(table) == sorted(table)
+
+
+def test_cubic_bezier() -> None:
+    linear = animation.cubic_bezier(0.0, 0.0, 1.0, 1.0)
+    assert isclose(linear(0.3), 0.3, abs_tol=1e-6)
+
+    ease = animation.cubic_bezier(0.42, 0.0, 0.58, 1.0)
+    assert ease(0.25) < 0.25 < ease(0.75) - 0.5
+    assert isclose(ease(0.5), 0.5, abs_tol=1e-6)
+
+    with pytest.raises(ValueError):
+        animation.cubic_bezier(1.5, 0.0, 0.5, 1.0)
+    with pytest.raises(ValueError):
+        animation.easing_table("missing")
+
+
+def test_bezier_path() -> None:
+    keyframes = animation.bezier_path([Point(0, 0), Point(10, 0), Point(10, 10)], 1.0, 3.0, 4)
+
+    assert [time for time, _ in keyframes] == [1.0, 1.5, 2.0, 2.5, 3.0]
+    assert keyframes[0][1] == Point(0.0, 0.0, 0.0)
+    assert keyframes[2][1] == Point(7.5, 2.5, 0.0)
+    assert keyframes[-1][1] == Point(10.0, 10.0, 0.0)
+
+    with pytest.raises(ValueError):
+        animation.bezier_path([Point()], 0.0, 1.0)
+
+
+def test_track_easing() -> None:
+    track = Track([(0.0, 0), (2.0, 10)], interp=True, easing="ease_in")
+    assert track.value_at(1.0) == 2.5
+    assert track.value_at(2.0) == 10
+
+    track = Track([(0.0, Point(0, 0)), (1.0, Point(4, 8))], interp=True, easing="ease_out")
+    out = Point()
+    assert track.value_at(0.5, Point(1, 1), out) is out
+    assert out == track.value_at(0.5, Point(1, 1)) == Point(4.0, 7.0, 0.0)
+
+
+@pytest.mark.parametrize("vectorize", BACKENDS)
+def test_animation_system_easing(vectorize) -> None:
+    clip = AnimationClip(PATH, interp=True, loop=True, easing="cubic_in_out")
+    system = AnimationSystem(vectorize)
+    first, second = GameObject(), GameObject()
+
+    manager = AnimationManager(system)
+    manager.add("path", first, "attr", clip=clip, offset=Point(3, 3))
+    anim = Animation("path", second, "attr", clip=clip, offset=Point(3, 3))
+
+    for dt in (100, 500, 33, 700, 1000, 1, 250, 1500):
+        system.update(dt)
+        anim.update(dt)
+        assert repr(first.attr) == repr(second.attr)
+
+    # Point is reused between frames.
+    system.update(100)
+    out = first.attr
+    system.update(100)
+    assert first.attr is out
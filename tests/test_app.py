@@ -0,0 +1,166 @@
+"""Test xoinvader.app module."""
+
+import asyncio
+import gc
+import time
+
+import pytest
+
+from xoinvader.app import FixedTimestep, FramePacer
+from xoinvader.headless import HeadlessXOInvader
+
+
+# pylint: disable=invalid-name,protected-access,missing-docstring
+def test_fixed_timestep() -> None:
+    with pytest.raises(ValueError):
+        FixedTimestep(0, 5)
+
+    timestep = FixedTimestep(step=10, max_steps=3)
+    assert timestep.step == 10
+
+    assert timestep.advance(5) == 0
+    assert timestep.alpha == 0.5
+
+    assert timestep.advance(10) == 1
+    assert timestep.alpha == 0.5
+
+    assert timestep.advance(25) == 3
+    assert timestep.alpha == 0.0
+
+
+def test_fixed_timestep_spiral_of_death() -> None:
+    timestep = FixedTimestep(step=10, max_steps=3)
+
+    # Lagging time above cap is dropped, remainder is kept.
+    assert timestep.advance(1004) == 3
+    assert timestep.alpha == pytest.approx(0.4)
+    assert timestep.advance(6) == 1
+
+
+def test_run_async() -> None:
+    frames = []
+
+    def listener(app, dt):
+        frames.append(time.monotonic())
+        if app.frame_count == 5:
+            app.stop()
+
+    async def run():
+        game = HeadlessXOInvader(seed=1)
+        game.add_frame_listener(listener)
+        await asyncio.wait_for(game.run_async(), timeout=5)
+        return game
+
+    game = asyncio.run(run())
+
+    assert game.frame_count == 5
+    assert game._stopped is None
+    # Frames are paced by the period, eaf treats fps as milliseconds.
+    assert frames[-1] - frames[0] >= 4 * game.fps / 1000 * 0.9
+
+    del game
+    gc.collect()
+
+
+class PreloaderMock:
+    done = False
+    progress = 0.5
+
+    def result(self):
+        return None
+
+
+def test_loading_screen() -> None:
+    game = HeadlessXOInvader(seed=1)
+    game.deregister("InGameState")
+    game.state = "LoadingState"
+    game.preloader = PreloaderMock()
+    listened = []
+    game.add_frame_listener(lambda app, dt: listened.append(dt))
+
+    assert game.state.loading_callback() == "Loading... 50%"
+    game._tick()
+    assert game.frame_count == 0
+    assert not listened
+    assert "InGameState" not in game.states
+
+    game.preload_level().result()
+    game._tick()
+    assert game.state is game.states["InGameState"]
+    assert game.frame_count == 1
+    assert listened
+
+    del game
+    gc.collect()
+
+
+class LoopMock:
+    def __init__(self) -> None:
+        self.readers = {}
+
+    def add_reader(self, fd, callback) -> None:
+        self.readers[fd] = callback
+
+    def remove_reader(self, fd) -> None:
+        del self.readers[fd]
+
+
+def test_input_not_watched_while_loading() -> None:
+    game = HeadlessXOInvader(seed=1)
+    game.deregister("InGameState")
+    game.state = "LoadingState"
+    game.preloader = PreloaderMock()
+    loop = LoopMock()
+    game._reader = (loop, 0)
+    game._reader_enabled = True
+    loop.readers[0] = game._on_input
+
+    # Unread input would fire level-triggered reader again and again.
+    game._on_input()
+    assert not loop.readers
+    game._tick()
+    assert not loop.readers
+
+    game.preload_level().result()
+    game._tick()
+    assert loop.readers == {0: game._on_input}
+
+    del game
+    gc.collect()
+
+
+def feed(pacer, cost, interval, frames=FramePacer.WINDOW):
+    changed = False
+    for _ in range(frames):
+        changed |= pacer.update(cost, interval)
+    return changed
+
+
+def test_frame_pacer() -> None:
+    with pytest.raises(ValueError):
+        FramePacer(30, 10)
+
+    pacer = FramePacer(min_fps=10, max_fps=30)
+    assert pacer.target_fps == 30
+    assert pacer.period == pytest.approx(1000 / 30)
+
+    # Overloaded host: rate goes down to the bound.
+    for _ in range(20):
+        feed(pacer, cost=100, interval=100)
+    assert pacer.target_fps == 10
+    assert pacer.actual_fps == pytest.approx(10, rel=0.05)
+    assert not feed(pacer, cost=100, interval=100)
+
+    # Headroom returns: rate goes up by one FPS per window.
+    for _ in range(100):
+        feed(pacer, cost=1, interval=50)
+    assert pacer.target_fps == 30
+    assert pacer.load < 0.5
+
+
+def test_frame_pacer_measure_only() -> None:
+    pacer = FramePacer(min_fps=10, max_fps=30, adaptive=False)
+
+    assert not feed(pacer, cost=100, interval=100, frames=100)
+    assert pacer.target_fps == 30
+    assert pacer.actual_fps == pytest.approx(10, rel=0.05)
@@ -143,3 +143,21 @@ def test_background() -> None:
     assert bg == b.background
     b.update(13)
     assert bg != b.background
+
+
+@pytest.mark.parametrize("dt", [10, 33, 100, 1000])
+def test_background_speed_independent_of_dt(dt) -> None:
+    Settings.layout.field.edge.x = 3
+    Settings.layout.field.edge.y = 2
+
+    b = Background(CHUNK_NORMAL, speed=30, loop_all=True)
+    b.start()
+    advances = []
+    advance_chunk = b._advance_chunk
+    b._advance_chunk = lambda advance: advances.append(advance) or advance_chunk(advance)
+
+    for _ in range(9900 // dt):
+        b.update(dt)
+    b.update(9900 % dt)
+
+    assert len(advances) == 297
@@ -0,0 +1,99 @@
+"""Test xoinvader.charge module."""
+
+import pytest
+
+from xoinvader import charge, utils
+from xoinvader.charge import ChargeSystem
+from xoinvader.common import Settings
+from xoinvader.utils import Point
+
+
+BACKENDS = (
+    False,
+    pytest.param(
+        True,
+        marks=pytest.mark.skipif(charge.numpy is None, reason="NumPy is not installed"),
+    ),
+)
+
+
+# pylint: disable=invalid-name,protected-access,missing-docstring
+# pylint: disable=too-few-public-methods
+class Image:
+    width = 1
+    height = 1
+
+
+class ChargeMock:
+    """Charge mock that deregisters itself on destroy."""
+
+    def __init__(self, system, pos, dx=0, dy=0) -> None:
+        self.pos = pos
+        self.image = Image()
+        self.destroyed = False
+        self._system = system
+        system.add(self, dx, dy)
+
+    def destroy(self) -> None:
+        self.destroyed = True
+        self._system.remove(self)
+
+
+@pytest.mark.parametrize("vectorize", BACKENDS)
+def test_charge_system_movement(vectorize) -> None:
+    system = ChargeSystem(vectorize=vectorize)
+    system.update(100)
+
+    c1 = ChargeMock(system, Point(10, 10), dy=-20)
+    c2 = ChargeMock(system, Point(5, 5), dx=10, dy=20)
+    assert len(system) == 2
+    assert c1 in system
+
+    system.update(500)
+    assert c1.pos == Point(10.0, 0.0)
+    assert c2.pos == Point(10.0, 15.0)
+    assert not c1.destroyed and not c2.destroyed
+
+
+@pytest.mark.parametrize("vectorize", BACKENDS)
+def test_charge_system_culling(vectorize) -> None:
+    system = ChargeSystem(vectorize=vectorize)
+    border = Settings.layout.field.border
+
+    c1 = ChargeMock(system, Point(10, 1), dy=-20)
+    c2 = ChargeMock(system, Point(10, border.y - 1), dy=20)
+    c3 = ChargeMock(system, Point(10, 10), dy=-20)
+
+    system.update(100)
+    assert not c1.destroyed
+    assert not c2.destroyed
+
+    system.update(100)
+    assert c1.destroyed and c2.destroyed and not c3.destroyed
+    assert len(system) == 1
+    assert c1 not in system and c3 in system
+
+    # Moved charge must keep its own slot after swap-removal.
+    system.update(100)
+    assert c3.pos == Point(10.0, 4.0)
+
+
+def test_charge_system_remove() -> None:
+    system = ChargeSystem(vectorize=False)
+    c1 = ChargeMock(system, Point(1, 1), dx=10)
+    c2 = ChargeMock(system, Point(2, 2), dx=20)
+
+    system.remove(c1)
+    system.remove(c1)
+    assert len(system) == 1
+
+    system.update(1000)
+    assert c2.pos == Point(22.0, 2.0)
+
+
+def test_charge_system_no_numpy(monkeypatch) -> None:
+    monkeypatch.setattr(utils, "numpy", None)
+
+    assert not ChargeSystem()._vectorize
+    with pytest.raises(ValueError):
+        ChargeSystem(vectorize=True)
@@ -0,0 +1,121 @@
+"""Test xoinvader.common module."""
+
+import os
+
+import pytest
+
+from xoinvader.common import (
+    CONFIG_SCHEMA,
+    Config,
+    ConfigError,
+    ConfigService,
+    get_config,
+    validate_config,
+)
+
+
+# pylint: disable=missing-docstring
+CONFIG = """
+name = "test"
+
+[section]
+value = 1
+"""
+
+SCHEMA = {"name": str, "section": {"value": int}}
+
+
+def write_config(path, text, mtime) -> None:
+    path.write_text(text)
+    # Explicit modification time, file system clock may be too coarse.
+    os.utime(path, ns=(mtime, mtime))
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / "config.toml"
+    write_config(path, CONFIG, 1_000_000_000)
+    return path
+
+
+def test_get_config_cached() -> None:
+    assert get_config() is get_config()
+    assert get_config() is Config.get()
+    assert Config.section("loop") is get_config().loop
+    validate_config(get_config(), CONFIG_SCHEMA, Config.path)
+
+
+def test_config_service(config_path) -> None:
+    service = ConfigService(config_path, SCHEMA)
+    config = service.get()
+    section = config.section
+
+    assert config.name == "test"
+    assert service.section("section").value == 1
+    assert not service.changed()
+    assert not service.reload_if_changed()
+
+    write_config(config_path, CONFIG.replace("1", "2"), 2_000_000_000)
+    assert service.changed()
+    assert service.reload_if_changed()
+    assert not service.changed()
+
+    # Cached sections are updated in place.
+    assert service.get() is config
+    assert section.value == 2
+
+
+def test_config_service_reload_invalid(config_path) -> None:
+    service = ConfigService(config_path, SCHEMA)
+    config = service.get()
+
+    write_config(config_path, CONFIG.replace("1", '"1"'), 2_000_000_000)
+    with pytest.raises(ConfigError):
+        service.reload()
+
+    assert not service.reload_if_changed()
+    assert not service.changed()
+    assert config.section.value == 1
+
+    write_config(config_path, "name = ", 3_000_000_000)
+    assert not service.reload_if_changed()
+    assert service.get().name == "test"
+
+
+def test_config_service_removed_keys(config_path) -> None:
+    service = ConfigService(config_path, {"name": str})
+    config = service.get()
+
+    write_config(config_path, 'name = "other"', 2_000_000_000)
+    service.reload()
+    assert config == {"name": "other"}
+
+
+@pytest.mark.parametrize(
+    ("config", "message"),
+    [
+        ({"section": {"value": 1}}, "missing 'name'"),
+        ({"name": "test", "section": 1}, "'section' must be section"),
+        ({"name": "test", "section": {}}, "missing 'section.value'"),
+        ({"name": "test", "section": {"value": "1"}}, "'section.value' must be int"),
+    ],
+)
+def test_validate_config(config, message) -> None:
+    with pytest.raises(ConfigError, match=message):
+        validate_config(config, SCHEMA, "config.toml")
+
+
+def test_config_service_on_frame(config_path) -> None:
+    class App:
+        frame_count = 1
+
+    service = ConfigService(config_path, SCHEMA)
+    service.get()
+    write_config(config_path, CONFIG.replace("1", "2"), 2_000_000_000)
+
+    service.on_frame(App, 33)
+    assert service.changed()
+
+    App.frame_count = ConfigService.HOT_RELOAD_INTERVAL
+    service.on_frame(App, 33)
+    assert service.get().section.value == 2
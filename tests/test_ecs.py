@@ -0,0 +1,174 @@
+"""Test xoinvader.ecs module."""
+
+import pytest
+
+from xoinvader.ecs import (
+    INDEX_BITS,
+    ComponentStore,
+    EntityAllocator,
+    EntityNotFound,
+    System,
+    World,
+    entity_generation,
+    entity_index,
+    entity_repr,
+    make_entity,
+)
+
+
+# pylint: disable=invalid-name,protected-access,missing-docstring
+# pylint: disable=too-few-public-methods
+class Position:
+    def __init__(self, x=0, y=0) -> None:
+        self.x = x
+        self.y = y
+
+
+class Velocity:
+    def __init__(self, dx=0, dy=0) -> None:
+        self.dx = dx
+        self.dy = dy
+
+
+class Movement(System):
+    components = (Position, Velocity)
+
+    def update(self, world, dt) -> None:
+        for _, pos, vel in world.view(*self.components):
+            pos.x += vel.dx * dt
+            pos.y += vel.dy * dt
+
+
+def test_entity() -> None:
+    entity = make_entity(1, 2)
+    assert entity == 2 << INDEX_BITS | 1
+    assert entity_index(entity) == 1
+    assert entity_generation(entity) == 2
+    assert entity_repr(entity) == "<Entity 1:2>"
+
+
+def test_entity_allocator() -> None:
+    allocator = EntityAllocator()
+
+    e1 = allocator.create()
+    e2 = allocator.create()
+    assert (e1, e2) == (make_entity(0), make_entity(1))
+    assert len(allocator) == 2
+
+    allocator.destroy(e1)
+    assert not allocator.alive(e1)
+    assert allocator.alive(e2)
+    assert len(allocator) == 1
+    with pytest.raises(EntityNotFound, match="<Entity 0:0> is not alive"):
+        allocator.destroy(e1)
+
+    e3 = allocator.create()
+    assert e3 == make_entity(0, 1)
+    assert not allocator.alive(make_entity(5))
+
+
+def test_component_store() -> None:
+    store = ComponentStore()
+    e1, e2, e3 = make_entity(0), make_entity(5), make_entity(2)
+
+    store.add(e1, "a")
+    store.add(e2, "b")
+    store.add(e3, "c")
+    assert len(store) == 3
+    assert store.get(e2) == "b"
+
+    store.add(e2, "bb")
+    assert len(store) == 3
+    assert store.get(e2) == "bb"
+
+    assert store.remove(e1) == "a"
+    assert store.remove(e1) is None
+    assert e1 not in store
+    assert store.entities.tolist() == [e3, e2]
+    assert store.get(e3) == "c"
+
+    # Stale handle with reused index doesn't match.
+    assert make_entity(2, 1) not in store
+    with pytest.raises(KeyError):
+        store.get(make_entity(2, 1))
+
+
+def test_world_entities() -> None:
+    world = World()
+
+    e1 = world.create(Position())
+    e2 = world.create()
+    assert len(world) == 2
+    assert world.alive(e1)
+
+    world.destroy(e1)
+    assert not world.alive(e1)
+    assert len(world) == 1
+    assert not world.has(e1, Position)
+
+    with pytest.raises(EntityNotFound):
+        world.destroy(e1)
+    with pytest.raises(EntityNotFound):
+        world.add(e1, Position())
+
+    e3 = world.create()
+    assert entity_index(e3) == entity_index(e1)
+    assert entity_generation(e3) == entity_generation(e1) + 1
+    assert world.alive(e2) and world.alive(e3)
+
+
+def test_world_components() -> None:
+    class Base:
+        pass
+
+    class Derived(Base):
+        pass
+
+    world = World()
+    obj = Derived()
+    e = world.create(Position(1, 2))
+    world.add(e, obj, Base)
+
+    assert world.get(e, Base) is obj
+    assert not world.has(e, Derived)
+    assert world.get(e, Position).y == 2
+
+    assert world.remove(e, Base) is obj
+    assert not world.has(e, Base)
+
+
+def test_world_view_and_systems() -> None:
+    world = World()
+    moving = world.create(Position(), Velocity(1, 2))
+    static = world.create(Position(5, 5))
+    world.create(Velocity(3, 3))
+
+    assert list(world.view()) == []
+    assert [entity for entity, _ in world.view(Position)] == [moving, static]
+    assert [entity for entity, *_ in world.view(Position, Velocity)] == [moving]
+
+    system = Movement()
+    world.add_system(system)
+    world.update(10)
+
+    assert world.get(moving, Position).x == 10
+    assert world.get(moving, Position).y == 20
+    assert world.get(static, Position).x == 5
+
+    world.remove_system(system)
+    world.update(10)
+    assert world.get(moving, Position).x == 10
+
+
+def test_world_view_while_destroying() -> None:
+    world = World()
+    entities = [world.create(Position(index, 0)) for index in range(4)]
+
+    seen = []
+    for entity, pos in world.view(Position):
+        seen.append((entity, pos.x))
+        if entity == entities[1]:
+            world.destroy(entities[1])
+            world.destroy(entities[2])
+
+    assert seen == [(entities[0], 0), (entities[1], 1), (entities[3], 3)]
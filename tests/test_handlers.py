@@ -36,7 +36,8 @@ class OwnerMock:  # pylint: disable=too-few-public-methods
 def test_event_handler() -> None:
     """Test xoinvader.handlers.EventHandler."""
 
-    events = handlers.EventHandler(OwnerMock())
+    # Mocked queue repeats key forever, like held key.
+    events = handlers.EventHandler(OwnerMock(), coalesce={EventQueueMock.key})
 
     assert isinstance(events.owner, OwnerMock)
     assert isinstance(events._event_queue, EventQueueMock)
@@ -50,6 +51,7 @@ def test_event_handler() -> None:
     events = handlers.EventHandler(
         OwnerMock(),
         {EventQueueMock.key: lambda: fired.append(EventQueueMock.key)},
+        coalesce={EventQueueMock.key},
     )
 
     events.handle()
@@ -66,3 +68,51 @@ def test_event_handler_negative(monkeypatch) -> None:
     events = handlers.EventHandler(OwnerMock())
     with pytest.raises(ValueError):
         events.handle()
+
+
+class KeysQueueMock:
+    """Event queue mock emitting provided keys, then ERR."""
+
+    def __init__(self, keys) -> None:
+        self._keys = list(keys)
+
+    def getch(self):
+        return self._keys.pop(0) if self._keys else handlers.ERR
+
+
+class KeysOwnerMock(OwnerMock):  # pylint: disable=too-few-public-methods
+    """Owner mock with keys queue."""
+
+    def __init__(self, keys) -> None:
+        self._queue = KeysQueueMock(keys)
+
+    @property
+    def event_queue(self):
+        return self._queue
+
+
+def test_event_handler_batch() -> None:
+    """Test draining and coalescing of input."""
+
+    keys = ["a", "a", "a", "d", "d", "a", "e", "e"]
+
+    events = handlers.EventHandler(KeysOwnerMock(keys))
+    assert [key for _, key in events.event_queue()] == keys
+    assert events.event_queue() == []
+
+    # Toggle pressed twice in one frame toggles twice.
+    events = handlers.EventHandler(KeysOwnerMock([" ", " "]), coalesce={"a", "d"})
+    assert [key for _, key in events.event_queue()] == [" ", " "]
+
+    events = handlers.EventHandler(KeysOwnerMock(keys), coalesce={"a", "d"})
+    assert [key for _, key in events.event_queue()] == ["a", "d", "a", "e", "e"]
+
+    fired = []
+    events = handlers.EventHandler(
+        KeysOwnerMock(["x", "y"] * handlers.MAX_EVENTS),
+        {"x": lambda: fired.append("x"), "y": lambda: fired.append("y")},
+    )
+    events.handle()
+    assert len(fired) == handlers.MAX_EVENTS
+    events.handle()
+    assert len(fired) == 2 * handlers.MAX_EVENTS
@@ -0,0 +1,139 @@
+"""Test xoinvader.headless module."""
+
+import gc
+
+import pytest
+
+from xoinvader.headless import (
+    ERR,
+    FrameStats,
+    HeadlessPalette,
+    HeadlessXOInvader,
+    SimulatedInput,
+)
+from xoinvader.keys import KEY
+from xoinvader.scheduler import Phase
+from xoinvader.ship import GenericXEnemy, spawn_formation
+
+
+# pylint: disable=invalid-name,protected-access,missing-docstring
+@pytest.fixture
+def headless_app(request):
+
+    def stop() -> None:
+        gc.collect()
+
+    request.addfinalizer(stop)
+    return HeadlessXOInvader
+
+
+def test_simulated_input() -> None:
+    def keys(seed):
+        queue = SimulatedInput(seed)
+        pressed = []
+        for _ in range(100):
+            queue.next_frame()
+            key = queue.getch()
+            while key != ERR:
+                pressed.append(key)
+                key = queue.getch()
+        return pressed
+
+    assert keys(1) == keys(1)
+    assert keys(1) != keys(2)
+    assert keys(1)[0] == KEY.SPACE
+
+
+def test_headless_palette() -> None:
+    palette = HeadlessPalette([("ui_norm", 7, 0), ("ui_yellow", 3, 0)])
+    palette.init_colors()
+
+    assert palette.ui_yellow == 2 << 8
+    assert palette["default"] == 0
+    assert palette[5] == 5
+    with pytest.raises(AttributeError):
+        _ = palette.missing
+
+
+def test_frame_stats() -> None:
+    stats = FrameStats()
+    assert stats.report() == "No frames simulated."
+
+    for value in range(1, 101):
+        stats.add(0.0, float(value), 0.0)
+
+    summary = FrameStats.summarize(stats.frames)
+    assert summary["p50"] == 50.0
+    assert summary["p99"] == 99.0
+    assert summary["max"] == 100.0
+    assert "update" in stats.report({"objects": (100, 1.0, 1.0)})
+
+
+def test_frame_stats_save(tmp_path) -> None:
+    stats = FrameStats()
+    stats.add(0.5, 1.25, 2.0)
+    stats.add(0.0, 3.0, 0.0)
+
+    path = tmp_path / "frames.csv"
+    stats.save(path)
+    assert path.read_text().splitlines() == [
+        "frame,events,update,render,frame_time",
+        "1,0.500,1.250,2.000,3.750",
+        "2,0.000,3.000,0.000,3.000",
+    ]
+
+
+def test_headless_run(headless_app) -> None:
+    game = headless_app(seed=1)
+
+    with pytest.raises(RuntimeError):
+        game.start()
+
+    stats = game.run(frames=30, dt=33)
+    assert len(stats.frames) == 30
+    assert game.frame_count == 30
+    assert game.state.score >= 0
+
+    game.stop()
+    assert len(game.run(frames=40, dt=33).frames) == 10
+
+
+def test_headless_profiler(headless_app) -> None:
+    game = headless_app(seed=1)
+    state = game.states["InGameState"]
+
+    state.toggle_profiler()
+    assert game.profiler.enabled
+    assert state._profiler_hud in state._objects
+
+    game.run(frames=10, dt=33)
+    assert {"level", "background", "objects", "collision", "render", "present"} <= set(
+        game.profiler.windows
+    )
+
+    # Background is profiled separately, objects system skips it.
+    updates = []
+    state.bg.update = updates.append
+    state._update_objects(33)
+    assert not updates
+    state.scheduler.run_phase(Phase.MOVEMENT, 33)
+    assert updates == [33]
+
+    state.toggle_profiler()
+    assert not game.profiler.enabled
+    assert state._profiler_hud not in state._objects
+
+
+def test_headless_spawn_formation(headless_app) -> None:
+    game = headless_app(seed=1)
+    collision = game.state.collision
+    registered = len(collision._colliders)
+
+    with collision.batch():
+        ships = spawn_formation(GenericXEnemy, [(10, 2), (20, 2), (30, 2)])
+        assert len(collision._colliders) == registered
+        collision.remove(ships[1]._collider)
+
+    assert len(collision._colliders) == registered + 2
+    assert ships[0]._image is ships[2]._image
+    assert ships[0]._collider.phys_map is ships[2]._collider.phys_map
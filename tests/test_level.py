@@ -1,6 +1,18 @@
 """Test xoinvader.level module."""
 
-from xoinvader.level import Level
+import pytest
+
+from xoinvader.common import _ROOT, Settings, get_config
+from xoinvader.level import (
+    ClearAction,
+    Level,
+    LevelScript,
+    LevelScriptError,
+    ScriptedLevel,
+    SpawnAction,
+)
+from xoinvader.ship import GenericXEnemy
+from xoinvader.utils import Point
 
 
 # pylint: disable=invalid-name,protected-access,missing-docstring
@@ -35,3 +47,237 @@ def test_level() -> None:
     assert b.value == 10
 
     assert not e.running
+
+
+def run(level, times):
+    for _ in range(times):
+        level.update()
+
+
+def test_level_runtime_events() -> None:
+    fired = []
+    level = Level(speed=1)
+    level.add_event(5, lambda: fired.append("a"))
+    late = level.add_event(8, lambda: fired.append("late"))
+    level.start()
+
+    run(level, 3)
+    # Added to running level, past time fires on the next update.
+    level.add_event(2, lambda: fired.append("past"))
+    level.add_event(4, lambda: fired.append("b"))
+    level.update()
+    assert fired == ["past", "b"]
+
+    level.cancel(late)
+    level.cancel(late)
+    run(level, 10)
+    assert fired == ["past", "b", "a"]
+    assert not level.running
+
+    # Script keeps runtime events, cancelled ones are dropped.
+    fired.clear()
+    level.start()
+    run(level, 10)
+    assert fired == ["past", "b", "a"]
+
+
+def test_level_repeat_and_relative_events() -> None:
+    fired = []
+    level = Level(speed=1)
+
+    with pytest.raises(ValueError):
+        level.add_event(1, print, repeat=0)
+
+    wave = level.add_event(2, lambda: fired.append(("wave", level.counter)), repeat=3)
+    level.add_event(1, lambda: fired.append(("after", level.counter)), after=wave)
+    level.start()
+
+    run(level, 6)
+    assert fired == [("wave", 2), ("after", 3), ("wave", 5), ("after", 6)]
+    assert level.running
+
+    level.cancel(wave)
+    assert not level.running
+    assert not level._script
+
+
+def test_level_many_events() -> None:
+    fired = []
+    level = Level(speed=10)
+    for time in reversed(range(1, 5001)):
+        level.add_event(time, lambda time=time: fired.append(time))
+
+    level.start()
+    while level.running:
+        level.update()
+
+    assert fired == list(range(1, 5001))
+
+
+@pytest.fixture
+def field(monkeypatch):
+    monkeypatch.setitem(Settings.layout.field, "edge", Point(100, 30))
+
+
+SCRIPT = {
+    "speed": 2,
+    "paths": {
+        "dive": {
+            "interp": True,
+            "keyframes": [
+                {"time": 0.0, "dx": 0, "dy": 0},
+                {"time": 1.0, "dx": -5, "dy": 10},
+            ],
+        }
+    },
+    "waves": [
+        {
+            "name": "late",
+            "time": 50,
+            "ships": [{"type": "GenericXEnemy", "pos": [1, 1]}],
+        },
+        {
+            "name": "early",
+            "time": 10,
+            "lifetime": 20,
+            "ships": [
+                {"type": "GenericXEnemy", "pos": [10, 1], "path": "dive"},
+                {"type": "GenericXEnemy", "pos": [-10, 1], "path": "dive", "mirror": True},
+            ],
+        },
+    ],
+}
+
+
+def spawn_entry(x):
+    return {"type": "GenericXEnemy", "pos": [x, 1], "path": "dive"}
+
+
+def test_level_script_compile(field) -> None:
+    script = LevelScript.compile(SCRIPT)
+
+    assert script.speed == 2
+    assert script.background is None
+    assert [(time, type(action)) for time, action in script.timeline] == [
+        (10, SpawnAction),
+        (30, ClearAction),
+        (50, SpawnAction),
+    ]
+
+    spawn = script.timeline[0][1]
+    assert spawn.wave == "early"
+    assert [entry[:2] for entry in spawn.ships] == [
+        (GenericXEnemy, (10, 1)),
+        (GenericXEnemy, (90, 1)),
+    ]
+
+    clip, mirrored = spawn.ships[0][2], spawn.ships[1][2]
+    assert clip.interp
+    assert clip.track.values == [Point(0, 0), Point(-5, 10)]
+    assert mirrored.track.values == [Point(0, 0), Point(5, 10)]
+    assert script.timeline[2][1].ships == [(GenericXEnemy, (1, 1), None)]
+
+    # Ships on the same path share one clip.
+    script = LevelScript.compile(
+        {
+            "paths": SCRIPT["paths"],
+            "waves": [{"time": 0, "ships": [spawn_entry(x) for x in range(100)]}],
+        }
+    )
+    clips = {id(entry[2]) for entry in script.timeline[0][1].ships}
+    assert len(clips) == 1
+
+
+@pytest.mark.parametrize(
+    ("config", "reason"),
+    [
+        ({"waves": [{"ships": []}]}, "has no time"),
+        ({"waves": [{"time": 1, "ships": [{"type": "Level", "pos": [0, 0]}]}]}, "ship type"),
+        (
+            {
+                "waves": [
+                    {
+                        "time": 1,
+                        "ships": [{"type": "GenericXEnemy", "pos": [0, 0], "path": "x"}],
+                    }
+                ]
+            },
+            "unknown path",
+        ),
+        (
+            {
+                "paths": {"p": {"easing": "wobble", "keyframes": [{"time": 0, "dx": 0, "dy": 0}]}},
+                "waves": [
+                    {"time": 1, "ships": [{"type": "GenericXEnemy", "pos": [0, 0], "path": "p"}]}
+                ],
+            },
+            "unknown easing",
+        ),
+    ],
+)
+def test_level_script_errors(field, config, reason) -> None:
+    with pytest.raises(LevelScriptError, match=reason):
+        LevelScript.compile(config)
+
+
+def test_level_script_curved_path(field) -> None:
+    path = {
+        "interp": True,
+        "bezier": True,
+        "easing": "ease_in_out",
+        "keyframes": [
+            {"time": 0.0, "dx": 0, "dy": 0},
+            {"time": 0.0, "dx": 10, "dy": 0},
+            {"time": 2.0, "dx": 10, "dy": 10},
+        ],
+    }
+    ships = [spawn_entry(5) | {"path": "curve"}]
+    script = LevelScript.compile({"paths": {"curve": path}, "waves": [{"time": 0, "ships": ships}]})
+
+    clip = script.timeline[0][1].ships[0][2]
+    assert clip.track.lut is not None
+    assert len(clip.track) == 17
+    assert clip.track.duration == 2.0
+    assert clip.track.values[-1] == Point(10.0, 10.0, 0.0)
+
+
+def test_level_script_load(field, tmp_path) -> None:
+    script = LevelScript.load(_ROOT / get_config().level1)
+    assert script.background.exists()
+    assert script.timeline
+
+    path = tmp_path / "bad.toml"
+    path.write_text("speed = = 1")
+    with pytest.raises(LevelScriptError):
+        LevelScript.load(path)
+
+
+def test_scripted_level() -> None:
+    # pylint: disable=too-few-public-methods
+    class ObjectMock:
+        def __init__(self) -> None:
+            self.destroyed = False
+
+        def destroy(self) -> None:
+            self.destroyed = True
+
+    objects = [ObjectMock(), ObjectMock()]
+    added = []
+    script = LevelScript(
+        1,
+        None,
+        0,
+        [
+            (1, lambda level: level.spawn("wave", objects)),
+            (3, ClearAction("wave")),
+        ],
+    )
+
+    level = ScriptedLevel(script, added.extend)
+    level.start()
+    level.update()
+    assert added == objects
+
+    run(level, 2)
+    assert all(obj.destroyed for obj in objects)
+    assert not level.running
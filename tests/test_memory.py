@@ -0,0 +1,43 @@
+"""Test xoinvader.memory module."""
+
+import gc
+import tracemalloc
+
+import pytest
+
+from xoinvader.headless import HeadlessXOInvader
+from xoinvader.memory import MemoryTracker, count_instances
+
+
+# pylint: disable=invalid-name,protected-access,missing-docstring
+def test_memory_tracker(tmp_path) -> None:
+    with pytest.raises(ValueError):
+        MemoryTracker(tmp_path / "report.txt", interval=0)
+
+    path = tmp_path / "report.txt"
+    tracker = MemoryTracker(path, interval=10, top=3)
+    game = HeadlessXOInvader(seed=1)
+    game.add_frame_listener(tracker.on_frame)
+
+    tracker.start()
+    assert tracemalloc.is_tracing()
+    try:
+        game.run(frames=25, dt=33)
+    finally:
+        tracker.stop()
+        tracker.stop()
+
+    assert not tracemalloc.is_tracing()
+
+    report = path.read_text()
+    assert report.count("== Frame") == 2
+    assert "== Frame 20:" in report
+    assert "  PlayerShip: 1" in report
+    assert "  PlayerShip: 1/1" in report
+
+    renderables, colliders = count_instances()
+    assert renderables["PlayerShip"] >= 1
+    assert colliders["PlayerShip"] >= 1
+
+    del game
+    gc.collect()
@@ -0,0 +1,64 @@
+"""Test xoinvader.preload module."""
+
+import pytest
+
+from xoinvader import preload
+from xoinvader.headless import HeadlessXOInvader
+from xoinvader.level import LevelScript
+from xoinvader.preload import Preloader, load_level_assets, ship_classes
+from xoinvader.ship import GenericXEnemy, PlayerShip
+
+
+# pylint: disable=invalid-name,protected-access,missing-docstring
+def test_load_level_assets() -> None:
+    steps = []
+    assets = load_level_assets(lambda done, total: steps.append((done, total)))
+
+    assert isinstance(assets.script, LevelScript)
+    assert assets.chunks
+    assert assets.config.level1
+    assert ship_classes(assets.script) == [PlayerShip, GenericXEnemy]
+    assert steps[-1] == (5, 5)
+    assert [done for done, _ in steps] == [1, 2, 3, 4, 5]
+
+
+def test_preloader() -> None:
+    steps = []
+    preloader = Preloader(lambda done, total: steps.append(done))
+    assert not preloader.done
+    assert preloader.progress == 0.0
+
+    assets = preloader.start().result()
+    assert preloader.done
+    assert preloader.progress == 1.0
+    assert preloader.result() is assets
+    assert steps == [1, 2, 3, 4, 5]
+
+    # Result starts loading if it wasn't started.
+    assert Preloader().result().script
+
+
+def test_preloader_error(monkeypatch) -> None:
+    def fail():
+        raise OSError("no config")
+
+    monkeypatch.setattr(preload, "get_config", fail)
+    preloader = Preloader().start()
+    with pytest.raises(OSError):
+        preloader.result()
+    assert preloader.done
+
+
+def test_game_over_preloads_level() -> None:
+    game = HeadlessXOInvader(seed=1)
+    game.trigger_state("GameOverState", score=10)
+    menu = game.state
+    preloader = menu._preloader
+    assert preloader is game.preloader
+
+    assets = preloader.result()
+    assert menu.loading_callback() == ""
+
+    game.trigger_reinit("InGameState")
+    assert game.state.level.script is assets.script
+    assert game.state.bg.chunks is assets.chunks
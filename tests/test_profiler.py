@@ -0,0 +1,118 @@
+"""Test xoinvader.profiler module."""
+
+import pstats
+import signal
+import time
+
+import pytest
+
+from xoinvader.profiler import (
+    CProfileSession,
+    FrameProfiler,
+    RollingWindow,
+    SamplingProfiler,
+    make_profiler,
+)
+from xoinvader.scheduler import Phase, Scheduler
+
+
+# pylint: disable=invalid-name,protected-access,missing-docstring
+def test_rolling_window() -> None:
+    with pytest.raises(ValueError):
+        RollingWindow(0)
+
+    window = RollingWindow(4)
+    assert window.mean() == 0.0
+
+    for value in range(1, 7):
+        window.add(float(value))
+
+    assert len(window) == 4
+    assert sorted(window._values) == [3.0, 4.0, 5.0, 6.0]
+    assert window.percentile(0.5) == 4.0
+    assert window.percentile(0.99) == 6.0
+    assert window.mean() == 4.5
+
+    window.clear()
+    assert not window
+
+
+def test_frame_profiler() -> None:
+    profiler = FrameProfiler(size=100)
+    assert not profiler.enabled
+    assert profiler.summary() == "Frame p50 -- p99 -- ms"
+
+    assert profiler.toggle()
+    for value in range(1, 101):
+        profiler.record("update", float(value))
+        profiler.end_frame(float(value))
+
+    assert profiler.report() == {"frame": (50.0, 99.0), "update": (50.0, 99.0)}
+    assert profiler.summary() == "Frame p50 50.0 p99 99.0 ms"
+
+    assert not profiler.toggle()
+    assert profiler.report()["frame"] == (50.0, 99.0)
+
+    assert profiler.toggle()
+    assert profiler.report() == {}
+
+
+def test_scheduler_profiling() -> None:
+    profiler = FrameProfiler()
+    scheduler = Scheduler()
+    scheduler.profiler = profiler
+    scheduler.add("noop", lambda dt: None, Phase.MOVEMENT)
+    scheduler.add("ai", lambda dt: None, Phase.LEVEL, rate=10)
+
+    scheduler.run(30)
+    assert not profiler.windows
+
+    profiler.toggle()
+    for _ in range(4):
+        scheduler.run(30)
+
+    assert len(profiler.windows["noop"]) == 4
+    assert len(profiler.windows["ai"]) == 1
+
+
+def busy(seconds):
+    end = time.process_time() + seconds
+    while time.process_time() < end:
+        pass
+
+
+def test_cprofile_session(tmp_path) -> None:
+    path = tmp_path / "session.prof"
+    profiler = CProfileSession(str(path))
+
+    profiler.start()
+    busy(0.01)
+    profiler.stop()
+
+    stats = pstats.Stats(str(path))
+    assert any(func[2] == "busy" for func in stats.stats)
+
+
+@pytest.mark.skipif(not hasattr(signal, "setitimer"), reason="needs POSIX timers")
+def test_sampling_profiler(tmp_path) -> None:
+    path = tmp_path / "session.folded"
+    handler = signal.getsignal(signal.SIGPROF)
+    profiler = SamplingProfiler(str(path), interval=0.001)
+
+    profiler.start()
+    busy(0.1)
+    profiler.stop()
+
+    assert signal.getsignal(signal.SIGPROF) == handler
+    lines = path.read_text().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert any("busy@test_profiler.py" in line for line in lines)
+
+
+def test_make_profiler() -> None:
+    assert make_profiler("cprofile")._path == "xoinvader.prof"
+    assert make_profiler("cprofile", "out.prof")._path == "out.prof"
+    with pytest.raises(KeyError):
+        make_profiler("unknown")
@@ -0,0 +1,186 @@
+"""Test xoinvader.replay module."""
+
+import gc
+
+import pytest
+
+from xoinvader.headless import HeadlessXOInvader
+from xoinvader.replay import (
+    ERR,
+    Recorder,
+    Replay,
+    ReplayFormatError,
+    ReplayInput,
+    ReplayVerifier,
+    state_digest,
+)
+
+
+# pylint: disable=invalid-name,protected-access,missing-docstring
+# pylint: disable=too-few-public-methods
+class QueueMock:
+    def __init__(self, keys) -> None:
+        self._keys = list(keys)
+
+    def getch(self):
+        return self._keys.pop(0) if self._keys else ERR
+
+
+class ObjectMock:
+    type = "ObjectMock"
+
+    def __init__(self, pos) -> None:
+        self.pos = pos
+
+
+class StateMock:
+    def __init__(self, score=0) -> None:
+        self.score = score
+        self._objects = []
+
+
+class AppMock:
+    def __init__(self) -> None:
+        self.state = StateMock()
+        self.frame_count = 0
+
+
+def test_replay_save_load(tmp_path) -> None:
+    replay = Replay(seed=-42)
+    replay.dts.extend([33, 34, 70000 & 0xFFFF])
+    replay.add_event(0, 32)
+    replay.add_event(2, 97)
+    replay.add_digest(2, 0xDEADBEEF)
+
+    path = tmp_path / "session.xoir"
+    replay.save(path)
+    loaded = Replay.load(path)
+
+    assert loaded.seed == -42
+    assert loaded.dts == replay.dts
+    assert list(zip(loaded.event_frames, loaded.event_keys)) == [(0, 32), (2, 97)]
+    assert loaded.expected_digests() == {2: 0xDEADBEEF}
+    assert len(loaded) == 3
+
+
+def test_replay_load_malformed(tmp_path) -> None:
+    path = tmp_path / "bad.xoir"
+
+    path.write_bytes(b"XO")
+    with pytest.raises(ReplayFormatError, match="truncated"):
+        Replay.load(path)
+
+    path.write_bytes(Replay.HEADER.pack(b"NOPE", 1, 0, 0, 0, 0))
+    with pytest.raises(ReplayFormatError, match="magic"):
+        Replay.load(path)
+
+    path.write_bytes(Replay.HEADER.pack(Replay.MAGIC, 99, 0, 0, 0, 0))
+    with pytest.raises(ReplayFormatError, match="version"):
+        Replay.load(path)
+
+    path.write_bytes(Replay.HEADER.pack(Replay.MAGIC, 1, 0, 10, 0, 0))
+    with pytest.raises(ReplayFormatError, match="truncated"):
+        Replay.load(path)
+
+    path.write_bytes(Replay.HEADER.pack(Replay.MAGIC, 1, 0, 0, 0, 0) + b"\0" * 4)
+    with pytest.raises(ReplayFormatError, match="unexpected data"):
+        Replay.load(path)
+
+
+def test_replay_digests_out_of_sync() -> None:
+    replay = Replay()
+    replay.add_digest(1, 1)
+    replay.add_digest(2, 2)
+    replay.digests.pop()
+
+    with pytest.raises(ValueError):
+        replay.expected_digests()
+
+
+def test_recorder_and_replay_input() -> None:
+    app = AppMock()
+    recorder = Recorder(seed=1, digest_interval=2)
+    queue = recorder.wrap(QueueMock([]))
+
+    for keys in ([], [10, 11], [12]):
+        queue._queue = QueueMock(keys)
+        while queue.getch() != ERR:
+            pass
+        app.frame_count += 1
+        recorder.on_frame(app, 33)
+
+    replay = recorder.replay
+    assert list(replay.dts) == [33, 33, 33]
+    assert list(zip(replay.event_frames, replay.event_keys)) == [
+        (1, 10),
+        (1, 11),
+        (2, 12),
+    ]
+    assert replay.expected_digests() == {2: state_digest(app.state)}
+
+    source = ReplayInput(replay)
+    fed = []
+    for _ in range(3):
+        source.next_frame()
+        frame = []
+        key = source.getch()
+        while key != ERR:
+            frame.append(key)
+            key = source.getch()
+        fed.append(frame)
+    assert fed == [[], [10, 11], [12]]
+
+
+def test_replay_input_drops_unread_keys() -> None:
+    replay = Replay()
+    replay.add_event(0, 1)
+    replay.add_event(0, 2)
+    replay.add_event(1, 3)
+
+    source = ReplayInput(replay)
+    source.next_frame()
+    assert source.getch() == 1
+    source.next_frame()
+    assert source.getch() == 3
+    assert source.getch() == ERR
+
+
+def test_replay_verifier() -> None:
+    app = AppMock()
+    replay = Replay()
+    replay.add_digest(1, state_digest(app.state))
+    replay.add_digest(2, state_digest(app.state))
+
+    verifier = ReplayVerifier(replay)
+    app.frame_count = 1
+    verifier.on_frame(app, 33)
+    assert verifier.checked == 1 and verifier.diverged_at is None
+
+    app.state._objects.append(ObjectMock(app))
+    app.state._objects[0].pos = type("Pos", (), {"x": 1.0, "y": 2.0})()
+    app.frame_count = 2
+    verifier.on_frame(app, 33)
+    assert verifier.diverged_at == 2
+
+
+def test_headless_record_and_replay(tmp_path) -> None:
+    path = tmp_path / "session.xoir"
+
+    recorder = Recorder(seed=7)
+    game = HeadlessXOInvader(seed=7, recorder=recorder)
+    game.run(frames=60, dt=33)
+    recorder.save(path)
+    del game
+    gc.collect()
+
+    session = Replay.load(path)
+    assert len(session) == 60
+
+    game = HeadlessXOInvader(session.seed, ReplayInput(session))
+    stats, verifier = game.play(session)
+    del game
+    gc.collect()
+
+    assert len(stats.frames) == 60
+    assert verifier.checked == 6
+    assert verifier.diverged_at is None
@@ -0,0 +1,83 @@
+"""Test xoinvader.scheduler module."""
+
+import pytest
+
+from xoinvader.scheduler import Phase, Scheduler, SystemAlreadyScheduled
+
+
+# pylint: disable=invalid-name,protected-access,missing-docstring
+def test_scheduler_order() -> None:
+    calls = []
+    scheduler = Scheduler()
+
+    def system(name):
+        return lambda dt: calls.append((name, dt))
+
+    scheduler.add("render", system("render"), Phase.RENDER)
+    scheduler.add("collision", system("collision"), Phase.COLLISION)
+    scheduler.add("objects", system("objects"), Phase.MOVEMENT)
+    scheduler.add("charges", system("charges"), Phase.MOVEMENT, before="objects")
+    scheduler.add("input", system("input"), Phase.INPUT)
+
+    assert [system.name for system in scheduler.systems] == [
+        "input",
+        "charges",
+        "objects",
+        "collision",
+        "render",
+    ]
+
+    scheduler.run(10, Phase.LEVEL, Phase.CLEANUP)
+    assert calls == [("charges", 10), ("objects", 10), ("collision", 10)]
+
+    calls.clear()
+    scheduler.run_phase(Phase.INPUT, 5)
+    assert calls == [("input", 5)]
+
+    with pytest.raises(SystemAlreadyScheduled):
+        scheduler.add("input", system("input"), Phase.INPUT)
+
+    with pytest.raises(ValueError):
+        scheduler.add("level", system("level"), Phase.LEVEL, before="input")
+
+    scheduler.remove("input")
+    assert "input" not in scheduler
+    calls.clear()
+    scheduler.run(1)
+    assert [name for name, _ in calls] == ["charges", "objects", "collision", "render"]
+
+
+def test_scheduler_skip_and_throttle() -> None:
+    calls = []
+    scheduler = Scheduler()
+    ai = scheduler.add("ai", calls.append, Phase.LEVEL, rate=10)
+    assert ai.rate == 10
+
+    for _ in range(8):
+        scheduler.run(30)
+    assert calls == [120, 120]
+
+    scheduler["ai"].enabled = False
+    scheduler.run(1000)
+    assert calls == [120, 120]
+
+    scheduler["ai"].enabled = True
+    scheduler["ai"].rate = None
+    scheduler.run(30)
+    assert calls == [120, 120, 30]
+
+    with pytest.raises(ValueError):
+        ai.rate = -1
+
+
+def test_scheduler_stats() -> None:
+    scheduler = Scheduler()
+    scheduler.add("noop", lambda dt: None, Phase.CLEANUP)
+
+    assert scheduler.stats() == {"noop": (0, 0.0, 0.0)}
+
+    scheduler.run(1)
+    scheduler.run(1)
+    calls, last, mean = scheduler.stats()["noop"]
+    assert calls == 2
+    assert last >= 0.0 and mean >= 0.0
@@ -0,0 +1,155 @@
+"""Test xoinvader.snapshot module."""
+
+import marshal
+import os
+
+import pytest
+import toml
+from xo1 import Surface
+
+from xoinvader import snapshot
+from xoinvader.common import _ROOT, Snapshot, load_surface
+from xoinvader.snapshot import TomlSnapshot, cache_dir
+
+
+# pylint: disable=invalid-name,protected-access,missing-docstring
+SOURCE = """
+name = "test"
+items = [{value = 1}, {value = 2}]
+"""
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    calls = []
+    loads = toml.loads
+
+    def counting(text):
+        calls.append(text)
+        return loads(text)
+
+    monkeypatch.setattr(snapshot.toml, "loads", counting)
+    return calls
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "source.toml"
+    path.write_text(SOURCE)
+    return path
+
+
+def test_load_cached(tmp_path, source, parses) -> None:
+    cache = TomlSnapshot(tmp_path / "snapshot")
+    data = cache.load(source)
+
+    assert data == {"name": "test", "items": [{"value": 1}, {"value": 2}]}
+    assert type(data["items"][0]) is dict
+    assert cache.load(source) is data
+    assert len(parses) == 1
+    assert cache.dirty
+
+
+def test_save_and_reuse(tmp_path, source, parses) -> None:
+    path = tmp_path / "cache" / "snapshot"
+    cache = TomlSnapshot(path)
+    data = cache.load(source)
+    cache.save()
+    assert not cache.dirty
+    assert path.exists()
+
+    cache = TomlSnapshot(path)
+    assert cache.load(source) == data
+    assert not cache.dirty
+    assert len(parses) == 1
+
+    # Same content with other modification time is taken by digest.
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cache.load(source) == data
+    assert len(parses) == 1
+    assert cache.dirty
+
+    source.write_text('name = "changed"')
+    assert cache.load(source) == {"name": "changed"}
+    assert len(parses) == 2
+
+
+@pytest.mark.parametrize(
+    "content",
+    [b"garbage", marshal.dumps((("other", 0, ""), {})), b""],
+)
+def test_stale_snapshot_ignored(tmp_path, source, parses, content) -> None:
+    path = tmp_path / "snapshot"
+    path.write_bytes(content)
+
+    cache = TomlSnapshot(path)
+    assert cache.load(source)["name"] == "test"
+    assert len(parses) == 1
+
+    cache.save()
+    assert TomlSnapshot(path).load(source)["name"] == "test"
+    assert len(parses) == 1
+
+
+def test_invalid_source(tmp_path) -> None:
+    path = tmp_path / "source.toml"
+    path.write_text("name = ")
+
+    with pytest.raises(toml.TomlDecodeError):
+        TomlSnapshot(tmp_path / "snapshot").load(path)
+
+
+def test_save_error(tmp_path, source) -> None:
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+
+    cache = TomlSnapshot(blocker / "snapshot")
+    cache.load(source)
+    cache.save()
+    assert cache.dirty
+
+
+def test_build(tmp_path, source) -> None:
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "nested" / "other.toml").write_text("value = 1")
+
+    cache = TomlSnapshot(tmp_path / "snapshot")
+    assert cache.build([tmp_path]) == 2
+    assert not cache.dirty
+
+    source.unlink()
+    cache = TomlSnapshot(tmp_path / "snapshot")
+    assert cache.build([tmp_path]) == 1
+
+
+def test_load_surface() -> None:
+    path = _ROOT / "res" / "gfx" / "kekstrel.toml"
+    surface = load_surface(path)
+    expected = Surface.from_file(path)
+
+    assert surface.name == expected.name
+    assert surface.raw == expected.raw
+
+
+def test_cache_dir(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert cache_dir() == tmp_path / "xoinvader"
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    for value in ("", "relative"):
+        monkeypatch.setenv("XDG_CACHE_HOME", value)
+        assert cache_dir() == tmp_path / ".cache" / "xoinvader"
+
+
+def test_snapshot_path(tmp_path, source) -> None:
+    assert not str(Snapshot.path).startswith(str(_ROOT))
+
+    cache = TomlSnapshot(tmp_path / "first")
+    cache.load(source)
+    cache.path = tmp_path / "second"
+    assert not cache.dirty
+    cache.load(source)
+    cache.save()
+    assert cache.path.exists()
+    assert not (tmp_path / "first").exists()
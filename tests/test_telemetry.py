@@ -0,0 +1,114 @@
+"""Test xoinvader.telemetry module."""
+
+import json
+
+from xoinvader.telemetry import TelemetrySink, compare, load, main, summarize
+
+
+# pylint: disable=invalid-name,protected-access,missing-docstring
+# pylint: disable=too-few-public-methods
+class SystemMock:
+    def __init__(self, name, last_time) -> None:
+        self.name = name
+        self.last_time = last_time
+
+
+class SchedulerMock:
+    systems = [SystemMock("objects", 1.23456), SystemMock("collision", 0.5)]
+
+
+class CollisionMock:
+    pairs_tested = 6
+
+    def __init__(self) -> None:
+        self._colliders = {1: None, 2: None}
+
+
+class StateMock:
+    def __init__(self) -> None:
+        self._objects = [1, 2, 3]
+        self.collision = CollisionMock()
+        self.charges = [1]
+        self.scheduler = SchedulerMock()
+
+
+class AppMock:
+    def __init__(self) -> None:
+        self.state = StateMock()
+        self.frame_count = 0
+        self.frame_time = 2.5
+
+
+def make_records(work):
+    return [
+        {"frame": frame, "dt": 33, "systems": {"objects": value}}
+        for frame, value in enumerate(work, 1)
+    ]
+
+
+def test_sink(tmp_path) -> None:
+    path = tmp_path / "telemetry.jsonl"
+    app = AppMock()
+    sink = TelemetrySink(path, batch_size=2)
+
+    for _ in range(5):
+        app.frame_count += 1
+        sink.on_frame(app, 33)
+
+    sink.close()
+    sink.close()
+
+    records = load(path)
+    assert [record["frame"] for record in records] == [1, 2, 3, 4, 5]
+    assert records[0] == {
+        "frame": 1,
+        "dt": 33,
+        "wall": 2.5,
+        "objects": 3,
+        "colliders": 2,
+        "pairs": 6,
+        "charges": 1,
+        "systems": {"objects": 1.235, "collision": 0.5},
+    }
+    assert " " not in path.read_text()
+
+
+def test_summarize() -> None:
+    summary = summarize(make_records(range(1, 101)))
+
+    assert summary["dt"]["p99"] == 33
+    assert summary["objects"] == {"p50": 50, "p95": 95, "p99": 99, "max": 100}
+    assert summary["work"] == summary["objects"]
+
+
+def test_compare() -> None:
+    base = make_records([1.0] * 100)
+
+    assert not compare(base, make_records([1.05] * 100))
+    assert not compare(make_records([0.01] * 100), make_records([0.03] * 100))
+
+    regressions = compare(base, make_records([1.0] * 98 + [5.0] * 2))
+    assert regressions == ["work p99: 1.000 -> 5.000 ms", "objects p99: 1.000 -> 5.000 ms"]
+
+
+def test_compare_wall_time() -> None:
+    # Headless runs have constant simulated dt, measured time shows regression.
+    base = [{"frame": frame, "dt": 33, "wall": 2.0} for frame in range(100)]
+    new = [{"frame": frame, "dt": 33, "wall": 3.0} for frame in range(100)]
+
+    assert summarize(base)["wall"]["p50"] == 2.0
+    assert compare(base, new) == ["wall p50: 2.000 -> 3.000 ms", "wall p99: 2.000 -> 3.000 ms"]
+
+
+def test_main(tmp_path, capsys) -> None:
+    base = tmp_path / "base.jsonl"
+    new = tmp_path / "new.jsonl"
+    base.write_text("".join(json.dumps(r) + "\n" for r in make_records([1.0] * 10)))
+    new.write_text("".join(json.dumps(r) + "\n" for r in make_records([2.0] * 10)))
+
+    assert main(["summary", str(base)]) == 0
+    assert "Frames: 10" in capsys.readouterr().out
+
+    assert main(["compare", str(base), str(base)]) == 0
+    assert main(["compare", str(base), str(new)]) == 1
+    assert "objects p50" in capsys.readouterr().out
@@ -2,11 +2,14 @@
 
 import pytest
 
+from xoinvader import utils
 from xoinvader.utils import (
+    Columns,
     InfiniteList,
     clamp,
     dotdict,
     setup_logger,
+    use_numpy,
 )
 
 
@@ -81,3 +84,37 @@ def test_infinite_list_operations_negative() -> None:
         inf_list.select(-1)
     with pytest.raises(IndexError):
         inf_list.select(1)
+
+
+def test_columns() -> None:
+    store = Columns(2)
+    xs, ys = store.columns
+    for item in "abc":
+        store.add(item, ord(item), -ord(item))
+
+    assert len(store) == 3
+    assert "b" in store
+    with pytest.raises(ValueError):
+        store.add("d", 1.0)
+    assert len(store) == 3 and len(xs) == 3
+
+    assert store.remove("a") == (97.0, -97.0)
+    assert "a" not in store
+    assert store.items == ["c", "b"]
+    assert store.slots == {"c": 0, "b": 1}
+    assert list(xs) == [99.0, 98.0] and list(ys) == [-99.0, -98.0]
+
+    assert store.remove("b") == (98.0, -98.0)
+    assert store.items == ["c"]
+    assert list(xs) == [99.0]
+    with pytest.raises(KeyError):
+        store.remove("b")
+
+
+def test_use_numpy(monkeypatch) -> None:
+    assert not use_numpy(False, "test")
+
+    monkeypatch.setattr(utils, "numpy", None)
+    assert not use_numpy(None, "test")
+    with pytest.raises(ValueError, match="vectorized test system"):
+        use_numpy(True, "test")
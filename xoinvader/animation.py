@@ -6,14 +6,32 @@ Value of selected attribute changes in time.
 Keyframe:
   (time, value)
 
-Objects have animation manager which manages animation graph and switching."""
+Objects have animation manager which manages animation graph and switching.
 
+Keyframes are baked at animation creation into track: keyframe times array
+for bisect lookup and per-segment slopes of interpolated value, so animation
+update is a lookup and one multiply-add.
+
+Interpolated position animations of many objects are advanced together by
+animation system, vectorized with NumPy when it's available."""
+
+import itertools
+import logging
+from array import array
+from bisect import bisect_right
 from collections.abc import Iterable
 from operator import itemgetter
 
-from eaf import Timer
+from xoinvader.utils import Columns, Point, use_numpy
+
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
 
-from xoinvader.utils import Point
+
+LOG = logging.getLogger(__name__)
 
 
 class AnimationBoundariesExceeded(Exception):
@@ -35,13 +53,44 @@ class InterpolationUnknownTypes(Exception):
         )
 
 
-# TODO: Implement animation graph and etc
+class Transition:
+    """Animation state graph edge.
+
+    :param str target: name of animation to switch to
+    :param float blend: time in seconds to blend from last value of previous
+    animation to values of target one, 0 to switch at once
+    """
+
+    def __init__(self, target: str, blend: float = 0.0) -> None:
+        if blend < 0:
+            raise ValueError("Blend time must not be negative.")
+
+        self.target = target
+        self.blend = blend
+
+
 class AnimationManager:
-    """Manage list of object animation."""
+    """Manage animation state graph of object.
+
+    Animations are graph states, only current one is played. Transitions
+    switch current animation when it finishes or when event is triggered.
+    Finished animation without transition stays finished and costs nothing
+    on update.
+
+    :param AnimationSystem system: system to advance current animation in
+    batch with other objects' animations if it supports one
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, system=None) -> None:
         self._animations = {}
         self._animation = None
+        self._system = system
+        self._batched = False
+        self._finished = False
+
+        self._transitions = {}
+        # Blend in progress: (start value, elapsed, duration) or None.
+        self._blend = None
 
     @property
     def animation(self) -> str:
@@ -62,10 +111,37 @@ class AnimationManager:
     @animation.setter
     def animation(self, name: str) -> None:
         if name in self._animations:
-            self._animation = self._animations[name]
+            self._select(self._animations[name])
         else:
             raise ValueError(f"No such animation: '{name}'.")
 
+    @property
+    def finished(self) -> bool:
+        """If current animation finished and there's no transition from it.
+
+        :getter: yes
+        :setter: no
+        :type: bool
+        """
+        return self._finished
+
+    def _select(self, animation, reset=False) -> None:
+        """Make animation current, move it to system if possible.
+
+        :param bool reset: restart animation from beginning
+        """
+
+        self.stop()
+        # Removing from system writes elapsed time back, so reset goes after.
+        if reset:
+            animation.reset()
+        self._animation = animation
+        self._finished = False
+        self._blend = None
+        if self._system is not None and self._system.accepts(animation):
+            self._system.add(animation)
+            self._batched = True
+
     def add(self, name: str, *args, **kwargs) -> None:
         """Add new animation, pass args to Animation class.
 
@@ -78,37 +154,418 @@ class AnimationManager:
         self._animations[name] = animation
 
         if not self._animation:
-            self._animation = animation
+            self._select(animation)
+
+    def add_transition(
+        self, source: str | None, target: str, event: str | None = None, blend: float = 0.0
+    ) -> None:
+        """Add animation state graph edge.
+
+        :param source: animation to switch from, None for any animation
+        :param target: animation to switch to
+        :param event: event to switch on, None to switch when source finishes
+        :param blend: blend time in seconds
+        """
+
+        for name in (source, target):
+            if name is not None and name not in self._animations:
+                raise ValueError(f"No such animation: '{name}'.")
+
+        self._transitions[source, event] = Transition(target, blend)
+
+    def trigger(self, event: str) -> bool:
+        """Switch animation by event.
+
+        :return: whether transition was made
+        """
+
+        if self._animation is None:
+            return False
+
+        return self._transit(event)
+
+    def _transit(self, event: str | None) -> bool:
+        """Make transition from current animation, return if it was made."""
+
+        transition = self._transitions.get((self._animation.name, event))
+        if transition is None:
+            transition = self._transitions.get((None, event))
+        if transition is None:
+            return False
+
+        # pylint: disable=protected-access
+        start = None
+        if transition.blend:
+            value = getattr(self._animation._obj, self._animation._attr, None)
+            # Current value may be reused by animation, so it's copied.
+            start = Point(*value.as_tuple3()) if isinstance(value, Point) else value
+
+        self._select(self._animations[transition.target], reset=True)
+
+        if start is not None:
+            self._blend = (start, 0.0, transition.blend)
+        return True
+
+    def stop(self) -> None:
+        """Stop advancing current animation in system.
+
+        Must be called when animated object is destroyed.
+        """
+
+        if self._batched:
+            self._system.remove(self._animation)
+            self._batched = False
+
+    def _apply_blend(self, dt: int) -> None:
+        """Mix start value with current animation value."""
+
+        start, elapsed, duration = self._blend
+        elapsed += dt / 1000
+        if elapsed >= duration:
+            self._blend = None
+            return
+
+        self._blend = (start, elapsed, duration)
+        animation = self._animation
+        # pylint: disable=protected-access
+        value = getattr(animation._obj, animation._attr)
+        animation._apply_value(start + (value - start) * (elapsed / duration))
 
     def update(self, dt: int) -> None:
-        """Update manager's state."""
+        """Update manager's state.
 
-        if not self._animation:
+        Batched animation is advanced by system, manager only checks if it
+        finished and blends its value.
+        """
+
+        if not self._animation or self._finished:
             return
 
-        try:
-            self._animation.update(dt)
-        except StopIteration:
-            return  # TODO: think about method to change animation
+        if self._batched:
+            done = self._animation.finished
+        else:
+            try:
+                self._animation.update(dt)
+                done = False
+            except StopIteration:
+                done = True
+
+        if done:
+            # Next animation starts playing on next update.
+            if not self._transit(None):
+                self.stop()
+                self._finished = True
+            return
+
+        if self._blend is not None:
+            self._apply_blend(dt)
+
+
+EASING_LUT_SIZE = 256
+"""Number of easing lookup table steps."""
+
+
+def ease_in(u: float) -> float:
+    """Quadratic acceleration from zero velocity."""
+    return u * u
+
+
+def ease_out(u: float) -> float:
+    """Quadratic deceleration to zero velocity."""
+    return u * (2 - u)
+
+
+def ease_in_out(u: float) -> float:
+    """Quadratic acceleration until halfway, then deceleration."""
+    return 2 * u * u if u < 0.5 else 1 - 2 * (1 - u) ** 2
+
+
+def cubic_in(u: float) -> float:
+    """Cubic acceleration from zero velocity."""
+    return u**3
+
+
+def cubic_out(u: float) -> float:
+    """Cubic deceleration to zero velocity."""
+    return 1 - (1 - u) ** 3
+
+
+def cubic_in_out(u: float) -> float:
+    """Cubic acceleration until halfway, then deceleration."""
+    return 4 * u**3 if u < 0.5 else 1 - 4 * (1 - u) ** 3
+
+
+def cubic_bezier(x1: float, y1: float, x2: float, y2: float):
+    """Make easing of cubic Bezier curve from (0, 0) to (1, 1).
+
+    Control points have the same meaning as in CSS `cubic-bezier()`.
+
+    :return: easing function
+    """
+
+    if not (0 <= x1 <= 1 and 0 <= x2 <= 1):
+        raise ValueError("Bezier easing control points x must be in [0, 1].")
+
+    def bezier(p1, p2, s):
+        return 3 * (1 - s) ** 2 * s * p1 + 3 * (1 - s) * s * s * p2 + s**3
+
+    def easing(u: float) -> float:
+        # Curve x is monotonic in s, so s is found by bisection.
+        low, high = 0.0, 1.0
+        for _ in range(32):
+            middle = (low + high) / 2
+            if bezier(x1, x2, middle) < u:
+                low = middle
+            else:
+                high = middle
+        return bezier(y1, y2, (low + high) / 2)
+
+    return easing
+
+
+EASINGS = {
+    "linear": None,
+    "ease_in": ease_in,
+    "ease_out": ease_out,
+    "ease_in_out": ease_in_out,
+    "cubic_in": cubic_in,
+    "cubic_out": cubic_out,
+    "cubic_in_out": cubic_in_out,
+}
+"""Easing functions by name, linear easing has no function."""
+
+
+def easing_table(easing, size: int = EASING_LUT_SIZE) -> array:
+    """Sample easing function into lookup table.
+
+    :param easing: easing name from `EASINGS` or function of [0, 1]
+    :param size: number of table steps, table has `size + 1` items
+    """
+
+    if isinstance(easing, str):
+        if easing not in EASINGS:
+            raise ValueError(f"Unknown easing: '{easing}'.")
+        easing = EASINGS[easing]
+
+    if easing is None:
+        easing = float
+
+    return array("d", (easing(step / size) for step in range(size + 1)))
+
+
+def bezier_path(points: list[Point], start: float, end: float, samples: int = 16):
+    """Sample Bezier curve into keyframes.
+
+    Keyframes are evenly spaced in time, so curved path is played with
+    linear interpolation at the same cost as straight one.
+
+    :param points: curve control points, first and last are end points
+    :param start: time of first keyframe
+    :param end: time of last keyframe
+    :param samples: number of curve segments
+    :return: (time, Point) keyframes
+    """
+
+    if len(points) < 2 or samples < 1:
+        raise ValueError("Bezier path needs two points and one sample at least.")
+
+    keyframes = []
+    for step in range(samples + 1):
+        s = step / samples
+        # De Casteljau's algorithm.
+        row = [point.as_tuple3() for point in points]
+        while len(row) > 1:
+            row = [
+                tuple(a + (b - a) * s for a, b in zip(left, right, strict=True))
+                for left, right in itertools.pairwise(row)
+            ]
+        keyframes.append((start + (end - start) * s, Point(*row[0])))
+
+    return keyframes
+
+
+class Track:
+    """Baked keyframes.
+
+    Segment between keyframes `i` and `i + 1` is stored as slope, value at
+    time `t` within segment is `values[i] + slope * (t - times[i])`. It's
+    the same arithmetic as :func:`linear_equation`, so baked animation gives
+    exactly the same values.
+
+    Eased segment is stored as value delta and inverse length, value is
+    `values[i] + delta * lut[int((t - times[i]) * inverse * size)]`, so
+    any easing costs as much as linear interpolation.
+
+    Point values can be written into existing point instead of new one.
+
+    :param list keyframes: (float, object) tuples sorted by time
+    :param bool interp: precompute interpolation segments
+    :param easing: easing name from `EASINGS` or function, None for linear
+    :raises InterpolationUnknownTypes: when values can't be interpolated
+    """
+
+    def __init__(
+        self,
+        keyframes: list[tuple[float, object]],
+        interp: bool = False,
+        easing=None,
+    ) -> None:
+        self.times = array("d", (float(time) for time, _ in keyframes))
+        self.values = [value for _, value in keyframes]
+        self.slopes = []
+        self.deltas = []
+        self.inverse = array("d")
+        self.lut = None
+        # Values as interpolated, numbers are converted to float.
+        self._values = self.values
+
+        if easing is not None and easing != "linear":
+            self.lut = easing_table(easing)
+
+        if interp:
+            self._bake()
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def duration(self) -> float:
+        """Time of last keyframe.
+
+        :getter: yes
+        :setter: no
+        :type: float
+        """
+        return self.times[-1]
+
+    def _bake(self) -> None:
+        """Precompute slope, delta and inverse length of every segment."""
+
+        values = self.values
+        if same_type(values, (int, float)):
+            values = [float(value) for value in values]
+        elif not same_type(values, Point):
+            kind = (int, float) if isinstance(values[0], int | float) else type(values[0])
+            other = next((value for value in values if not isinstance(value, kind)), values[0])
+            raise InterpolationUnknownTypes(type(values[0]), type(other))
+
+        for index in range(len(values) - 1):
+            time1, time2 = self.times[index], self.times[index + 1]
+            value1, value2 = values[index], values[index + 1]
+
+            # Zero-length segment is never looked up, keep it constant.
+            if time2 == time1:
+                slope = value2 * 0
+                inverse = 0.0
+            else:
+                slope = (value2 - value1) / (time2 - time1)
+                inverse = 1 / (time2 - time1)
+
+            self.slopes.append(slope)
+            self.deltas.append(value2 - value1)
+            self.inverse.append(inverse)
+
+        self._values = values
+
+    def index_at(self, time: float) -> int:
+        """Return index of last keyframe not later than `time`, -1 if none."""
+
+        return bisect_right(self.times, time) - 1
+
+    def value_at(self, time: float, offset=None, out: Point | None = None):
+        """Return interpolated value at `time`.
+
+        Value is clamped to first and last keyframes outside of track.
+
+        :param time: track local time
+        :param offset: value to add to keyframe values, or None
+        :param out: point to write point value to instead of creating new one
+        """
+
+        index = bisect_right(self.times, time) - 1
+        if index < 0:
+            index, time = 0, self.times[0]
+        elif index >= len(self.slopes):
+            return self.values[-1] if offset is None else self.values[-1] + offset
+
+        local = time - self.times[index]
+        if self.lut is None:
+            step = self.slopes[index]
+        else:
+            step = self.deltas[index]
+            local = self.lut[int(local * self.inverse[index] * EASING_LUT_SIZE)]
+
+        # Offset goes to segment start, so absolute and offset keyframes
+        # give the same values.
+        start = self._values[index]
+        if out is None:
+            if offset is not None:
+                start = start + offset
+            return start + step * local
+
+        if offset is None:
+            out.x = start.x + step.x * local
+            out.y = start.y + step.y * local
+            out.z = start.z + step.z * local
+        else:
+            out.x = (start.x + offset.x) + step.x * local
+            out.y = (start.y + offset.y) + step.y * local
+            out.z = (start.z + offset.z) + step.z * local
+        return out
+
+
+class AnimationClip:
+    """Keyframe data shared by many animations.
+
+    Clip is immutable, animation instances keep only local time and offset,
+    so formation of any size shares single copy of keyframes and baked
+    segments.
+
+    :param list keyframes: (float, object) tuples
+    :param bool interp: interpolate values between frames or not
+    :param bool loop: loop animation or not
+    :param easing: easing of interpolation between every two keyframes,
+    name from `EASINGS` or function of [0, 1], None for linear
+    """
+
+    def __init__(
+        self,
+        keyframes: list[tuple[float, object]],
+        interp: bool = False,
+        loop: bool = False,
+        easing=None,
+    ) -> None:
+        if not keyframes:
+            raise ValueError("Animation keyframes must not be empty.")
+
+        self.track = Track(sorted(keyframes, key=itemgetter(0)), interp, easing)
+        self.interp = interp
+        self.loop = loop
 
 
 class Animation:
     """Animation unit.
 
-    Animation object holds sorted list of (time, value) items and changes
+    Animation object plays clip of sorted (time, value) items and changes
     selected attribute of bound object according to local animation time.
-    Time measured by timer. When current time is greater or equal then time
-    of next keyframe - animation object changes it to appropriate value.
+    When current time is greater or equal then time of next keyframe -
+    animation object changes it to appropriate value.
     When animation is done and if not looped - raise StopIteration.
     In case of interpolated animation value calculation occurs within two
     bounding frames and on frame switch.
 
+    Animation is created either from keyframes or from shared clip. With
+    offset every applied value is new object, otherwise keyframe values are
+    applied as is and must not be changed in place.
+
     :param str name: animation name
     :param object bind: object to bind animation
     :param str attr: attribute to change in frames
     :param list keyframes: (float, object) tuples
     :param bool interp: interpolate values between frames or not
     :param bool loop: loop animation or not
+    :param AnimationClip clip: shared clip to play instead of keyframes
+    :param offset: value to add to clip values, or None
     """
 
     def __init__(
@@ -116,29 +573,33 @@ class Animation:
         name: str,
         bind: object,
         attr: str,
-        keyframes: list[tuple[float, object]],
+        keyframes: list[tuple[float, object]] | None = None,
         interp: bool = False,
         loop: bool = False,
+        clip: AnimationClip | None = None,
+        offset: object = None,
     ) -> None:
         self._name = name
         self._obj = bind
         self._attr = attr
 
-        if not keyframes:
-            raise ValueError("Animation keyframes must not be empty.")
-        self._keyframes = sorted(keyframes, key=itemgetter(0))
+        if clip is None:
+            clip = AnimationClip(keyframes, interp, loop)
+        self._clip = clip
+        self._offset = offset
 
-        self._interp = interp
-        self._loop = loop
+        # Local time in seconds
+        self._elapsed = 0.0
 
-        # Timer for tracking local time
-        self._timer = Timer(self._keyframes[-1][0], lambda: True)
-        self._timer.start()
+        # Interpolated points are written to the same point every frame.
+        self._out = None
+        if clip.interp and isinstance(clip.track.values[0], Point):
+            self._out = Point()
 
-        # Current keyframe index
+        # Index of next keyframe to apply
         self._current = 0
 
-        if self._interp:
+        if clip.interp:
             self.update = self._update_interpolated
         else:
             self.update = self._update_discrete
@@ -148,6 +609,11 @@ class Animation:
         """Animation's name."""
         return self._name
 
+    @property
+    def clip(self) -> AnimationClip:
+        """Played clip."""
+        return self._clip
+
     def _apply_value(self, value: object) -> None:
         """Apply new value to linked object.
 
@@ -156,59 +622,71 @@ class Animation:
 
         setattr(self._obj, self._attr, value)
 
+    def _keyframe_value(self, index: int) -> object:
+        """Return value of keyframe with offset applied."""
+
+        value = self._clip.track.values[index]
+        return value if self._offset is None else value + self._offset
+
     def _update_interpolated(self, dt: int) -> None:
         """Advance animation and interpolate value.
 
         .. important::
 
-           Animation frame switching depends on interp mode animation with interpolation
-           switches frame only when current local time exceeds NEXT frames' time border.
+           Animation with interpolation finishes when current local time reaches
+           last keyframe's time, last keyframe's value is applied exactly.
         """
 
         self._check_animation_state()
-        self._timer.update(dt)
-
-        current_time = self._timer.elapsed
-        keyframe = self._keyframes[self._current]
-        next_keyframe = self._keyframes[self._current + 1]
+        self._elapsed += dt / 1000
 
-        # it's time to switch keyframe
-        if current_time >= next_keyframe[0]:
-            self._current += 1
-            keyframe = self._keyframes[self._current]
-
-        if self._current == len(self._keyframes) - 1:
-            self._apply_value(keyframe[1])
-            self._current += 1
+        track = self._clip.track
+        if self._elapsed >= track.duration:
+            self._apply_value(self._keyframe_value(-1))
+            self._current = len(track)
             self._check_animation_state()
             return
 
-        next_keyframe = self._keyframes[self._current + 1]
-
-        value = interpolate(keyframe, next_keyframe, current_time)
-        self._apply_value(value)
+        self._apply_value(track.value_at(self._elapsed, self._offset, self._out))
 
     def _update_discrete(self, dt: int) -> None:
         """Advance animation without interpolating value.
 
         .. important::
 
-           Animation frame switching depends on interp mode discrete animation swiches frame and
-           updates value only if current local time is >= time of current keyframe.
+           Discrete animation switches frame and updates value only if current
+           local time is >= time of next keyframe. If several keyframes were
+           passed during one update, only the last of them is applied.
 
            No need to worry about calculating value between frames - thus no need to complicate
            behaviour.
         """
 
         self._check_animation_state()
-        self._timer.update(dt)
+        self._elapsed += dt / 1000
 
-        keyframe = self._keyframes[self._current]
+        index = self._clip.track.index_at(self._elapsed)
 
         # Check if animation need to switch keyframe
-        if self._timer.elapsed >= keyframe[0]:
-            self._apply_value(keyframe[1])
-            self._current += 1
+        if index >= self._current:
+            self._apply_value(self._keyframe_value(index))
+            self._current = index + 1
+
+    @property
+    def finished(self) -> bool:
+        """If animation isn't looped and all its keyframes are passed.
+
+        :getter: yes
+        :setter: no
+        :type: bool
+        """
+        return not self._clip.loop and len(self._clip.track) == self._current
+
+    def reset(self) -> None:
+        """Play animation from the beginning."""
+
+        self._elapsed = 0.0
+        self._current = 0
 
     def _check_animation_state(self) -> None:
         """Check animation state and restart if needed.
@@ -216,15 +694,224 @@ class Animation:
         :raise StopIteration: when animation exceeded frames.
         """
 
-        if len(self._keyframes) == self._current:
-            if self._loop:
+        if len(self._clip.track) == self._current:
+            if self._clip.loop:
                 self._current = 0
-                self._timer.restart()
+                self._elapsed = 0.0
             else:
-                self._timer.stop()
                 raise StopIteration
 
 
+class _ClipBatch:
+    """Animations of one clip with local times and offsets in columns.
+
+    :param AnimationClip clip: played clip
+    """
+
+    def __init__(self, clip) -> None:
+        track = clip.track
+
+        self.clip = clip
+        self.store = Columns(4)
+        self.animations = self.store.items
+        self.elapsed, *offsets = self.store.columns
+        self.offsets = tuple(offsets)
+
+        # Segment start values and steps as (x, y, z) rows for NumPy, step
+        # is slope of linear segment or value delta of eased one.
+        self.starts = None
+        self.steps = None
+        self.inverse = None
+        self.lut = None
+        if numpy is not None:
+            steps = track.slopes if track.lut is None else track.deltas
+            self.starts = numpy.array(
+                [value.as_tuple3() for value in track._values[:-1]], dtype=float
+            ).reshape(-1, 3)
+            self.steps = numpy.array(
+                [step.as_tuple3() for step in steps], dtype=float
+            ).reshape(-1, 3)
+            if track.lut is not None:
+                self.inverse = numpy.frombuffer(track.inverse)
+                self.lut = numpy.frombuffer(track.lut)
+
+    def __len__(self) -> int:
+        return len(self.animations)
+
+    def __contains__(self, animation) -> bool:
+        return animation in self.store
+
+    def add(self, animation) -> None:
+        """Add animation, its current local time is taken over."""
+
+        # pylint: disable=protected-access
+        offset = animation._offset or Point()
+        self.store.add(animation, animation._elapsed, *offset.as_tuple3())
+
+    def remove(self, animation) -> None:
+        """Remove animation, last one takes its place."""
+
+        # Local time is given back for animation to continue on its own.
+        animation._elapsed = self.store.remove(animation)[0]  # pylint: disable=protected-access
+
+
+class AnimationSystem:
+    """Batched update of interpolated point animations.
+
+    Animations of objects are grouped by clip. Local times and offsets of
+    every group are kept in contiguous arrays, and all animations of a group
+    are evaluated at once: segment lookup, one multiply-add and write-back
+    of resulting points. When NumPy is available, evaluation is vectorized
+    over zero-copy views of the arrays, otherwise values are computed one
+    by one without per-object animation calls. Both ways give exactly the
+    same values as :meth:`Animation.update`.
+
+    :param bool vectorize: use NumPy, defaults to NumPy availability
+    """
+
+    def __init__(self, vectorize=None) -> None:
+        self._vectorize = use_numpy(vectorize, "animation")
+        self._batches = {}
+
+    def __len__(self) -> int:
+        return sum(len(batch) for batch in self._batches.values())
+
+    def __contains__(self, animation) -> bool:
+        batch = self._batches.get(animation.clip)
+        return batch is not None and animation in batch
+
+    @staticmethod
+    def accepts(animation) -> bool:
+        """Return whether animation can be advanced by system."""
+
+        clip = animation.clip
+        offset = animation._offset  # pylint: disable=protected-access
+        return (
+            clip.interp
+            and len(clip.track) > 1
+            and same_type(clip.track.values, Point)
+            and (offset is None or isinstance(offset, Point))
+        )
+
+    def add(self, animation) -> None:
+        """Start advancing animation.
+
+        :param Animation animation: interpolated animation of points
+        """
+
+        batch = self._batches.get(animation.clip)
+        if batch is None:
+            batch = self._batches[animation.clip] = _ClipBatch(animation.clip)
+        elif animation in batch:
+            return
+
+        batch.add(animation)
+
+    def remove(self, animation) -> None:
+        """Stop advancing animation, it can continue on its own."""
+
+        batch = self._batches.get(animation.clip)
+        if batch is None or animation not in batch:
+            return
+
+        batch.remove(animation)
+        if not batch.animations:
+            del self._batches[animation.clip]
+
+    @staticmethod
+    def _advance(batch, scale) -> list[int]:
+        """Advance animations one by one, return indices of finished ones."""
+
+        track = batch.clip.track
+        elapsed = batch.elapsed
+
+        finished = []
+        for index, animation in enumerate(batch.animations):
+            time = elapsed[index] + scale
+            elapsed[index] = time
+            if time >= track.duration:
+                finished.append(index)
+                continue
+
+            # pylint: disable=protected-access
+            setattr(
+                animation._obj,
+                animation._attr,
+                track.value_at(time, animation._offset, animation._out),
+            )
+
+        return finished
+
+    @staticmethod
+    def _advance_vectorized(batch, scale) -> list[int]:
+        """Advance all animations at once, return indices of finished ones."""
+
+        track = batch.clip.track
+        times = numpy.frombuffer(track.times)
+
+        # View shares memory with array, so local times are updated in place.
+        elapsed = numpy.frombuffer(batch.elapsed)
+        elapsed += scale
+
+        segments = numpy.searchsorted(times, elapsed, side="right") - 1
+        numpy.clip(segments, 0, len(batch.steps) - 1, out=segments)
+        local = numpy.maximum(elapsed, times[0]) - times[segments]
+        if batch.lut is not None:
+            steps = (local * batch.inverse[segments] * EASING_LUT_SIZE).astype(numpy.int64)
+            # Finished animations are past the table, their values are dropped.
+            local = batch.lut[numpy.minimum(steps, EASING_LUT_SIZE)]
+
+        offsets = numpy.column_stack([numpy.frombuffer(column) for column in batch.offsets])
+        values = (batch.starts[segments] + offsets) + batch.steps[segments] * local[:, None]
+
+        finished = elapsed >= track.duration
+        # pylint: disable=protected-access
+        for animation, (x, y, z), done in zip(
+            batch.animations, values.tolist(), finished.tolist(), strict=True
+        ):
+            if not done:
+                out = animation._out
+                out.x = x
+                out.y = y
+                out.z = z
+                setattr(animation._obj, animation._attr, out)
+
+        return numpy.flatnonzero(finished).tolist()
+
+    def update(self, dt: int) -> None:
+        """Advance all animations.
+
+        Finished looped animations start over, other finished ones are
+        removed from system.
+
+        :param int dt: time delta in milliseconds
+        """
+
+        scale = dt / 1000
+        for batch in list(self._batches.values()):
+            if self._vectorize:
+                finished = self._advance_vectorized(batch, scale)
+            else:
+                finished = self._advance(batch, scale)
+
+            if not finished:
+                continue
+
+            # Finished animations get exact last value, as Animation does.
+            # pylint: disable=protected-access
+            animations = [batch.animations[index] for index in finished]
+            for index, animation in zip(finished, animations, strict=True):
+                animation._apply_value(animation._keyframe_value(-1))
+                if batch.clip.loop:
+                    batch.elapsed[index] = 0.0
+
+            if not batch.clip.loop:
+                # Storage is reordered on removal, so it's done after the step.
+                for animation in animations:
+                    animation._current = len(batch.clip.track)
+                    self.remove(animation)
+
+
 def linear_equation(
     val1: float,
     val2: float,
@@ -283,12 +970,17 @@ def interpolate(first, second, current_time):
         )
 
     elif frames_of(Point):
-        value = linear_equation(
-            first[1],  # TODO FIXME: check, it seems that this case is broken
-            second[1],
-            float(first[0]),
-            float(second[0]),
-            float(current_time),
+        value = Point(
+            *(
+                linear_equation(
+                    float(value1),
+                    float(value2),
+                    float(first[0]),
+                    float(second[0]),
+                    float(current_time),
+                )
+                for value1, value2 in zip(first[1].as_tuple3(), second[1].as_tuple3(), strict=True)
+            )
         )
     else:
         raise InterpolationUnknownTypes(type(first[1]), type(second[1]))
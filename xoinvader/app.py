@@ -1,27 +1,222 @@
 """XOInvader game application class."""
 
+import asyncio
 import logging
 import shutil
+import sys
+import time
 from pprint import pformat
 
 from xo1 import Application, Palette
+from xo1.window import deinit_window
 
 from xoinvader import Settings
-from xoinvader.common import update_resized
+from xoinvader.common import get_config, update_resized
 from xoinvader.ingame import InGameState
-from xoinvader.menu import GameOverState, PauseMenuState
+from xoinvader.menu import GameOverState, LoadingState, PauseMenuState
+from xoinvader.preload import Preloader
+from xoinvader.profiler import FrameProfiler
 from xoinvader.style import Style
 
 
 LOG = logging.getLogger(__name__)
 
 
+class FixedTimestep:
+    """Fixed timestep accumulator.
+
+    Collects frame time and tells how many constant simulation steps to run.
+    Number of steps per frame is capped, lagging time above the cap is
+    dropped to avoid spiral of death under load.
+
+    :param int step: simulation step in milliseconds
+    :param int max_steps: max simulation steps per frame
+    """
+
+    def __init__(self, step: int, max_steps: int) -> None:
+        if step <= 0 or max_steps <= 0:
+            raise ValueError("Step and max steps must be positive.")
+
+        self._step = step
+        self._max_steps = max_steps
+        self._accumulator = 0
+
+    @property
+    def step(self) -> int:
+        """Simulation step in milliseconds.
+
+        :getter: yes
+        :setter: no
+        :type: int
+        """
+        return self._step
+
+    @property
+    def alpha(self) -> float:
+        """Fraction of step accumulated but not simulated yet.
+
+        Renderer can use it to interpolate between two last simulated states.
+
+        :getter: yes
+        :setter: no
+        :type: float
+        """
+        return self._accumulator / self._step
+
+    def advance(self, dt: int) -> int:
+        """Accumulate frame time and return number of steps to simulate.
+
+        :param dt: frame time in milliseconds
+        """
+
+        self._accumulator += dt
+        steps, self._accumulator = divmod(self._accumulator, self._step)
+
+        if steps > self._max_steps:
+            LOG.debug(
+                "Simulation is behind, dropping %s ms",
+                (steps - self._max_steps) * self._step,
+            )
+            steps = self._max_steps
+
+        return int(steps)
+
+
+class FramePacer:
+    """Adaptive frame rate controller.
+
+    Keeps moving averages of frame cost (wall time spent in tick) and frame
+    interval. Every `window` frames compares cost with frame budget: rate is
+    cut by `decrease` factor when cost exceeds `high` fraction of budget, and
+    raised by one FPS when cost is below `low` fraction. Simulation time is
+    unaffected, only frames become less frequent.
+
+    :param float min_fps: lowest frame rate
+    :param float max_fps: highest and initial frame rate
+    :param bool adaptive: adjust rate or only measure
+    """
+
+    WINDOW = 30
+    """Frames between rate adjustments."""
+
+    SMOOTHING = 0.1
+    """Weight of new sample in moving averages."""
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        min_fps: float,
+        max_fps: float,
+        adaptive: bool = True,
+        low: float = 0.5,
+        high: float = 0.85,
+        decrease: float = 0.8,
+    ) -> None:
+        if not 0 < min_fps <= max_fps:
+            raise ValueError("FPS bounds must be positive and ordered.")
+
+        self._min_fps = min_fps
+        self._max_fps = max_fps
+        self._low = low
+        self._high = high
+        self._decrease = decrease
+        self.adaptive = adaptive
+
+        self._target_fps = max_fps
+        self._cost = 0.0
+        self._interval = 1000 / max_fps
+        self._frames = 0
+
+    @property
+    def target_fps(self) -> float:
+        """Frame rate the loop is paced at.
+
+        :getter: yes
+        :setter: no
+        :type: float
+        """
+        return self._target_fps
+
+    @property
+    def actual_fps(self) -> float:
+        """Measured frame rate.
+
+        :getter: yes
+        :setter: no
+        :type: float
+        """
+        return 1000 / self._interval if self._interval else 0.0
+
+    @property
+    def period(self) -> float:
+        """Frame period in milliseconds for target frame rate.
+
+        :getter: yes
+        :setter: no
+        :type: float
+        """
+        return 1000 / self._target_fps
+
+    @property
+    def load(self) -> float:
+        """Average frame cost as fraction of frame period.
+
+        :getter: yes
+        :setter: no
+        :type: float
+        """
+        return self._cost / self.period
+
+    def update(self, cost: float, interval: int) -> bool:
+        """Add frame measurements, adjust target rate if it's time.
+
+        :param cost: wall time of frame processing in milliseconds
+        :param interval: time since previous frame in milliseconds
+        :return: whether target rate changed
+        """
+
+        self._cost += (cost - self._cost) * self.SMOOTHING
+        self._interval += (interval - self._interval) * self.SMOOTHING
+        self._frames += 1
+
+        if not self.adaptive or self._frames < self.WINDOW:
+            return False
+        self._frames = 0
+
+        load = self.load
+        if load > self._high:
+            target = max(self._min_fps, self._target_fps * self._decrease)
+        elif load < self._low:
+            target = min(self._max_fps, self._target_fps + 1)
+        else:
+            return False
+
+        if target == self._target_fps:
+            return False
+
+        LOG.debug(
+            "Frame load %.2f, pacing %.1f -> %.1f FPS", load, self._target_fps, target
+        )
+        self._target_fps = target
+        return True
+
+
 class XOInvader(Application):
     """XOInvader game application class."""
 
-    def __init__(self) -> None:
+    palette_class = Palette
+    """Palette implementation, backends may override it."""
+
+    def __init__(self, recorder=None) -> None:
+
+        self._frame_listeners = []
+        self._frame_time = 0.0
+        self._stopped = None
+        self._reader = None
+        self._reader_enabled = False
+        self.profiler = FrameProfiler()
 
-        palette = Palette(
+        palette = self.palette_class(
             [
                 # User interface colors
                 ("ui_norm", Palette.COLOR_WHITE, Palette.COLOR_BLACK),
@@ -55,6 +250,70 @@ class XOInvader(Application):
             },
         )
 
+        self._init_backend(palette)
+
+        # Must be attached before states create their event handlers.
+        if recorder is not None:
+            self._event_queue = recorder.wrap(self._event_queue)
+            self.add_frame_listener(recorder.on_frame)
+
+        Style().init_styles(palette)
+
+        self.resize_to_terminal()
+
+        # Level is loaded while loading screen is shown, level state is
+        # created on first entry.
+        self.preloader = Preloader().start()
+
+        loop = get_config().loop
+        self._timestep = (
+            FixedTimestep(loop.step, loop.max_steps) if loop.fixed_step else None
+        )
+        self.pacer = FramePacer(loop.min_fps, loop.max_fps, loop.adaptive)
+        if self.pacer.adaptive:
+            self._apply_pacing()
+
+        self.register(LoadingState)
+        self.register(PauseMenuState)
+        self.register(GameOverState)
+
+    def enter_game(self) -> None:
+        """Make level state current, creating it on first entry.
+
+        Waits for preloader if it hasn't finished.
+        """
+
+        if self.loading:
+            self.register(InGameState)
+        self.state = "InGameState"
+        self._watch_input(True)
+
+    @property
+    def loading(self) -> bool:
+        """If level state isn't created yet and loading screen is shown.
+
+        :getter: yes
+        :setter: no
+        :type: bool
+        """
+
+        return "InGameState" not in self._states
+
+    def preload_level(self, progress=None) -> Preloader:
+        """Start loading level assets in background.
+
+        Level state takes assets from the last started preloader.
+
+        :param function progress: callback taking number of done and total
+        steps, called from worker thread
+        """
+
+        self.preloader = Preloader(progress).start()
+        return self.preloader
+
+    def _init_backend(self, palette: Palette) -> None:
+        """Create window, renderer and event queue."""
+
         super().__init__(
             x=Settings.layout.field.border.x,
             y=Settings.layout.field.border.y,
@@ -62,13 +321,23 @@ class XOInvader(Application):
             title="XOInvader",
         )
 
-        Style().init_styles(palette)
+    def _deinit_backend(self) -> None:
+        """Restore terminal state."""
 
-        self.resize_to_terminal()
+        self.renderer.clear()
+        deinit_window(self.renderer.screen)
 
-        self.register(InGameState)
-        self.register(PauseMenuState)
-        self.register(GameOverState)
+    @staticmethod
+    def input_fd() -> int | None:
+        """File descriptor of input to watch in asyncio mode.
+
+        :return: stdin descriptor or None if stdin isn't a terminal
+        """
+
+        try:
+            return sys.stdin.fileno() if sys.stdin.isatty() else None
+        except (AttributeError, OSError, ValueError):
+            return None
 
     @staticmethod
     def resize_to_terminal() -> None:
@@ -77,14 +346,263 @@ class XOInvader(Application):
         col, lines = shutil.get_terminal_size()
         update_resized(col - 1, lines - 1)
 
+    def _apply_pacing(self) -> None:
+        """Set tick period to pacer's target.
+
+        eaf treats `fps` as tick period in milliseconds.
+        """
+
+        self.fps = round(self.pacer.period)
+        self._pc.callback_time = self.fps
+
+    @property
+    def target_fps(self) -> float:
+        """Frame rate the loop is paced at.
+
+        :getter: yes
+        :setter: no
+        :type: float
+        """
+
+        return 1000 / self.fps
+
+    @property
+    def actual_fps(self) -> float:
+        """Measured frame rate.
+
+        :getter: yes
+        :setter: no
+        :type: float
+        """
+
+        return self.pacer.actual_fps
+
+    @property
+    def frame_time(self) -> float:
+        """Measured wall time of last frame's work in milliseconds.
+
+        Unlike frame time passed to listeners, it isn't simulated time, so
+        it shows real cost in headless runs and replays too.
+
+        :getter: yes
+        :setter: no
+        :type: float
+        """
+
+        return self._frame_time
+
+    @property
+    def interpolation(self) -> float:
+        """Render interpolation factor between simulated states.
+
+        Always 0 in variable timestep mode.
+
+        :getter: yes
+        :setter: no
+        :type: float
+        """
+
+        return self._timestep.alpha if self._timestep else 0.0
+
+    def simulate(self, dt: int) -> None:
+        """Advance current state by frame time.
+
+        Runs fixed simulation steps in fixed timestep mode, or single
+        update with frame time otherwise.
+
+        :param dt: frame time in milliseconds
+        """
+
+        if not self._timestep:
+            self._state.update(dt)
+            return
+
+        for _ in range(self._timestep.advance(dt)):
+            self._state.update(self._timestep.step)
+
+    def add_frame_listener(self, listener) -> None:
+        """Add callable to call with application and frame time after frame.
+
+        :param callable listener: listener(app, dt)
+        """
+
+        self._frame_listeners.append(listener)
+
+    def remove_frame_listener(self, listener) -> None:
+        """Remove frame listener."""
+
+        self._frame_listeners.remove(listener)
+
+    def end_frame(self, dt: int) -> None:
+        """Count finished frame and notify frame listeners.
+
+        :param dt: frame time in milliseconds
+        """
+
+        self._frames += 1
+        for listener in self._frame_listeners:
+            listener(self, dt)
+
+    def _tick(self) -> None:
+        """Process input, run simulation and render once."""
+
+        if not self._state:
+            return
+
+        if self.loading:
+            # Loading screen frames aren't game frames: input stays queued,
+            # nothing is simulated and frame listeners aren't notified, so
+            # recorded sessions don't depend on loading time.
+            if not self.preloader.done:
+                self._state.render()
+                return
+
+            try:
+                self.preloader.result()
+            except Exception:  # pylint: disable=broad-except
+                LOG.exception("Level loading failed")
+                self.stop()
+                return
+
+            self.enter_game()
+            # Loading time isn't simulated.
+            self._clock.tick()
+
+        dt = self._clock.tick()
+
+        if not self.profiler.enabled:
+            start = time.perf_counter()
+            self._state.events()
+            self.simulate(dt)
+            self._state.render()
+
+            self._frame_time = (time.perf_counter() - start) * 1000
+            self._pace(self._frame_time, dt)
+            self.end_frame(dt)
+            return
+
+        start = time.perf_counter()
+        self._state.events()
+        events = time.perf_counter()
+        self.simulate(dt)
+        update = time.perf_counter()
+        self._state.render()
+        render = time.perf_counter()
+
+        self.profiler.record("events", (events - start) * 1000)
+        self.profiler.record("update", (update - events) * 1000)
+        self.profiler.record("render", (render - update) * 1000)
+        self._frame_time = (render - start) * 1000
+        self.profiler.end_frame(self._frame_time)
+
+        self._pace(self._frame_time, dt)
+        self.end_frame(dt)
+
+    def _pace(self, cost: float, dt: int) -> None:
+        """Pass frame measurements to pacer and apply new rate."""
+
+        if self.pacer.update(cost, dt):
+            self._apply_pacing()
+
     def tick(self) -> None:
 
         try:
-            super().tick()
+            self._tick()
+        except KeyboardInterrupt:
+            self.stop()
         except Exception as exc:
             LOG.error("Error: %s", exc)
             LOG.info(pformat(self.state._objects))
 
+    def _watch_input(self, enabled: bool) -> None:
+        """Start or stop watching input in asyncio mode."""
+
+        if self._reader is None or self._reader_enabled == enabled:
+            return
+
+        loop, fd = self._reader
+        if not enabled:
+            loop.remove_reader(fd)
+        else:
+            try:
+                loop.add_reader(fd, self._on_input)
+            except NotImplementedError:
+                # Input is still handled by frames.
+                self._reader = None
+                return
+        self._reader_enabled = enabled
+
+    def _on_input(self) -> None:
+        """Handle input as soon as it's available, between frames."""
+
+        if self.loading:
+            # Loading screen leaves input queued and reader is level-triggered,
+            # so it would fire on every loop iteration. Watching is resumed
+            # when game starts.
+            self._watch_input(False)
+            return
+
+        try:
+            if self._state:
+                self._state.events()
+        except KeyboardInterrupt:
+            self.stop()
+
+    async def run_async(self) -> None:
+        """Run main loop in the running asyncio event loop.
+
+        Application must be created inside the event loop. Frames are
+        scheduled with `loop.call_at` on absolute deadlines, so pacing doesn't
+        drift with frame time; deadlines missed under load are skipped. Input
+        is handled by reader callback as soon as it arrives. Game timers stay
+        driven by simulation time to keep fixed timestep and replays
+        deterministic.
+        """
+
+        loop = asyncio.get_running_loop()
+        self._stopped = loop.create_future()
+
+        # Periodic callback of tornado runs on the same loop, frames are
+        # scheduled here instead.
+        self._pc.stop()
+
+        fd = self.input_fd()
+        if fd is not None:
+            self._reader = (loop, fd)
+            self._watch_input(not self.loading)
+
+        deadline = loop.time()
+        try:
+            while not self._stopped.done():
+                self.tick()
+
+                # eaf treats `fps` as period in milliseconds, pacer may change it.
+                deadline += self.fps / 1000
+                deadline = max(deadline, loop.time())
+
+                frame = loop.create_future()
+                handle = loop.call_at(deadline, frame.set_result, None)
+                await asyncio.wait(
+                    (frame, self._stopped), return_when=asyncio.FIRST_COMPLETED
+                )
+                handle.cancel()
+        finally:
+            self._watch_input(False)
+            self._reader = None
+            self._stopped = None
+            self._deinit_backend()
+
+    def stop(self) -> None:
+        """Stop application, finishes :meth:`run_async` in asyncio mode."""
+
+        if self._stopped is None:
+            super().stop()
+            return
+
+        self._pc.stop()
+        if not self._stopped.done():
+            self._stopped.set_result(None)
+
 
 def current():
     return XOInvader.current()
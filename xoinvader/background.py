@@ -2,7 +2,6 @@
 
 from xo1 import Renderable, Surface
 
-from xoinvader import app
 from xoinvader.common import Settings
 from xoinvader.utils import Point
 
@@ -120,8 +119,8 @@ class Background(Renderable):
 
     :param bool loop: flag if current chunk should loop after it had ended
     :param bool loop_all: flag if whole background should repeat from beginning
-    :param float speed: speed of background advance. Can be negative to
-    represent moving backwards
+    :param float speed: speed of background advance in lines per second. Can
+    be negative to represent moving backwards
     :param list chunks: list of background chunks
     :param list background: list of background lines. You may change it at any
     time. This list directly converts into Surface which then goes to the
@@ -354,21 +353,21 @@ class Background(Renderable):
         if self._speed == 0:
             return
 
-        # FIXME: now this doesn't work properly
+        # Advance doesn't depend on frame rate, so scrolling keeps its speed
+        # when frame pacing changes. Remainder is kept for the next update,
+        # long frame advances several lines.
         self._elapsed_ms += dt * abs(self._speed)
-        if self._elapsed_ms / 1000 > (
-            1.0 / app.current().fps * 1000 * abs(self._speed)
-        ):
+        if self._elapsed_ms < 1000:
             return
 
-        self._elapsed_ms = 0
-
         advance = 1 if self._speed > 0 else -1
-        new_line = self._advance_chunk(advance)
-        if advance > 0:
-            self._background.pop()
-            self._background.insert(0, new_line)
-        else:
-            self._background.pop(0)
-            self._background.append(new_line)
+        while self._elapsed_ms >= 1000:
+            self._elapsed_ms -= 1000
+            new_line = self._advance_chunk(advance)
+            if advance > 0:
+                self._background.pop()
+                self._background.insert(0, new_line)
+            else:
+                self._background.pop(0)
+                self._background.append(new_line)
         self.update_surface()
@@ -15,21 +15,170 @@ from xo1 import Renderable, Surface
 from xoinvader import app
 from xoinvader.collision import Collider
 from xoinvader.common import Settings, get_config
-from xoinvader.utils import Point
+from xoinvader.utils import Columns, Point, use_numpy
+
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
 
 
 CONFIG = get_config().charge
 LOG = logging.getLogger(__name__)
 
 
+class ChargeSystem:
+    """Batched movement and culling of weapon charges.
+
+    Positions, velocities and image sizes of all alive charges are kept in
+    contiguous `array.array` storage and advanced in one step per frame.
+    When NumPy is available the step is vectorized over zero-copy views of
+    the same storage. Charge objects stay the handles for collision
+    callbacks, their positions are written back after each step.
+
+    :param bool vectorize: use NumPy, defaults to NumPy availability
+    """
+
+    def __init__(self, vectorize=None) -> None:
+        self._vectorize = use_numpy(vectorize, "charge")
+
+        self._store = Columns(6)
+        self._charges = self._store.items
+        (
+            self._xs,
+            self._ys,
+            self._dxs,
+            self._dys,
+            self._widths,
+            self._heights,
+        ) = self._store.columns
+
+    def __len__(self) -> int:
+        return len(self._charges)
+
+    def __contains__(self, charge) -> bool:
+        return charge in self._store
+
+    def add(self, charge, dx=0, dy=0) -> None:
+        """Start managing charge movement.
+
+        :param charge: charge object, must provide `pos` and `image`
+        :param float dx: horizontal speed, cells per second
+        :param float dy: vertical speed, cells per second
+        """
+
+        if charge in self._store:
+            return
+
+        self._store.add(
+            charge,
+            charge.pos.x,
+            charge.pos.y,
+            dx,
+            dy,
+            charge.image.width,
+            charge.image.height,
+        )
+
+    def remove(self, charge) -> None:
+        """Stop managing charge movement.
+
+        Last charge takes place of removed one, so removal is O(1).
+
+        :param charge: managed charge object
+        """
+
+        if charge in self._store:
+            self._store.remove(charge)
+
+    def _advance(self, scale, border):
+        """Move charges one by one, return charges that left the field."""
+
+        xs, ys = self._xs, self._ys
+        dxs, dys = self._dxs, self._dys
+        widths, heights = self._widths, self._heights
+
+        culled = []
+        for index, charge in enumerate(self._charges):
+            x = xs[index] + dxs[index] * scale
+            y = ys[index] + dys[index] * scale
+            xs[index] = x
+            ys[index] = y
+
+            pos = charge.pos
+            pos.x = x
+            pos.y = y
+
+            width, height = widths[index], heights[index]
+            if (
+                int(x) > width + border.x
+                or int(x) + width < 0
+                or int(y) > height + border.y
+                or int(y) + height < 0
+            ):
+                culled.append(charge)
+
+        return culled
+
+    def _advance_vectorized(self, scale, border):
+        """Move all charges at once, return charges that left the field."""
+
+        # Views share memory with arrays, so positions are updated in place.
+        xs = numpy.frombuffer(self._xs)
+        ys = numpy.frombuffer(self._ys)
+        widths = numpy.frombuffer(self._widths)
+        heights = numpy.frombuffer(self._heights)
+
+        xs += numpy.frombuffer(self._dxs) * scale
+        ys += numpy.frombuffer(self._dys) * scale
+
+        for charge, x, y in zip(self._charges, xs.tolist(), ys.tolist(), strict=True):
+            pos = charge.pos
+            pos.x = x
+            pos.y = y
+
+        int_xs = xs.astype(numpy.int64)
+        int_ys = ys.astype(numpy.int64)
+        out = (
+            (int_xs > widths + border.x)
+            | (int_xs + widths < 0)
+            | (int_ys > heights + border.y)
+            | (int_ys + heights < 0)
+        )
+
+        return [self._charges[index] for index in numpy.flatnonzero(out).tolist()]
+
+    def update(self, dt) -> None:
+        """Advance all charges and destroy ones that left the field.
+
+        :param int dt: time delta in milliseconds
+        """
+
+        if not self._charges:
+            return
+
+        scale = dt / 1000
+        border = Settings.layout.field.border
+
+        if self._vectorize:
+            culled = self._advance_vectorized(scale, border)
+        else:
+            culled = self._advance(scale, border)
+
+        # Storage may be resized here, so it's done after the step.
+        for charge in culled:
+            charge.destroy()
+
+
 # TODO: [components]: move some variables to default GameObject components
 # pylint: disable=too-many-arguments,too-many-instance-attributes
 class WeaponCharge(Renderable):
     """Weapon charge representation.
 
-    Separate renderable object that updates and renders as others
-    in main loop. Must register/deregister itself via state's
-    add/remove methods.
+    Separate renderable object that renders as others in main loop.
+    Must register/deregister itself via state's add/remove methods.
+    Movement is performed in batch by state's :class:`ChargeSystem`.
     """
 
     def __init__(self, pos: Point, image, damage=0, radius=0, dx=0, dy=0) -> None:
@@ -53,6 +202,8 @@ class WeaponCharge(Renderable):
         # Common collider for any shape charge
         self._collider = Collider.simple(self)
 
+        app.current().state.charges.add(self, self._dx, self._dy)
+
     @property
     def pos(self):
         return self._pos
@@ -73,12 +224,7 @@ class WeaponCharge(Renderable):
         )
 
     def update(self, dt) -> None:
-        """Update coords."""
-
-        self._pos += Point(self._dx, self._dy) * dt / 1000
-
-        if self.out_of_border():
-            self.destroy()
+        """Coords are updated by :class:`ChargeSystem`."""
 
     def destroy(self) -> None:
         """Self-destroying routine."""
@@ -86,6 +232,7 @@ class WeaponCharge(Renderable):
         if not self._destroy:
             LOG.debug("Destroying charge %s", self)
             self._destroy = True
+            app.current().state.charges.remove(self)
             app.current().state.collision.remove(self._collider)
             app.current().state.remove(self)
 
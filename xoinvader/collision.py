@@ -1,5 +1,6 @@
 """Collision detection system and component module."""
 
+import contextlib
 import functools
 import logging
 import re
@@ -109,8 +110,13 @@ class CollisionManager:
     SOLID_MATTER = "#"
 
     def __init__(self) -> None:
-        self._colliders = weakref.WeakSet()
+        # Weak mapping keeps insertion order, so collisions are handled in
+        # the same order from run to run (needed for replays).
+        self._colliders = weakref.WeakKeyDictionary()
         self._collisions = COLLISIONS
+        self.pairs_tested = 0
+        """Number of collider pairs checked by last update."""
+        self._batch = None
 
     def add(self, collider) -> None:
         """Add collider.
@@ -118,8 +124,31 @@ class CollisionManager:
         :param :class:`xoinvader.collision.Collider` collider:
         """
 
+        if self._batch is not None:
+            self._batch.append(collider)
+            return
+
         LOG.debug("Adding collider %s\n pos: %s", collider, collider.pos)
-        self._colliders.add(collider)
+        self._colliders[collider] = None
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Collect colliders added inside the block and register them at once.
+
+        Nested blocks are merged into outer one.
+        """
+
+        if self._batch is not None:
+            yield
+            return
+
+        self._batch = []
+        try:
+            yield
+        finally:
+            batch, self._batch = self._batch, None
+            LOG.debug("Adding %s colliders", len(batch))
+            self._colliders.update(dict.fromkeys(batch))
 
     def remove(self, collider) -> None:
         """Remove collider.
@@ -128,12 +157,16 @@ class CollisionManager:
         """
 
         LOG.debug("Removing collider %s\n pos %s", collider, collider.pos)
-        self._colliders.remove(collider)
+        if self._batch is not None and collider in self._batch:
+            self._batch.remove(collider)
+            return
+        del self._colliders[collider]
 
     # pylint: disable=too-many-nested-blocks
     def update(self) -> None:
         """Detect and process all collisions."""
 
+        self.pairs_tested = 0
         for pair in self._collisions:
             colliders_type_1 = [
                 item for item in self._colliders if item.col_type == pair.first
@@ -141,6 +174,7 @@ class CollisionManager:
             colliders_type_2 = [
                 item for item in self._colliders if item.col_type == pair.second
             ]
+            self.pairs_tested += len(colliders_type_1) * len(colliders_type_2)
             for collider_1 in colliders_type_1:
                 for collider_2 in colliders_type_2:
                     collision_rect = self.check_collision(
@@ -213,6 +247,10 @@ class CollisionManager:
                     return (topleft_overlap, botright_overlap)
 
 
+_SIMPLE_MAPS = weakref.WeakKeyDictionary()
+"""Surface -> physical map cache of simple colliders."""
+
+
 class Collider:
     """Collider component class.
 
@@ -245,16 +283,19 @@ class Collider:
     def simple(cls, obj):
         """Make simple collider based on object's image.
 
-        All characters except space considered as solid matter.
+        All characters except space considered as solid matter. Geometry is
+        computed once per image and shared between colliders.
         """
 
-        return cls(
-            obj,
-            [
+        image = obj.image
+        phys_map = _SIMPLE_MAPS.get(image)
+        if phys_map is None:
+            phys_map = _SIMPLE_MAPS[image] = [
                 re.sub(r"[^\ ]", CollisionManager.SOLID_MATTER, row)
-                for row in obj.image.raw.image
-            ],
-        )
+                for row in image.raw.image
+            ]
+
+        return cls(obj, phys_map)
 
     @property
     def phys_map(self):
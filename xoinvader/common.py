@@ -1,13 +1,26 @@
-"""Module for common shared objects."""
+"""Module for common shared objects.
+
+Game configuration is parsed once by :class:`ConfigService` and shared by
+all modules through :func:`get_config`. Reload updates cached sections in
+place, so modules keeping references to sections see new values.
+
+TOML files are parsed through snapshot, see :mod:`xoinvader.snapshot`.
+"""
 
 import json
+import logging
+import os
 import pathlib
+import random
+import threading
 from os.path import dirname
 
 import toml
+from xo1 import Surface
 
 import xoinvader
 from xoinvader import constants
+from xoinvader.snapshot import TomlSnapshot, cache_dir
 from xoinvader.utils import Point, dotdict
 
 
@@ -24,18 +37,255 @@ def get_json_config(path):
     return config
 
 
+def load_toml(path) -> dict:
+    """Return parsed toml file from snapshot, parsing it if it changed.
+
+    Returned data is shared, it must not be changed.
+
+    :raise toml.TomlDecodeError: on invalid file
+    """
+
+    return Snapshot.load(path)
+
+
 def get_toml_config(path: str) -> dotdict:
     """Return Settings object made from toml."""
 
-    with open(path) as fd:
-        config = dotdict(toml.load(fd))
-    return config
+    return dotdict(load_toml(path))
+
+
+def load_surface(path) -> Surface:
+    """Load surface from toml file.
+
+    Same as :meth:`xo1.Surface.from_file`, but file is parsed through
+    snapshot.
+
+    :raise xo1.Surface.Malformed: on invalid surface
+    """
+
+    data = load_toml(path)
+    layers = data.get("layers", {})
+    for layer in ("image", "color", "attr"):
+        if not isinstance(layers.get(layer, []), list):
+            raise Surface.Malformed(path, f"{layer} layer must be list of strings")
+
+    return Surface(
+        layers.get("image", []),
+        layers.get("color", []),
+        layers.get("attr", []),
+        data.get("meta", {}).get("name", "Unnamed"),
+    )
+
+
+LOG = logging.getLogger(__name__)
+
+
+class ConfigError(Exception):
+    """Raises on invalid configuration."""
+
+    def __init__(self, path, reason) -> None:
+        super().__init__(f"Config '{path}' is invalid: {reason}.")
+
+
+CONFIG_SCHEMA = {
+    "level1": str,
+    "scoreboard": str,
+    "loop": {
+        "fixed_step": bool,
+        "step": int,
+        "max_steps": int,
+        "adaptive": bool,
+        "min_fps": (int, float),
+        "max_fps": (int, float),
+    },
+    "ship": dict,
+    "weapon": dict,
+    "charge": dict,
+    "pickup": dict,
+}
+"""Required config keys and their types, nested dict describes section."""
+
+
+def validate_config(config, schema, path, prefix="") -> None:
+    """Check that config has keys of schema with values of right types.
+
+    :param dict config: parsed config
+    :param dict schema: schema, see :data:`CONFIG_SCHEMA`
+    :param path: config path for error messages
+    :param str prefix: dotted name of validated section
+    :raise ConfigError: on missing key or value of wrong type
+    """
+
+    for key, expected in schema.items():
+        name = prefix + key
+        if key not in config:
+            raise ConfigError(path, f"missing '{name}'")
+
+        value = config[key]
+        if isinstance(expected, dict):
+            if not isinstance(value, dict):
+                raise ConfigError(path, f"'{name}' must be section")
+            validate_config(value, expected, path, name + ".")
+        elif not isinstance(value, expected):
+            types = expected if isinstance(expected, tuple) else (expected,)
+            raise ConfigError(
+                path,
+                f"'{name}' must be {' or '.join(type_.__name__ for type_ in types)}",
+            )
+
+
+def _replace(target: dict, source: dict) -> None:
+    """Replace contents of target with source, keeping nested dict objects."""
+
+    for key in target.keys() - source.keys():
+        del target[key]
+
+    for key, value in source.items():
+        current = target.get(key)
+        if isinstance(current, dict) and isinstance(value, dict):
+            _replace(current, value)
+        else:
+            target[key] = value
+
+
+class ConfigService:
+    """Parsed-once game configuration.
+
+    Config is parsed and validated on first access and cached. Cached config
+    must be treated as read-only, copy values before changing them.
+
+    :param path: path to toml config
+    :param dict schema: config schema
+    """
 
+    HOT_RELOAD_INTERVAL = 30
+    """Number of frames between source file checks of hot reload."""
 
-def get_config():
-    """Return xoinvader configuration."""
+    def __init__(self, path, schema=None) -> None:
+        self._path = path
+        self._schema = schema or {}
+        self._config = None
+        self._mtime = None
+        self._lock = threading.Lock()
 
-    return get_toml_config(_CONFIG / "xoinvader.toml")
+    @property
+    def path(self):
+        """Path to config file.
+
+        :getter: yes
+        :setter: no
+        :type: :class:`pathlib.Path`
+        """
+        return self._path
+
+    def _load(self):
+        """Parse and validate config file.
+
+        :return: parsed config and modification time of parsed file
+        :raise ConfigError: on invalid config
+        """
+
+        mtime = os.stat(self._path).st_mtime_ns
+        try:
+            config = get_toml_config(self._path)
+        except toml.TomlDecodeError as exc:
+            raise ConfigError(self._path, exc) from exc
+
+        validate_config(config, self._schema, self._path)
+        return config, mtime
+
+    def get(self) -> dotdict:
+        """Return cached config, parsing it on first call.
+
+        :raise ConfigError: on invalid config
+        """
+
+        config = self._config
+        if config is None:
+            with self._lock:
+                if self._config is None:
+                    self._config, self._mtime = self._load()
+                config = self._config
+
+        return config
+
+    def section(self, name: str) -> dotdict:
+        """Return config section.
+
+        :raise KeyError: if there's no such section
+        """
+
+        return self.get()[name]
+
+    def reload(self) -> dotdict:
+        """Parse config again and update cached config in place.
+
+        Invalid config is not applied, cached one is kept.
+
+        :raise ConfigError: on invalid config
+        """
+
+        with self._lock:
+            config, mtime = self._load()
+            if self._config is None:
+                self._config = config
+            else:
+                _replace(self._config, config)
+            self._mtime = mtime
+
+        LOG.info("Config %s is reloaded", self._path)
+        return self._config
+
+    def _modified(self):
+        """Return modification time of file if it changed since parsing."""
+
+        try:
+            mtime = os.stat(self._path).st_mtime_ns
+        except OSError:
+            return None
+
+        return mtime if self._mtime is not None and mtime != self._mtime else None
+
+    def changed(self) -> bool:
+        """If config file was modified since it was parsed."""
+
+        return self._modified() is not None
+
+    def reload_if_changed(self) -> bool:
+        """Reload config if file was modified.
+
+        Invalid config is logged and skipped until file is modified again.
+
+        :return: if config was reloaded
+        """
+
+        mtime = self._modified()
+        if mtime is None:
+            return False
+
+        try:
+            self.reload()
+        except (ConfigError, OSError) as exc:
+            LOG.error("Config is not reloaded: %s", exc)
+            self._mtime = mtime
+            return False
+
+        return True
+
+    def on_frame(self, app, dt: int) -> None:  # pylint: disable=unused-argument
+        """Frame listener for hot reload, checks file every few frames.
+
+        Reloaded values apply to objects created after reload.
+        """
+
+        if not app.frame_count % self.HOT_RELOAD_INTERVAL:
+            self.reload_if_changed()
+
+
+def get_config() -> dotdict:
+    """Return cached xoinvader configuration."""
+
+    return Config.get()
 
 
 def rootify(root, config):
@@ -71,6 +321,9 @@ def update_resized(new_x: int, new_y: int) -> None:
 
 __all__ = ["Settings"]
 
+RNG = random.Random()
+"""Game random generator, seed it to reproduce game session."""
+
 WIDTH = 130
 HEIGHT = 40
 
@@ -78,6 +331,12 @@ HEIGHT = 40
 _ROOT = pathlib.Path(dirname(xoinvader.__file__))
 _CONFIG = _ROOT / "config"
 
+Snapshot = TomlSnapshot(cache_dir() / "snapshot")  # pylint: disable=invalid-name
+"""Snapshot of parsed toml files, path may be changed before first use."""
+
+Config = ConfigService(_CONFIG / "xoinvader.toml", CONFIG_SCHEMA)  # pylint: disable=invalid-name
+"""Game configuration service."""
+
 DEFAULT_XOI_SETTINGS = {
     "layout": {
         "field": {
@@ -1,55 +1,335 @@
-import uuid
+"""Entity-component-system.
 
+Entity is a plain integer packing index and generation, components are plain
+objects stored per component type in sparse sets: packed arrays of components
+and owning entities, plus sparse lookup table indexed by entity index.
+Systems iterate over packed arrays, so iteration doesn't touch entities
+without required components.
 
-# pylint: disable=all
-class Entity:
-    Catalog = {}
-    __slots__ = ("name", "uid", "components")
+World can hold existing game objects as components, so objects can migrate
+to components and systems incrementally.
+"""
 
-    def __new__(cls, name, uid=None):
-        if name not in cls.Catalog:
-            entity = super().__new(cls)
-            cls.Catalog[name] = entity
+from abc import ABCMeta, abstractmethod
+from array import array
+from collections import deque
+
+
+INDEX_BITS = 24
+"""Number of low entity bits used for index."""
+
+INDEX_MASK = (1 << INDEX_BITS) - 1
+"""Mask to extract index from entity."""
+
+GENERATION_MASK = (1 << 32) - 1
+"""Generation wraps around at this value."""
+
+
+class EntityNotFound(Exception):
+    """Raises on access to destroyed or unknown entity (stale handle)."""
+
+    def __init__(self, entity) -> None:
+        super().__init__(f"{entity_repr(entity)} is not alive.")
+
+
+def make_entity(index: int, generation: int = 0) -> int:
+    """Pack index and generation into entity handle."""
+
+    return generation << INDEX_BITS | index
+
+
+def entity_index(entity: int) -> int:
+    """Return index part of entity handle."""
+
+    return entity & INDEX_MASK
+
+
+def entity_generation(entity: int) -> int:
+    """Return generation part of entity handle."""
+
+    return entity >> INDEX_BITS
+
+
+def entity_repr(entity: int) -> str:
+    """Return human-readable entity representation."""
+
+    return f"<Entity {entity & INDEX_MASK}:{entity >> INDEX_BITS}>"
+
+
+class EntityAllocator:
+    """Allocator of entity handles.
+
+    Entity is a plain integer: index in low `INDEX_BITS` bits and generation
+    in the rest. Generation of index is increased on entity destruction, so
+    handles of destroyed entities don't match their successors. Released
+    indices are reused in FIFO order to delay generation growth.
+    """
+
+    def __init__(self) -> None:
+        self._generations = array("L")
+        self._free = deque()
+
+    def __len__(self) -> int:
+        return len(self._generations) - len(self._free)
+
+    def create(self) -> int:
+        """Allocate new entity."""
+
+        if self._free:
+            index = self._free.popleft()
         else:
-            entity = cls.Catalog[name]
+            index = len(self._generations)
+            if index > INDEX_MASK:
+                raise OverflowError("Too many entities.")
+            self._generations.append(0)
+
+        return self._generations[index] << INDEX_BITS | index
+
+    def alive(self, entity: int) -> bool:
+        """Return if entity handle refers to existing entity."""
+
+        index = entity & INDEX_MASK
+        return (
+            index < len(self._generations)
+            and self._generations[index] == entity >> INDEX_BITS
+        )
+
+    def destroy(self, entity: int) -> None:
+        """Release entity index.
+
+        :raise EntityNotFound: if handle is stale
+        """
+
+        if not self.alive(entity):
+            raise EntityNotFound(entity)
+
+        index = entity & INDEX_MASK
+        self._generations[index] = (self._generations[index] + 1) & GENERATION_MASK
+        self._free.append(index)
+
+
+class ComponentStore:
+    """Sparse set of components of one type.
+
+    `components` and `entities` are packed parallel arrays, `_sparse` maps
+    entity index to position in packed arrays.
+    """
+
+    EMPTY = -1
+    """Marker of absent component in sparse table."""
+
+    def __init__(self) -> None:
+        self._sparse = array("l")
+        self.entities = array("Q")
+        self.components = []
+
+    def __len__(self) -> int:
+        return len(self.components)
+
+    def __contains__(self, entity: int) -> bool:
+        return self._dense_index(entity) != self.EMPTY
+
+    def _dense_index(self, entity: int) -> int:
+        """Return position of entity's component or EMPTY."""
+
+        index = entity & INDEX_MASK
+        if index >= len(self._sparse):
+            return self.EMPTY
+
+        dense = self._sparse[index]
+        if dense != self.EMPTY and self.entities[dense] != entity:
+            return self.EMPTY
+
+        return dense
+
+    def add(self, entity: int, component: object) -> None:
+        """Add or replace entity's component."""
+
+        dense = self._dense_index(entity)
+        if dense != self.EMPTY:
+            self.components[dense] = component
+            return
+
+        index = entity & INDEX_MASK
+        if index >= len(self._sparse):
+            self._sparse.extend([self.EMPTY] * (index + 1 - len(self._sparse)))
+
+        self._sparse[index] = len(self.components)
+        self.entities.append(entity)
+        self.components.append(component)
+
+    def get(self, entity: int) -> object:
+        """Return entity's component.
+
+        :raise KeyError: if entity doesn't have component
+        """
+
+        dense = self._dense_index(entity)
+        if dense == self.EMPTY:
+            raise KeyError(entity_repr(entity))
+
+        return self.components[dense]
+
+    def remove(self, entity: int) -> object | None:
+        """Remove entity's component and return it.
+
+        Last component takes place of removed one to keep arrays packed.
+        """
+
+        dense = self._dense_index(entity)
+        if dense == self.EMPTY:
+            return None
+
+        component = self.components[dense]
+        last_entity = self.entities.pop()
+        last_component = self.components.pop()
+
+        if dense < len(self.components):
+            self.entities[dense] = last_entity
+            self.components[dense] = last_component
+            self._sparse[last_entity & INDEX_MASK] = dense
+
+        self._sparse[entity & INDEX_MASK] = self.EMPTY
+        return component
+
+
+class System(metaclass=ABCMeta):
+    """Base system class.
+
+    System declares component types it's interested in and processes all
+    entities that have them.
+    """
+
+    components = ()
+    """Component types required by system."""
+
+    @abstractmethod
+    def update(self, world, dt: int) -> None:
+        """Process world's entities.
+
+        Default way is to iterate over `world.view(*self.components)`.
+
+        :param world: world to process
+        :param dt: time delta in milliseconds
+        """
+
+        pass  # pragma: no cover
+
+
+class World:
+    """Container of entities, component stores and systems."""
+
+    def __init__(self) -> None:
+        self._entities = EntityAllocator()
+        self._stores = {}
+        self._systems = []
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def create(self, *components: object) -> int:
+        """Create new entity with provided components."""
+
+        entity = self._entities.create()
+        for component in components:
+            self.add(entity, component)
+
         return entity
 
-    def __hash__(self):
-        return hash(self.uid)
+    def alive(self, entity: int) -> bool:
+        """Return if entity handle refers to existing entity."""
+
+        return self._entities.alive(entity)
+
+    def destroy(self, entity: int) -> None:
+        """Remove all entity's components and release its index."""
+
+        if not self._entities.alive(entity):
+            raise EntityNotFound(entity)
+
+        for store in self._stores.values():
+            store.remove(entity)
+
+        self._entities.destroy(entity)
+
+    def store(self, ctype: type) -> ComponentStore:
+        """Return store of components of provided type."""
+
+        store = self._stores.get(ctype)
+        if store is None:
+            store = self._stores[ctype] = ComponentStore()
+        return store
+
+    def add(self, entity: int, component: object, ctype: type | None = None) -> None:
+        """Add component to entity.
+
+        :param entity: entity handle
+        :param component: component object
+        :param ctype: component type to store under, defaults to type of
+        component. Useful to store existing game object as base class
+        component, e.g. ship as `Renderable`.
+        """
+
+        if not self._entities.alive(entity):
+            raise EntityNotFound(entity)
+
+        self.store(ctype or type(component)).add(entity, component)
+
+    def get(self, entity: int, ctype: type) -> object:
+        """Return entity's component of provided type."""
+
+        return self.store(ctype).get(entity)
+
+    def has(self, entity: int, ctype: type) -> bool:
+        """Return if entity has component of provided type."""
+
+        return entity in self.store(ctype)
+
+    def remove(self, entity: int, ctype: type) -> object | None:
+        """Remove entity's component of provided type and return it."""
+
+        return self.store(ctype).remove(entity)
+
+    def view(self, *ctypes: type):
+        """Iterate over entities having all provided component types.
+
+        Iteration is driven by packed arrays of the smallest store.
+        Yields tuples (entity, component1, component2, ...).
+        """
 
-    def __init__(self, name="", uid=None) -> None:
-        self.name = name
-        self.uid = uid or uuid.uuid4()
-        self.components = {}
+        if not ctypes:
+            return
 
-    def __repr__(self) -> str:
-        cname = self.__class__.__name__
-        name = self.name or self.uid
-        if name != self.uid:
-            name = f"{name}:{self.uid}"
-        return f"<{cname} {name}>"
+        stores = [self.store(ctype) for ctype in ctypes]
+        driver = min(stores, key=len)
 
-    def __eq__(self, other):
-        if isinstance(other, self.__class__):
-            return self.uid == other.uid
-        elif isinstance(other, self.uid.__class):
-            return self.uid == other
-        return False
+        if len(stores) == 1:
+            entities, components = driver.entities, driver.components
+            for index, entity in enumerate(entities.tolist()):
+                # Store may be changed by caller while iterating, removed
+                # entities are skipped and moved ones are looked up.
+                if index < len(entities) and entities[index] == entity:
+                    yield entity, components[index]
+                elif entity in driver:
+                    yield entity, driver.get(entity)
+            return
 
-    def __str__(self) -> str:
-        return str(self.components)
+        for entity in driver.entities.tolist():
+            if all(entity in store for store in stores):
+                yield (entity, *(store.get(entity) for store in stores))
 
-    def __getitem__(self, key):
-        return self.components[key]
+    def add_system(self, system: System) -> None:
+        """Add system, systems are updated in order they were added."""
 
-    def __setitem__(self, key, val) -> None:
-        if isinstance(val, Component):
-            self.components[key] = val
+        self._systems.append(system)
 
+    def remove_system(self, system: System) -> None:
+        """Remove system."""
 
-class Component:
-    pass
+        self._systems.remove(system)
 
+    def update(self, dt: int) -> None:
+        """Update all systems."""
 
-class System:
-    pass
+        for system in self._systems:
+            system.update(self, dt)
@@ -6,10 +6,17 @@ Prepare environment for starting game and start it."""
 
 
 import argparse
+import asyncio
+import contextlib
 import logging
 
 import xoinvader
 from xoinvader.app import XOInvader
+from xoinvader.common import _CONFIG, _ROOT, RNG, Config, Snapshot
+from xoinvader.memory import INTERVAL, MemoryTracker
+from xoinvader.profiler import PROFILERS, make_profiler
+from xoinvader.replay import Recorder
+from xoinvader.telemetry import TelemetrySink
 
 
 LOG = logging.getLogger(__name__)
@@ -23,19 +30,191 @@ def parse_args():
         "-d", "--debug", action="store_true", help="enable debug mode"
     )
 
+    parser.add_argument(
+        "--record", metavar="PATH", help="record session replay to file"
+    )
+
+    parser.add_argument(
+        "--asyncio",
+        action="store_true",
+        help="run main loop in asyncio event loop",
+    )
+
+    parser.add_argument(
+        "--telemetry",
+        metavar="PATH",
+        help="write per-frame telemetry to JSON-lines file",
+    )
+
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="cprofile",
+        choices=sorted(PROFILERS),
+        help="profile session, cprofile (default) or sampling",
+    )
+    parser.add_argument(
+        "--profile-out",
+        metavar="PATH",
+        help="profiler output, xoinvader.prof or xoinvader.folded by default",
+    )
+
+    parser.add_argument(
+        "--hot-reload",
+        action="store_true",
+        help="reload game config when its file changes",
+    )
+
+    parser.add_argument(
+        "--build-snapshot",
+        action="store_true",
+        help="parse config and resource files into snapshot and exit",
+    )
+
+    parser.add_argument(
+        "--memory",
+        metavar="PATH",
+        help="trace allocations and write periodic memory reports to file",
+    )
+    parser.add_argument(
+        "--memory-interval",
+        metavar="FRAMES",
+        type=int,
+        default=INTERVAL,
+        help="frames between memory reports (default: %(default)s)",
+    )
+
+    headless = parser.add_argument_group("headless simulation")
+    headless.add_argument(
+        "--headless",
+        action="store_true",
+        help="run without terminal with simulated input and print timings",
+    )
+    headless.add_argument(
+        "--frames", type=int, default=1000, help="number of frames to simulate"
+    )
+    headless.add_argument(
+        "--seed", type=int, default=0, help="random seed for input and game"
+    )
+    headless.add_argument(
+        "--dt", type=int, default=33, help="simulated frame time, milliseconds"
+    )
+    headless.add_argument(
+        "--frame-log",
+        metavar="PATH",
+        help="write per-frame timings to CSV file",
+    )
+    headless.add_argument(
+        "--replay",
+        metavar="PATH",
+        help="play recorded session headless and check it for divergence",
+    )
+
     args = parser.parse_args()
     return args
 
 
+def run(args, listeners=()):
+    """Run game in mode selected by arguments.
+
+    :param listeners: frame listeners to add to application
+    """
+
+    if args.headless or args.replay:
+        from xoinvader import headless
+
+        return headless.main(
+            args.frames,
+            args.seed,
+            args.dt,
+            args.record,
+            args.replay,
+            args.telemetry,
+            listeners,
+            args.frame_log,
+        )
+
+    if args.asyncio:
+        return asyncio.run(run_async(args, listeners))
+
+    with interactive(args, listeners) as game:
+        return game.start()
+
+
+async def run_async(args, listeners=()):
+    """Run game in asyncio event loop."""
+
+    with interactive(args, listeners) as game:
+        await game.run_async()
+
+
+@contextlib.contextmanager
+def interactive(args, listeners=()):
+    """Create interactive game, save its outputs on exit.
+
+    :param listeners: frame listeners to add to application
+    """
+
+    recorder = None
+    if args.record:
+        RNG.seed(args.seed)
+        recorder = Recorder(args.seed)
+
+    game = XOInvader(recorder)
+    for listener in listeners:
+        game.add_frame_listener(listener)
+
+    telemetry = None
+    if args.telemetry:
+        telemetry = TelemetrySink(args.telemetry)
+        game.add_frame_listener(telemetry.on_frame)
+
+    try:
+        yield game
+    finally:
+        if recorder:
+            recorder.save(args.record)
+        if telemetry:
+            telemetry.close()
+
+
+def run_tracked(args):
+    """Run game, tracking memory and reloading config if requested."""
+
+    listeners = [Config.on_frame] if args.hot_reload else []
+    if not args.memory:
+        return run(args, listeners)
+
+    tracker = MemoryTracker(args.memory, args.memory_interval)
+    tracker.start()
+    try:
+        return run(args, listeners + [tracker.on_frame])
+    finally:
+        tracker.stop()
+
+
 def main():
     """Start the game!"""
 
     args = parse_args()
     # apply settings to engine settings
-    xoinvader.init(args.__dict__)
+    xoinvader.init({"debug": args.debug})
     LOG.debug("Incoming args: %s", args)
-    game = XOInvader()
-    return game.start()
+
+    if args.build_snapshot:
+        count = Snapshot.build([_CONFIG, _ROOT / "res"])
+        print(f"Snapshot {Snapshot.path}: {count} files.")
+        return 0
+
+    if not args.profile:
+        return run_tracked(args)
+
+    profiler = make_profiler(args.profile, args.profile_out)
+    profiler.start()
+    try:
+        return run_tracked(args)
+    finally:
+        profiler.stop()
 
 
 if __name__ == "__main__":
@@ -1,6 +1,11 @@
 """Base handler class."""
 
 from abc import ABCMeta, abstractmethod
+from curses import ERR
+
+
+MAX_EVENTS = 64
+"""Max number of input events read per frame."""
 
 
 class Handler(metaclass=ABCMeta):
@@ -42,23 +47,45 @@ class EventHandler(Handler):
     You must instantiate this class only after application being initialized.
     Application instance has event queue object, that will be used here.
 
+    All pending input is read every frame and dispatched as a batch.
+    Consecutive repeats of `coalesce` keys (held key auto-repeat) are
+    coalesced into one event, other keys are delivered on every press.
+
     :param :class:`xoinvader.state.State` owner: handler's owner state
     :param dict command_map: key->command mapping
+    :param set coalesce: keys to coalesce repeats of, none by default
     """
 
-    def __init__(self, owner, command_map=None) -> None:
+    def __init__(self, owner, command_map=None, coalesce=None) -> None:
         super().__init__(owner)
 
         self._command_map = command_map or {}
+        self._coalesce = coalesce or set()
         # TODO: implement proper queue object
         self._event_queue = owner.app.event_queue
 
     # TODO: event-handling: I think we need some global event bus in whole
     #       application.
     def event_queue(self):
-        """Event queue stub."""
+        """Read pending input without blocking and return events batch.
+
+        Reading stops on empty queue or after `MAX_EVENTS` keys, so input
+        burst can't stall the frame.
+        """
+
+        events = []
+        last = ERR
+        for _ in range(MAX_EVENTS):
+            key = self.get_input()
+            if key == ERR:
+                break
+            if key == last and key in self._coalesce:
+                continue
+
+            events.append(("KEY_PRESS", key))
+            last = key
 
-        return [("KEY_PRESS", self.get_input())]
+        return events
 
     # TODO: event-handling: abstract getting input from curses
     def get_input(self):
@@ -0,0 +1,335 @@
+"""Headless game simulation.
+
+Runs the game without terminal: dummy renderer, simulated input and frame
+loop driven by constant time delta instead of wall clock. Useful for
+profiling, soak tests and benchmarks on machines without TTY.
+"""
+
+import csv
+import itertools
+import logging
+import random
+import statistics
+import time
+from collections.abc import Iterable
+
+import eaf
+import eaf.app
+from xo1 import Palette
+
+from xoinvader.app import XOInvader
+from xoinvader.common import RNG
+from xoinvader.keys import KEY
+from xoinvader.replay import ERR, Recorder, Replay, ReplayInput, ReplayVerifier
+from xoinvader.telemetry import TelemetrySink
+from xoinvader.utils import percentile
+
+
+LOG = logging.getLogger(__name__)
+
+
+class HeadlessPalette(Palette):
+    """Palette that doesn't touch curses.
+
+    Color pair attributes are computed as curses does, but without
+    initialized screen.
+    """
+
+    def init_colors(self) -> None:
+        pass
+
+    def __getitem__(self, name):
+        # Base class passes item lookups to __getattr__, int is ready pair.
+        if isinstance(name, int):
+            return name
+        return self.__getattr__(name)
+
+    def __getattr__(self, name):
+        if name == "default":
+            return 0
+
+        try:
+            return self.palette[name].idx << 8
+        except KeyError as exc:
+            raise AttributeError(name) from exc
+
+
+class SimulatedInput:
+    """Event queue that emits pseudo-random key presses.
+
+    Mimics curses window `getch`: returns keys pressed in current frame, then
+    ERR. Frame is advanced by `next_frame`.
+
+    :param int seed: random generator seed
+    """
+
+    MOVEMENT = (KEY.A, KEY.D)
+    WEAPON = (KEY.E, KEY.Q)
+
+    def __init__(self, seed: int = 0) -> None:
+        self._random = random.Random(seed)
+        self._frame = -1
+        self._keys = []
+
+    def next_frame(self) -> None:
+        """Generate key presses for next frame."""
+
+        self._frame += 1
+
+        # Toggle fire at start, occasional presses keep menus going too.
+        if self._frame == 0 or self._random.random() < 0.01:
+            self._keys.append(KEY.SPACE)
+        if self._random.random() < 0.3:
+            self._keys.append(self._random.choice(self.MOVEMENT))
+        if self._random.random() < 0.01:
+            self._keys.append(self._random.choice(self.WEAPON))
+
+    def getch(self) -> int:
+        """Return next key of current frame or ERR."""
+
+        return self._keys.pop(0) if self._keys else ERR
+
+
+class FrameStats:
+    """Collector of per-frame timings in milliseconds."""
+
+    PHASES = ("events", "update", "render")
+
+    def __init__(self) -> None:
+        self.frames = []
+        self.phases = {phase: [] for phase in self.PHASES}
+
+    def add(self, events: float, update: float, render: float) -> None:
+        """Add timings of one frame."""
+
+        self.phases["events"].append(events)
+        self.phases["update"].append(update)
+        self.phases["render"].append(render)
+        self.frames.append(events + update + render)
+
+    @staticmethod
+    def summarize(values: list[float]) -> dict[str, float]:
+        """Return distribution summary of timings."""
+
+        ordered = sorted(values)
+        return {
+            "mean": statistics.fmean(ordered),
+            "p50": percentile(ordered, 0.5),
+            "p95": percentile(ordered, 0.95),
+            "p99": percentile(ordered, 0.99),
+            "max": ordered[-1],
+        }
+
+    def save(self, path: str) -> None:
+        """Write per-frame timings to CSV file.
+
+        Columns are frame number, phase timings and whole frame time.
+        """
+
+        with open(path, "w", newline="", encoding="utf-8") as fd:
+            writer = csv.writer(fd)
+            writer.writerow(("frame", *self.PHASES, "frame_time"))
+            columns = (self.phases[phase] for phase in self.PHASES)
+            for frame, row in enumerate(zip(*columns, self.frames, strict=True), 1):
+                writer.writerow((frame, *(f"{value:.3f}" for value in row)))
+
+    def report(self, systems=None) -> str:
+        """Return human-readable report.
+
+        :param dict systems: scheduler stats to include
+        """
+
+        if not self.frames:
+            return "No frames simulated."
+
+        total = sum(self.frames)
+        lines = [
+            f"Frames: {len(self.frames)}, wall time: {total:.1f} ms, "
+            f"{len(self.frames) * 1000 / total if total else 0:.1f} frames/s",
+            f"{'':<12}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}",
+        ]
+
+        rows = [("frame", self.frames)] + list(self.phases.items())
+        for name, values in rows:
+            summary = self.summarize(values)
+            lines.append(
+                f"{name:<12}" + "".join(f"{value:>9.3f}" for value in summary.values())
+            )
+
+        if systems:
+            lines.append(f"{'system':<12}{'calls':>9}{'mean':>9}")
+            for name, (calls, _, mean) in systems.items():
+                lines.append(f"{name:<12}{calls:>9}{mean:>9.3f}")
+
+        return "\n".join(lines)
+
+
+class HeadlessXOInvader(XOInvader):
+    """XOInvader application without terminal.
+
+    :param int seed: seed for simulated input and game random generator
+    :param source: input source with `next_frame` and `getch` methods,
+    :class:`SimulatedInput` by default
+    :param recorder: optional session recorder
+    """
+
+    palette_class = HeadlessPalette
+
+    def __init__(self, seed: int = 0, source=None, recorder=None) -> None:
+        self._input = source or SimulatedInput(seed)
+        self._running = False
+        RNG.seed(seed)
+
+        super().__init__(recorder)
+        # Simulation starts in game, it waits for level instead of showing
+        # loading screen.
+        self.enter_game()
+
+    def _init_backend(self, palette: Palette) -> None:
+        eaf.app.Application.__init__(self, eaf.Renderer(None), self._input)
+        self._palette = palette
+
+    def _deinit_backend(self) -> None:
+        pass
+
+    @staticmethod
+    def input_fd() -> None:
+        """Simulated input has no descriptor to watch."""
+
+    @staticmethod
+    def resize_to_terminal() -> None:
+        """Keep default field size, it doesn't depend on host."""
+
+    def run(self, frames: int, dt: int | Iterable[int]) -> FrameStats:
+        """Simulate frames with constant or provided time deltas.
+
+        :param frames: number of frames to simulate
+        :param dt: frame time in milliseconds or frame times per frame
+        :return: collected timings
+        """
+
+        stats = FrameStats()
+        dts = itertools.repeat(dt) if isinstance(dt, int) else iter(dt)
+        self._running = True
+
+        while self._running and self._frames < frames:
+            frame_dt = next(dts, None)
+            if frame_dt is None:
+                break
+
+            self._input.next_frame()
+
+            start = time.perf_counter()
+            self.state.events()
+            events = time.perf_counter()
+            self.simulate(frame_dt)
+            update = time.perf_counter()
+            self.state.render()
+            render = time.perf_counter()
+
+            self._frame_time = (render - start) * 1000
+            self.end_frame(frame_dt)
+            stats.add(
+                (events - start) * 1000,
+                (update - events) * 1000,
+                (render - update) * 1000,
+            )
+
+        self._running = False
+        return stats
+
+    def play(self, replay: Replay) -> tuple[FrameStats, ReplayVerifier]:
+        """Play recorded session with recorded frame times.
+
+        Application must be created with :class:`ReplayInput` source and
+        replay's seed.
+
+        :return: collected timings and verifier with divergence info
+        """
+
+        verifier = ReplayVerifier(replay)
+        self.add_frame_listener(verifier.on_frame)
+        try:
+            stats = self.run(len(replay), replay.dts)
+        finally:
+            self.remove_frame_listener(verifier.on_frame)
+
+        return stats, verifier
+
+    def start(self) -> None:
+        raise RuntimeError("Use run() to simulate headless application.")
+
+    def stop(self) -> None:
+        """Stop simulation after current frame."""
+
+        self._running = False
+        if self._stopped is None:
+            self._pc.stop()
+        else:
+            super().stop()
+
+
+def main(
+    frames: int,
+    seed: int,
+    dt: int,
+    record: str | None = None,
+    replay: str | None = None,
+    telemetry: str | None = None,
+    listeners: Iterable = (),
+    frame_log: str | None = None,
+) -> int:
+    """Run headless simulation and print timing stats.
+
+    :param frames: number of frames to simulate
+    :param seed: random seed
+    :param dt: frame time in milliseconds
+    :param record: path to save session replay to
+    :param replay: path to replay to play instead of simulated input
+    :param telemetry: path to write per-frame telemetry to
+    :param listeners: additional frame listeners
+    :param frame_log: path to write per-frame timings CSV to
+    :return: exit code, 1 if replay diverged
+    """
+
+    recorder = Recorder(seed) if record else None
+    status = 0
+
+    if replay:
+        session = Replay.load(replay)
+        game = HeadlessXOInvader(session.seed, ReplayInput(session), recorder)
+        LOG.info("Headless replay of %s: %s frames", replay, len(session))
+    else:
+        game = HeadlessXOInvader(seed, recorder=recorder)
+        LOG.info("Headless run: %s frames, seed %s, dt %s ms", frames, seed, dt)
+
+    for listener in listeners:
+        game.add_frame_listener(listener)
+
+    sink = TelemetrySink(telemetry) if telemetry else None
+    if sink:
+        game.add_frame_listener(sink.on_frame)
+
+    try:
+        if replay:
+            stats, verifier = game.play(session)
+            if verifier.diverged_at is None:
+                print(f"Replay matched: {verifier.checked} digests checked.")
+            else:
+                print(f"Replay diverged at frame {verifier.diverged_at}.")
+                status = 1
+        else:
+            stats = game.run(frames, dt)
+    finally:
+        if sink:
+            sink.close()
+
+    if recorder:
+        recorder.save(record)
+    if frame_log:
+        stats.save(frame_log)
+
+    scheduler = getattr(game.states["InGameState"], "scheduler", None)
+    print(stats.report(scheduler.stats() if scheduler else None))
+
+    return status
@@ -2,18 +2,20 @@
 
 import curses
 import logging
-import weakref
 
 from eaf.state import State
 
+from xoinvader.animation import AnimationSystem
 from xoinvader.background import Background
+from xoinvader.charge import ChargeSystem
 from xoinvader.collision import CollisionManager
-from xoinvader.common import _ROOT, Settings, get_config
+from xoinvader.common import Settings
 from xoinvader.gui import Bar, TextCallbackWidget, TextWidget, WeaponWidget
 from xoinvader.handlers import EventHandler
 from xoinvader.keys import KEY
-from xoinvader.level import Level
-from xoinvader.ship import GenericXEnemy, PlayerShip
+from xoinvader.level import ScriptedLevel
+from xoinvader.scheduler import Phase, Scheduler
+from xoinvader.ship import PlayerShip
 from xoinvader.style import Style
 from xoinvader.utils import Point, dotdict
 
@@ -21,80 +23,6 @@ from xoinvader.utils import Point, dotdict
 LOG = logging.getLogger(__name__)
 
 
-# pylint: disable=invalid-name
-class TestLevel(Level):
-    def __init__(self, state_object_adder, speed) -> None:
-        super().__init__(speed)
-        self._state_add = state_object_adder
-
-        self._player_ship = PlayerShip(Settings.layout.field.player)
-        self._state_add(self._player_ship)
-        self._enemies = weakref.WeakSet()
-
-        self.add_event(1, self.spawn4)
-        self.add_event(100, lambda: None)
-        self.add_event(200, self.del4)
-
-        self.bg = Background(_ROOT / get_config().level1bg, speed=1, loop=True)
-        self.bg.start(filled=True)
-        self._state_add(self.bg)
-
-    @staticmethod
-    def get_keyframes(y_offset, x_start, direction):
-        """Generate keyframe list.
-
-        :param int y_offset: y of top left corner of image
-        :param int x_start: x level of left corner of image
-        :param int direction: direction of moving: -1 is left, 1 is right
-        """
-
-        def new_x(d):
-            return x_start - d * direction
-
-        return [
-            (0, Point(x_start, y_offset)),
-            (4.0, Point(x_start, y_offset + 20)),
-            (7.0, Point(new_x(30), y_offset + 10)),
-        ]
-
-    def spawn4(self) -> None:
-        right_side = Settings.layout.field.edge.x
-
-        e1 = GenericXEnemy(Point(10, 1))
-        e2 = GenericXEnemy(Point(25, 1))
-        e3 = GenericXEnemy(Point(right_side - 10, 1))
-        e4 = GenericXEnemy(Point(right_side - 25, 1))
-
-        e1.add_animation(
-            "", e1, "_pos", self.get_keyframes(1, 10, 1), interp=True
-        )
-        e2.add_animation(
-            "", e2, "_pos", self.get_keyframes(1, 20, 1), interp=True
-        )
-
-        e3.add_animation(
-            "",
-            e3,
-            "_pos",
-            self.get_keyframes(1, right_side - 10, -1),
-            interp=True,
-        )
-        e4.add_animation(
-            "",
-            e4,
-            "_pos",
-            self.get_keyframes(1, right_side - 20, -1),
-            interp=True,
-        )
-
-        self._enemies = weakref.WeakSet([e1, e2, e3, e4])
-        self._state_add(list(self._enemies))
-
-    def del4(self) -> None:
-        for enemy in self._enemies:
-            enemy.destroy()
-
-
 class InGameState(State):
 
     # TODO FIXME: collision manager looks like collision system
@@ -123,8 +51,18 @@ class InGameState(State):
         Prepare GameObjects that require created and registered State object.
         """
 
-        self.level = TestLevel(self.add, speed=1)
-        self.actor = self.level._player_ship
+        self.charges = ChargeSystem()
+        self.animations = AnimationSystem()
+
+        self.actor = PlayerShip(Settings.layout.field.player)
+        self.add(self.actor)
+
+        assets = self.app.preloader.result()
+        self.level = ScriptedLevel(assets.script, self.add)
+        self.bg = Background(speed=assets.script.background_speed, loop=True)
+        self.bg.chunks = assets.chunks
+        self.bg.start(filled=True)
+        self.add(self.bg)
 
         # TODO: [scoring]
         self.score = 0
@@ -137,14 +75,69 @@ class InGameState(State):
                 KEY.E: self.actor.next_weapon,
                 KEY.Q: self.actor.prev_weapon,
                 KEY.R: lambda: self.actor.take_damage(5),
+                KEY.F: self.toggle_profiler,
                 KEY.SPACE: self.actor.toggle_fire,
                 KEY.ESCAPE: self.pause_command,
             },
+            coalesce={KEY.A, KEY.D},
         )
 
         self.add(self._create_gui())
         self.level.start()
 
+        self._profiler_hud = TextCallbackWidget(
+            Point(Settings.layout.field.edge.x - 30, 0),
+            self.app.profiler.summary,
+        )
+
+        self.scheduler = self._create_scheduler()
+        self.scheduler.profiler = self.app.profiler
+
+    def _create_scheduler(self) -> Scheduler:
+        """Create scheduler with game tick systems."""
+
+        scheduler = Scheduler()
+        scheduler.add("input", lambda dt: self._events.handle(), Phase.INPUT)
+        scheduler.add("level", self._update_level, Phase.LEVEL)
+        scheduler.add("animation", self.animations.update, Phase.ANIMATION)
+        scheduler.add("charges", self.charges.update, Phase.MOVEMENT)
+        scheduler.add("background", lambda dt: self.bg.update(dt), Phase.MOVEMENT)
+        scheduler.add("objects", self._update_objects, Phase.MOVEMENT)
+        scheduler.add("collision", lambda dt: self.collision.update(), Phase.COLLISION)
+        scheduler.add("render", self._draw, Phase.RENDER)
+        scheduler.add("present", lambda dt: self._renderer.present(), Phase.RENDER)
+
+        return scheduler
+
+    def _update_objects(self, dt) -> None:
+        """Update state objects, background is updated by its own system."""
+
+        bg = self.bg
+        for obj in self._objects:
+            if obj is not bg:
+                obj.update(dt)
+
+    def _draw(self, dt) -> None:
+        """Draw objects, screen is updated by separate system."""
+
+        self._renderer.clear()
+        self._renderer.render_objects(self._objects)
+
+    def _update_level(self, dt) -> None:
+        """Advance level events, restart level when they're over."""
+
+        self.level.update()
+        if not self.level.running:
+            self.level.start()
+
+    def toggle_profiler(self) -> None:
+        """Toggle frame profiler and its HUD overlay."""
+
+        if self.app.profiler.toggle():
+            self.add(self._profiler_hud)
+        else:
+            self.remove(self._profiler_hud)
+
     def pause_command(self) -> None:
         self.app.state = "PauseMenuState"
 
@@ -224,11 +217,10 @@ class InGameState(State):
         ]
 
     def events(self) -> None:
-        self._events.handle()
+        self.scheduler.run_phase(Phase.INPUT, self.app.clock.delta)
 
     def update(self, dt) -> None:
-        self.collision.update()
-        self.level.update()
-        if not self.level.running:
-            self.level.start()
-        super().update(dt)
+        self.scheduler.run(dt, Phase.LEVEL, Phase.CLEANUP)
+
+    def render(self) -> None:
+        self.scheduler.run_phase(Phase.RENDER, self.app.clock.delta)
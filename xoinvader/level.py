@@ -1,4 +1,52 @@
-"""Module for creating and maintaining xoinvader levels."""
+"""Module for creating and maintaining xoinvader levels.
+
+Levels can be scripted in TOML files. Script is compiled once at load into
+flat sorted timeline of actions with resolved ship classes and absolute
+keyframe paths, so running level does no parsing or lookups.
+"""
+
+import heapq
+import itertools
+import weakref
+from functools import partial
+from operator import itemgetter
+from pathlib import Path
+
+import toml
+
+from xoinvader import ship
+from xoinvader.animation import EASINGS, AnimationClip, bezier_path
+from xoinvader.common import _ROOT, Settings, load_toml
+from xoinvader.utils import Point
+
+
+class LevelEvent:
+    """Scheduled level event.
+
+    Returned by :meth:`Level.add_event`, use it to cancel event or to
+    schedule other events relative to it.
+
+    :param int time: level time of event, or delay after `after` event fires
+    :param function callback: callback to be fired
+    :param int repeat: interval to fire event again after, None - fire once
+    :param LevelEvent after: event to schedule this one relative to
+    """
+
+    def __init__(self, time, callback, repeat=None, after=None) -> None:
+        if repeat is not None and repeat <= 0:
+            raise ValueError("Repeat interval must be positive.")
+
+        self.time = time
+        self.callback = callback
+        self.repeat = repeat
+        self.after = after
+        self.cancelled = False
+
+        self._followers = []
+        self._queued = 0
+
+    def __repr__(self) -> str:
+        return f"<LevelEvent {self.time} {self.callback!r}>"
 
 
 class Level:
@@ -8,10 +56,12 @@ class Level:
     order to add methods for creating concrete animations and events, such as
     spawning actual enemies, bonuses, initiating boss fights and so on.
 
+    Events are kept in priority queue, so adding, cancelling and firing
+    event costs O(log n). Events with the same time fire in order they were
+    scheduled.
+
     :param int speed: relative speed of the wave. Means how fast time advances.
     The faster time advances, the shorter the delays between events triggering.
-    :param dict events: map from relative time in event to event starting
-    function.
     :param bool running: if event sequence currently advances.
     """
 
@@ -19,8 +69,10 @@ class Level:
         self._running = False
         self._counter = 0
         self._speed = speed
-        self._events = {}
-        self._event_timeouts = []
+        self._script = {}
+        self._queue = []
+        self._pending = 0
+        self._order = itertools.count()
 
     @property
     def speed(self):
@@ -47,25 +99,95 @@ class Level:
         """
         return self._running
 
-    def add_event(self, time, callback) -> None:
+    @property
+    def counter(self):
+        """Current level time.
+
+        :getter: yes
+        :setter: no
+        :type: int
+        """
+        return self._counter
+
+    def _schedule(self, time, event) -> None:
+        """Put event into queue."""
+
+        heapq.heappush(self._queue, (time, next(self._order), event))
+        event._queued += 1  # pylint: disable=protected-access
+        self._pending += 1
+
+    def add_event(self, time, callback, repeat=None, after=None) -> LevelEvent:
         """Add event to some point in time.
 
+        Event added to running level is scheduled immediately, event with
+        time already passed fires on next update. All events are kept in
+        level script and scheduled again on :meth:`start`.
+
         :param int time: point in time relative to level start when to run
-        `callback`. Callback is fired when `_counter` exceeds provided value
+        `callback`, or delay after `after` event fires. Callback is fired when
+        `_counter` exceeds provided value
         :param function callback: callback to be fired when wave reaches `time`
+        :param int repeat: interval to fire callback again after, None to fire
+        once
+        :param LevelEvent after: event to schedule this one relative to,
+        scheduled every time `after` fires
+        :return: event handle
         """
-        self._events.setdefault(time, []).append(callback)
+
+        event = LevelEvent(time, callback, repeat, after)
+        self._script[event] = None
+
+        if after is not None:
+            after._followers.append(event)  # pylint: disable=protected-access
+        elif self._running:
+            self._schedule(time, event)
+
+        return event
+
+    def cancel(self, event: LevelEvent) -> None:
+        """Cancel event, including its repeats and relative events.
+
+        Cancelled event is dropped from level script too.
+        """
+
+        if event.cancelled:
+            return
+
+        event.cancelled = True
+        self._script.pop(event, None)
+        # Queue entries are skipped on pop, so cancel doesn't search queue.
+        self._pending -= event._queued  # pylint: disable=protected-access
+        event._queued = 0  # pylint: disable=protected-access
+
+        if event.after is not None:
+            event.after._followers.remove(event)  # pylint: disable=protected-access
+
+        for follower in list(event._followers):  # pylint: disable=protected-access
+            self.cancel(follower)
+
+        if self._running and not self._pending:
+            self._running = False
 
     def start(self) -> None:
         """Start the level.
 
-        Resets the counter, recomputes the list of event timeouts and sets the
+        Resets the counter, schedules events of level script and sets the
         `running` property to `True`.
         """
 
         self._running = True
         self._counter = 0
-        self._event_timeouts = sorted(self._events)
+        self._queue = []
+        self._pending = 0
+
+        for event in self._script:
+            event._queued = 0  # pylint: disable=protected-access
+        for event in self._script:
+            if event.after is None:
+                self._schedule(event.time, event)
+
+        if not self._pending:
+            self._running = False
 
     def update(self) -> None:
         """Update the counter and fire appropriate events.
@@ -83,11 +205,228 @@ class Level:
             return
 
         self._counter += self._speed
-        while self._event_timeouts[0] <= self._counter:
-            current_timeout = self._event_timeouts[0]
-            for callback in self._events[current_timeout]:
-                callback()
-            del self._event_timeouts[0]
-            if not self._event_timeouts:
-                self._running = False
-                break
+        queue = self._queue
+        while queue and queue[0][0] <= self._counter:
+            time, _, event = heapq.heappop(queue)
+            if event.cancelled:
+                continue
+
+            event._queued -= 1  # pylint: disable=protected-access
+            self._pending -= 1
+            event.callback()
+
+            # Callback could cancel event or stop level by cancelling others.
+            if event.cancelled:
+                continue
+
+            if event.repeat is not None:
+                self._schedule(time + event.repeat, event)
+            for follower in event._followers:  # pylint: disable=protected-access
+                self._schedule(time + follower.time, follower)
+
+        if not self._pending:
+            self._running = False
+
+
+class LevelScriptError(Exception):
+    """Raises on invalid level script."""
+
+    def __init__(self, path, reason) -> None:
+        super().__init__(f"Level script '{path}' is invalid: {reason}.")
+
+
+class SpawnAction:
+    """Compiled wave spawn.
+
+    Consecutive ships of the same type are spawned as formation.
+
+    :param str wave: wave name
+    :param list ships: (ship class, (x, y), clip) tuples, clip is shared
+    position animation relative to ship position, or None
+    """
+
+    def __init__(self, wave, ships) -> None:
+        self.wave = wave
+        self.ships = ships
+        self._formations = [
+            (ship_class, [(pos, clip) for _, pos, clip in group])
+            for ship_class, group in itertools.groupby(ships, key=itemgetter(0))
+        ]
+
+    def __call__(self, level) -> None:
+        objects = []
+        for ship_class, members in self._formations:
+            objects += ship.spawn_formation(
+                ship_class,
+                [pos for pos, _ in members],
+                [clip for _, clip in members],
+            )
+
+        level.spawn(self.wave, objects)
+
+
+class ClearAction:
+    """Compiled destruction of wave's remaining ships.
+
+    :param str wave: wave name
+    """
+
+    def __init__(self, wave) -> None:
+        self.wave = wave
+
+    def __call__(self, level) -> None:
+        level.clear(self.wave)
+
+
+class LevelScript:
+    """Compiled level script.
+
+    :param float speed: level speed
+    :param background: path to background file or None
+    :param float background_speed: background speed in lines per second
+    :param list timeline: (time, action) pairs sorted by time, action is
+    callable taking level
+    """
+
+    def __init__(self, speed, background, background_speed, timeline) -> None:
+        self.speed = speed
+        self.background = background
+        self.background_speed = background_speed
+        self.timeline = timeline
+
+    @classmethod
+    def load(cls, path):
+        """Load and compile level script.
+
+        :raise LevelScriptError: on invalid script
+        """
+
+        try:
+            config = load_toml(path)
+        except toml.TomlDecodeError as exc:
+            raise LevelScriptError(path, exc) from exc
+
+        return cls.compile(config, path)
+
+    @staticmethod
+    def _compile_path(spec, mirror, path) -> AnimationClip:
+        """Compile path into clip of position offsets.
+
+        Keyframes of Bezier path are curve control points, curve is sampled
+        between times of first and last keyframes.
+        """
+
+        sign = -1 if mirror else 1
+        keyframes = [
+            (frame["time"], Point(sign * frame["dx"], frame["dy"]))
+            for frame in spec["keyframes"]
+        ]
+        if spec.get("bezier", False):
+            keyframes = bezier_path(
+                [point for _, point in keyframes], keyframes[0][0], keyframes[-1][0]
+            )
+
+        easing = spec.get("easing", "linear")
+        if easing not in EASINGS:
+            raise LevelScriptError(path, f"unknown easing '{easing}'")
+
+        return AnimationClip(keyframes, interp=spec.get("interp", False), easing=easing)
+
+    @classmethod
+    def compile(cls, config, path="<script>"):
+        """Compile parsed level script.
+
+        Negative x positions are resolved against current field edge, so
+        script must be compiled after terminal size is known.
+
+        :param dict config: parsed script
+        :param path: script path for error messages
+        :raise LevelScriptError: on invalid script
+        """
+
+        right = Settings.layout.field.edge.x
+        paths = config.get("paths", {})
+        clips = {}
+        timeline = []
+
+        for index, wave in enumerate(config.get("waves", [])):
+            name = wave.get("name", f"wave{index}")
+            if "time" not in wave:
+                raise LevelScriptError(path, f"wave '{name}' has no time")
+
+            ships = []
+            for entry in wave.get("ships", []):
+                ship_class = getattr(ship, entry.get("type", ""), None)
+                if not (isinstance(ship_class, type) and issubclass(ship_class, ship.Ship)):
+                    raise LevelScriptError(
+                        path, f"unknown ship type '{entry.get('type')}' in wave '{name}'"
+                    )
+
+                x, y = entry["pos"]
+                if x < 0:
+                    x += right
+
+                clip = None
+                if "path" in entry:
+                    key = (entry["path"], entry.get("mirror", False))
+                    if key[0] not in paths:
+                        raise LevelScriptError(path, f"unknown path '{key[0]}'")
+                    if key not in clips:
+                        clips[key] = cls._compile_path(paths[key[0]], key[1], path)
+                    clip = clips[key]
+
+                ships.append((ship_class, (x, y), clip))
+
+            timeline.append((wave["time"], SpawnAction(name, ships)))
+            if "lifetime" in wave:
+                timeline.append((wave["time"] + wave["lifetime"], ClearAction(name)))
+
+        # Stable sort keeps script order of simultaneous actions.
+        timeline.sort(key=lambda item: item[0])
+
+        background = config.get("background")
+        return cls(
+            config.get("speed", 1),
+            _ROOT / background if background else None,
+            config.get("background_speed", 0),
+            timeline,
+        )
+
+
+class ScriptedLevel(Level):
+    """Level running compiled script.
+
+    :param LevelScript script: compiled script
+    :param function spawn: callable to add list of objects to state
+    """
+
+    def __init__(self, script: LevelScript, spawn) -> None:
+        super().__init__(script.speed)
+
+        self.script = script
+        self._spawn = spawn
+        self._waves = {}
+
+        for time, action in script.timeline:
+            self.add_event(time, partial(action, self))
+
+    @classmethod
+    def from_file(cls, path: Path, spawn):
+        """Load script and create level."""
+
+        return cls(LevelScript.load(path), spawn)
+
+    def spawn(self, wave, objects) -> None:
+        """Add wave's objects to state."""
+
+        self._spawn(objects)
+        # Weak references in list keep objects order reproducible.
+        self._waves[wave] = [weakref.ref(obj) for obj in objects]
+
+    def clear(self, wave) -> None:
+        """Destroy wave's remaining objects."""
+
+        for ref in self._waves.pop(wave, ()):
+            obj = ref()
+            if obj is not None:
+                obj.destroy()
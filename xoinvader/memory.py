@@ -0,0 +1,148 @@
+"""Memory profiling.
+
+Memory tracker is a frame listener that periodically takes tracemalloc
+snapshots and writes report: top allocation sites by growth since previous
+snapshot, live instance counts per renderable class and per collider type.
+Comparing counts of alive colliders with registered ones shows colliders
+kept alive after removal from collision manager.
+"""
+
+import gc
+import logging
+import tracemalloc
+from collections import Counter
+
+from eaf.render import Renderable
+
+from xoinvader.collision import Collider
+
+
+LOG = logging.getLogger(__name__)
+
+INTERVAL = 300
+"""Number of frames between snapshots."""
+
+TOP_SITES = 10
+"""Number of allocation sites in report."""
+
+TRACEBACK_DEPTH = 1
+"""Number of frames stored per allocation."""
+
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def count_instances() -> tuple[Counter, Counter]:
+    """Count live renderables and colliders.
+
+    Walks all objects tracked by garbage collector, so it's slow.
+
+    :return: renderable counts by class name and collider counts by type
+    """
+
+    renderables = Counter()
+    colliders = Counter()
+
+    # MRO lookup instead of isinstance: ABC checks would fill subclass
+    # caches and show up in the next snapshot.
+    for obj in gc.get_objects():
+        mro = type(obj).__mro__
+        if Renderable in mro:
+            renderables[type(obj).__name__] += 1
+        elif Collider in mro:
+            colliders[obj.col_type] += 1
+
+    return renderables, colliders
+
+
+class MemoryTracker:
+    """Periodic memory reporter.
+
+    :param str path: file to write reports to
+    :param int interval: number of frames between snapshots
+    :param int top: number of allocation sites in report
+    """
+
+    def __init__(self, path: str, interval: int = INTERVAL, top: int = TOP_SITES) -> None:
+        if interval <= 0:
+            raise ValueError("Snapshot interval must be positive.")
+
+        self._path = path
+        self._interval = interval
+        self._top = top
+        self._snapshot = None
+        self._fd = None
+
+    def start(self) -> None:
+        """Start tracing allocations and take initial snapshot."""
+
+        tracemalloc.start(TRACEBACK_DEPTH)
+        self._fd = open(self._path, "w", encoding="utf-8")
+        self._snapshot = self._take_snapshot()
+
+    def stop(self) -> None:
+        """Stop tracing allocations and close report file."""
+
+        if self._fd is None:
+            return
+
+        tracemalloc.stop()
+        self._fd.close()
+        self._fd = None
+        LOG.info("Memory report is saved to %s", self._path)
+
+    @staticmethod
+    def _take_snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(_FILTERS)
+
+    def on_frame(self, app, dt: int) -> None:  # pylint: disable=unused-argument
+        """Frame listener, writes report every `interval` frames."""
+
+        if self._fd is None or app.frame_count % self._interval:
+            return
+
+        self._fd.write(self.report(app))
+        self._fd.flush()
+
+    def report(self, app) -> str:
+        """Take snapshot and return report."""
+
+        snapshot = self._take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [
+            f"== Frame {app.frame_count}: traced {current / 1024:.1f} KiB, "
+            f"peak {peak / 1024:.1f} KiB",
+            "Top allocation sites by growth:",
+        ]
+
+        stats = snapshot.compare_to(self._snapshot, "lineno")
+        for stat in stats[: self._top]:
+            frame = stat.traceback[0]
+            lines.append(
+                f"  {frame.filename}:{frame.lineno}: "
+                f"{stat.size_diff / 1024:+.1f} KiB ({stat.count_diff:+} blocks), "
+                f"{stat.size / 1024:.1f} KiB total"
+            )
+        self._snapshot = snapshot
+
+        renderables, colliders = count_instances()
+        lines.append("Live renderables:")
+        lines.extend(f"  {name}: {count}" for name, count in renderables.most_common())
+
+        registered = Counter()
+        collision = getattr(app.state, "collision", None)
+        if collision is not None:
+            # pylint: disable=protected-access
+            registered.update(collider.col_type for collider in collision._colliders)
+
+        lines.append("Colliders (alive/registered):")
+        lines.extend(
+            f"  {name}: {colliders[name]}/{registered[name]}"
+            for name in sorted(colliders.keys() | registered.keys())
+        )
+
+        return "\n".join(lines) + "\n\n"
@@ -14,6 +14,26 @@ from xoinvader.keys import KEY
 from xoinvader.utils import Point
 
 
+class LoadingState(State):
+    """Loading screen shown while level is preloaded on first start."""
+
+    def __init__(self, app) -> None:
+        super().__init__(app)
+
+        self.add(TextCallbackWidget(Point(4, 4), self.loading_callback))
+
+    def loading_callback(self):
+        """Callback for TextCallbackWidget.
+
+        :return str: loading progress string
+        """
+
+        return f"Loading... {self.app.preloader.progress:.0%}"
+
+    def events(self) -> None:
+        """Input stays queued until game starts."""
+
+
 class PauseMenuState(State):
     def __init__(self, app) -> None:
         super().__init__(app)
@@ -70,6 +90,8 @@ class GameOverState(State):
             TextWidget(Point(4, 4), "I was too tired and scared to continue...")
         )
         self.add(TextCallbackWidget(Point(4, 5), self.score_callback))
+        self._preloader = None
+        self.add(TextCallbackWidget(Point(4, 7), self.loading_callback))
 
         self._items = MenuItemContainer(
             [
@@ -107,6 +129,18 @@ class GameOverState(State):
         """
 
         self._score = self._score.format(score)
+        # Next level is loaded while player looks at the menu.
+        self._preloader = self.app.preload_level()
+
+    def loading_callback(self):
+        """Callback for TextCallbackWidget.
+
+        :return str: loading progress string
+        """
+
+        if self._preloader is None or self._preloader.done:
+            return ""
+        return f"Loading... {self._preloader.progress:.0%}"
 
     def events(self) -> None:
         self._events.handle()
@@ -1,14 +1,13 @@
 """Game pickup objects."""
 
 import logging
-import random
 from typing import NoReturn
 
-from xo1 import Renderable, Surface
+from xo1 import Renderable
 
 from xoinvader import app, collision
 from xoinvader.collision import Collider
-from xoinvader.common import _ROOT, Settings, get_config
+from xoinvader.common import _ROOT, RNG, Settings, get_config, load_surface
 
 
 CONFIG = get_config().pickup
@@ -22,7 +21,7 @@ class Pickup(Renderable):
     def __init__(self, pos, image, dy=0, instant=True, use_amount=1, **kwargs) -> None:
         super().__init__(pos)
 
-        self._image = Surface.from_file(_ROOT / image)
+        self._image = load_surface(_ROOT / image)
         self._dy = dy
         self._instant = instant
         self._use_amount = use_amount
@@ -38,7 +37,7 @@ class Pickup(Renderable):
         droptable = CONFIG.get("droptable", {})
         table = droptable.get(obj.type)["one_of"]
         total_weight = sum(it["weight"] for it in table)
-        value = random.randint(0, total_weight)
+        value = RNG.randint(0, total_weight)
         for entry in table:
             if value < entry["weight"]:
                 return eval(entry["item"])
@@ -49,9 +48,8 @@ class Pickup(Renderable):
     def get_config(cls) -> dict:
         """Return object"s configuration merged with defaults."""
 
-        override = CONFIG[cls.__name__]
-        config = CONFIG.pop("defaults", {})
-        config.update(override)
+        config = dict(CONFIG.get("defaults", {}))
+        config.update(CONFIG[cls.__name__])
         return config
 
     @property
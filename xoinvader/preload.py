@@ -0,0 +1,155 @@
+"""Level assets preloading.
+
+Preloader resolves everything level references on worker thread: game
+config, compiled level script, background chunks and ship sprites. Level
+started after preloading finished doesn't touch disk, so preloading is
+started while menu is shown, and game start or restart has no hitch.
+
+Files parsed during preloading are saved to snapshot, so next start takes
+them from snapshot instead of parsing.
+
+Progress callback is called from worker thread, it must only store values
+for loading indicator to show on next frame.
+"""
+
+import logging
+import threading
+
+from xoinvader import ship
+from xoinvader.background import load_chunks
+from xoinvader.common import _ROOT, Settings, Snapshot, get_config
+from xoinvader.level import LevelScript, SpawnAction
+
+
+LOG = logging.getLogger(__name__)
+
+
+class LevelAssets:
+    """Resolved level assets.
+
+    :param config: game config
+    :param LevelScript script: compiled level script
+    :param list chunks: background chunks, empty if level has no background
+    """
+
+    def __init__(self, config, script: LevelScript, chunks: list) -> None:
+        self.config = config
+        self.script = script
+        self.chunks = chunks
+
+
+def ship_classes(script: LevelScript) -> list[type]:
+    """Return ship classes spawned by level script, player's ship first."""
+
+    classes = {ship.PlayerShip: None}
+    for _, action in script.timeline:
+        if isinstance(action, SpawnAction):
+            classes.update(dict.fromkeys(entry[0] for entry in action.ships))
+
+    return list(classes)
+
+
+def load_level_assets(progress=None) -> LevelAssets:
+    """Load assets of the level.
+
+    :param function progress: callback taking number of done and total steps
+    :return: resolved assets
+    """
+
+    def step(done, total) -> None:
+        if progress is not None:
+            progress(done, total)
+
+    config = get_config()
+    step(1, 3)
+
+    script = LevelScript.load(_ROOT / config.level1)
+    classes = ship_classes(script)
+    total = 3 + len(classes)
+    step(2, total)
+
+    chunks = []
+    if script.background:
+        chunks = load_chunks(script.background, Settings.layout.field.edge.x)
+    step(3, total)
+
+    for done, ship_class in enumerate(classes, 4):
+        ship.load_image(_ROOT / ship.CONFIG[ship_class.__name__]["image"])
+        step(done, total)
+
+    Snapshot.save()
+    return LevelAssets(config, script, chunks)
+
+
+class Preloader:
+    """Level assets loader running on worker thread.
+
+    :param function progress: callback taking number of done and total steps
+    """
+
+    def __init__(self, progress=None) -> None:
+        self._progress = progress
+        self._done = 0
+        self._total = 0
+        self._assets = None
+        self._error = None
+        self._thread = threading.Thread(
+            target=self._load, name="preloader", daemon=True
+        )
+
+    def _load(self) -> None:
+        """Worker thread body."""
+
+        try:
+            self._assets = load_level_assets(self._on_progress)
+        except Exception as exc:  # pylint: disable=broad-except
+            self._error = exc
+
+    def _on_progress(self, done, total) -> None:
+        self._done = done
+        self._total = total
+        if self._progress is not None:
+            self._progress(done, total)
+
+    @property
+    def progress(self):
+        """Fraction of loading steps done.
+
+        :getter: yes
+        :setter: no
+        :type: float
+        """
+        return self._done / self._total if self._total else 0.0
+
+    @property
+    def done(self):
+        """If loading finished.
+
+        :getter: yes
+        :setter: no
+        :type: bool
+        """
+        return self._thread.ident is not None and not self._thread.is_alive()
+
+    def start(self) -> "Preloader":
+        """Start loading."""
+
+        self._thread.start()
+        return self
+
+    def result(self) -> LevelAssets:
+        """Wait for loading to finish and return assets.
+
+        :raise Exception: error raised while loading
+        """
+
+        if self._thread.ident is None:
+            self.start()
+
+        if self._thread.is_alive():
+            LOG.debug("Waiting for level assets")
+        self._thread.join()
+
+        if self._error is not None:
+            raise self._error
+        return self._assets
@@ -0,0 +1,234 @@
+"""Frame and session profilers.
+
+Frame profiler collects wall time of frame phases and scheduled systems into
+rolling windows of last frames. It's disabled by default, disabled profiler
+is only checked for `enabled` flag by the game loop and the scheduler.
+
+Session profilers wrap whole game run and write results on stop:
+deterministic cProfile stats or collapsed stacks of signal-based sampler.
+"""
+
+import cProfile
+import os
+import signal
+from array import array
+from collections import Counter
+
+from xoinvader.utils import percentile
+
+
+WINDOW_SIZE = 256
+"""Number of last samples kept per timing."""
+
+SAMPLING_INTERVAL = 0.005
+"""Interval between stack samples in seconds of CPU time."""
+
+
+class RollingWindow:
+    """Fixed-size ring buffer of timings in milliseconds.
+
+    :param int size: max number of samples kept
+    """
+
+    def __init__(self, size: int = WINDOW_SIZE) -> None:
+        if size <= 0:
+            raise ValueError("Window size must be positive.")
+
+        self._size = size
+        self._values = array("d")
+        self._next = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def add(self, value: float) -> None:
+        """Add sample, replacing the oldest one if window is full."""
+
+        if len(self._values) < self._size:
+            self._values.append(value)
+            return
+
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self._size
+
+    def clear(self) -> None:
+        """Drop all samples."""
+
+        self._values = array("d")
+        self._next = 0
+
+    def percentile(self, fraction: float) -> float:
+        """Return percentile of samples.
+
+        :param fraction: percentile as fraction, e.g. 0.99
+        """
+
+        return percentile(sorted(self._values), fraction)
+
+    def mean(self) -> float:
+        """Return mean of samples."""
+
+        return sum(self._values) / len(self._values) if self._values else 0.0
+
+
+class FrameProfiler:
+    """Per-phase frame timings collector.
+
+    :param int size: number of last frames to keep
+    """
+
+    def __init__(self, size: int = WINDOW_SIZE) -> None:
+        self.enabled = False
+        self._size = size
+        self.frames = RollingWindow(size)
+        self.windows = {}
+
+    def toggle(self) -> bool:
+        """Enable or disable profiling, samples are dropped on enabling.
+
+        :return: new state
+        """
+
+        self.enabled = not self.enabled
+        if self.enabled:
+            self.frames.clear()
+            self.windows.clear()
+
+        return self.enabled
+
+    def record(self, name: str, value: float) -> None:
+        """Add timing of phase or system.
+
+        :param name: phase or system name
+        :param value: wall time in milliseconds
+        """
+
+        window = self.windows.get(name)
+        if window is None:
+            window = self.windows[name] = RollingWindow(self._size)
+        window.add(value)
+
+    def end_frame(self, value: float) -> None:
+        """Add wall time of whole frame in milliseconds."""
+
+        self.frames.add(value)
+
+    def report(self) -> dict[str, tuple[float, float]]:
+        """Return timings summary.
+
+        :return: mapping name -> (p50, p99) in milliseconds, whole frame
+        timings go under "frame" name
+        """
+
+        windows = {"frame": self.frames, **self.windows}
+        return {
+            name: (window.percentile(0.5), window.percentile(0.99))
+            for name, window in windows.items()
+            if window
+        }
+
+    def summary(self) -> str:
+        """Return one-line frame time summary for HUD."""
+
+        if not self.frames:
+            return "Frame p50 -- p99 -- ms"
+
+        return (
+            f"Frame p50 {self.frames.percentile(0.5):.1f} "
+            f"p99 {self.frames.percentile(0.99):.1f} ms"
+        )
+
+
+class CProfileSession:
+    """Deterministic profiler, writes pstats file.
+
+    :param str path: file to write stats to
+    """
+
+    suffix = ".prof"
+    """Default output file suffix."""
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._profile = cProfile.Profile()
+
+    def start(self) -> None:
+        """Start profiling."""
+
+        self._profile.enable()
+
+    def stop(self) -> None:
+        """Stop profiling and write stats."""
+
+        self._profile.disable()
+        self._profile.dump_stats(self._path)
+
+
+class SamplingProfiler:
+    """Statistical profiler driven by SIGPROF.
+
+    Interval timer counts CPU time of the process, on every signal stack of
+    interrupted frame is counted. Profiled code isn't instrumented, so
+    overhead is limited to sampling itself. Results are written in collapsed
+    stacks format understood by flame graph tools: semicolon-separated frames
+    from outermost, space and number of samples.
+
+    :param str path: file to write collapsed stacks to
+    :param float interval: sampling interval in seconds
+    """
+
+    suffix = ".folded"
+    """Default output file suffix."""
+
+    def __init__(self, path: str, interval: float = SAMPLING_INTERVAL) -> None:
+        if not hasattr(signal, "setitimer"):
+            raise RuntimeError("Sampling profiler requires POSIX interval timers.")
+
+        self._path = path
+        self._interval = interval
+        self._previous = None
+        self.stacks = Counter()
+
+    def _sample(self, signum, frame) -> None:  # pylint: disable=unused-argument
+        """Signal handler, counts current stack."""
+
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(
+                f"{code.co_name}@{os.path.basename(code.co_filename)}:{code.co_firstlineno}"
+            )
+            frame = frame.f_back
+
+        self.stacks[";".join(reversed(names))] += 1
+
+    def start(self) -> None:
+        """Install signal handler and start interval timer."""
+
+        self._previous = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self._interval, self._interval)
+
+    def stop(self) -> None:
+        """Stop timer, restore signal handler and write samples."""
+
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, self._previous or signal.SIG_DFL)
+
+        with open(self._path, "w", encoding="utf-8") as fd:
+            for stack, count in self.stacks.most_common():
+                fd.write(f"{stack} {count}\n")
+
+
+PROFILERS = {"cprofile": CProfileSession, "sampling": SamplingProfiler}
+"""Session profilers by name."""
+
+
+def make_profiler(kind: str, path: str | None = None):
+    """Create session profiler.
+
+    :param kind: profiler name from `PROFILERS`
+    :param path: output file, "xoinvader" with profiler's suffix by default
+    """
+
+    profiler_class = PROFILERS[kind]
+    return profiler_class(path or "xoinvader" + profiler_class.suffix)
@@ -0,0 +1,293 @@
+"""Deterministic input recording and replay.
+
+Replay stores everything needed to reproduce game session frame-exact: seed
+of game random generator, frame times, key presses and periodic digests of
+game state used to detect simulation divergence on replay.
+
+File layout, all values are little-endian:
+
+* header: magic ``XOIR``, version u16, seed i64, number of frames u32,
+  number of key events u32, number of digests u32
+* frame times in milliseconds: u16 per frame
+* key events: frame numbers u32, then keys i32
+* digests: frame numbers u32, then CRC32 values u32
+"""
+
+import logging
+import struct
+import sys
+import zlib
+from array import array
+
+
+LOG = logging.getLogger(__name__)
+
+ERR = -1
+"""Value returned by input when there is no key pressed, as in curses."""
+
+DIGEST_INTERVAL = 10
+"""Number of frames between state digests."""
+
+
+class ReplayFormatError(Exception):
+    """Raises on reading malformed replay file."""
+
+    def __init__(self, path, reason) -> None:
+        super().__init__(f"Replay '{path}' malformed: {reason}.")
+
+
+def state_digest(state) -> int:
+    """Return CRC32 of state's simulation-relevant data.
+
+    Includes state type, score and types and positions of all objects.
+    """
+
+    crc = zlib.crc32(type(state).__name__.encode())
+    crc = zlib.crc32(repr(getattr(state, "score", None)).encode(), crc)
+    for obj in state._objects:  # pylint: disable=protected-access
+        pos = obj.pos
+        crc = zlib.crc32(f"{obj.type}:{pos.x!r}:{pos.y!r}".encode(), crc)
+    return crc
+
+
+def _to_le(values: array) -> bytes:
+    """Return little-endian bytes of array."""
+
+    if sys.byteorder == "little":
+        return values.tobytes()
+
+    values = array(values.typecode, values)  # pragma: no cover
+    values.byteswap()  # pragma: no cover
+    return values.tobytes()  # pragma: no cover
+
+
+def _from_le(typecode: str, data: bytes) -> array:
+    """Return array from little-endian bytes."""
+
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder != "little":
+        values.byteswap()  # pragma: no cover
+    return values
+
+
+class Replay:
+    """Recorded game session.
+
+    :param int seed: game random generator seed
+    """
+
+    MAGIC = b"XOIR"
+    VERSION = 1
+    HEADER = struct.Struct("<4sHqIII")
+
+    def __init__(self, seed: int = 0) -> None:
+        self.seed = seed
+        self.dts = array("H")
+        self.event_frames = array("I")
+        self.event_keys = array("i")
+        self.digest_frames = array("I")
+        self.digests = array("I")
+
+    def __len__(self) -> int:
+        return len(self.dts)
+
+    def add_event(self, frame: int, key: int) -> None:
+        """Add key press event."""
+
+        self.event_frames.append(frame)
+        self.event_keys.append(key)
+
+    def add_digest(self, frame: int, digest: int) -> None:
+        """Add state digest taken after frame."""
+
+        self.digest_frames.append(frame)
+        self.digests.append(digest)
+
+    def expected_digests(self) -> dict[int, int]:
+        """Return mapping frame -> digest.
+
+        :raise ValueError: if digest frames and digests are out of sync
+        """
+
+        return dict(zip(self.digest_frames, self.digests, strict=True))
+
+    def save(self, path: str) -> None:
+        """Save replay to file."""
+
+        with open(path, "wb") as fd:
+            fd.write(
+                self.HEADER.pack(
+                    self.MAGIC,
+                    self.VERSION,
+                    self.seed,
+                    len(self.dts),
+                    len(self.event_keys),
+                    len(self.digests),
+                )
+            )
+            for values in (
+                self.dts,
+                self.event_frames,
+                self.event_keys,
+                self.digest_frames,
+                self.digests,
+            ):
+                fd.write(_to_le(values))
+
+    @classmethod
+    def load(cls, path: str):
+        """Load replay from file.
+
+        :raise ReplayFormatError: on malformed file
+        """
+
+        with open(path, "rb") as fd:
+            data = fd.read()
+
+        if len(data) < cls.HEADER.size:
+            raise ReplayFormatError(path, "header is truncated")
+
+        magic, version, seed, frames, events, digests = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC:
+            raise ReplayFormatError(path, "bad magic")
+        if version != cls.VERSION:
+            raise ReplayFormatError(path, f"unsupported version {version}")
+
+        replay = cls(seed)
+        offset = cls.HEADER.size
+        for name, typecode, count in (
+            ("dts", "H", frames),
+            ("event_frames", "I", events),
+            ("event_keys", "i", events),
+            ("digest_frames", "I", digests),
+            ("digests", "I", digests),
+        ):
+            size = array(typecode).itemsize * count
+            if offset + size > len(data):
+                raise ReplayFormatError(path, "data is truncated")
+            setattr(replay, name, _from_le(typecode, data[offset : offset + size]))
+            offset += size
+
+        if offset != len(data):
+            raise ReplayFormatError(path, "unexpected data after digests")
+
+        return replay
+
+
+class RecordingInput:
+    """Event queue wrapper that records pressed keys.
+
+    :param queue: wrapped event queue with `getch` method
+    :param recorder: recorder to pass keys to
+    """
+
+    def __init__(self, queue, recorder) -> None:
+        self._queue = queue
+        self._recorder = recorder
+
+    def getch(self) -> int:
+        """Return key from wrapped queue and record it."""
+
+        key = self._queue.getch()
+        if key != ERR:
+            self._recorder.record_key(key)
+        return key
+
+
+class Recorder:
+    """Game session recorder.
+
+    Pass it to application to wrap its event queue and get frame
+    notifications.
+
+    :param int seed: game random generator seed used for session
+    :param int digest_interval: number of frames between state digests
+    """
+
+    def __init__(self, seed: int, digest_interval: int = DIGEST_INTERVAL) -> None:
+        self.replay = Replay(seed)
+        self._digest_interval = digest_interval
+        self._frame = 0
+
+    def wrap(self, queue) -> RecordingInput:
+        """Return recording wrapper for application event queue."""
+
+        return RecordingInput(queue, self)
+
+    def record_key(self, key: int) -> None:
+        """Record key pressed in current frame."""
+
+        self.replay.add_event(self._frame, key)
+
+    def on_frame(self, app, dt: int) -> None:
+        """Frame listener, records frame time and state digest."""
+
+        self.replay.dts.append(min(int(dt), 0xFFFF))
+        self._frame += 1
+
+        if self._frame % self._digest_interval == 0:
+            self.replay.add_digest(self._frame, state_digest(app.state))
+
+    def save(self, path: str) -> None:
+        """Save recorded session."""
+
+        LOG.info("Saving replay of %s frames to %s", len(self.replay), path)
+        self.replay.save(path)
+
+
+class ReplayInput:
+    """Event queue that feeds recorded key presses frame-exact.
+
+    Mimics curses window `getch`: returns keys recorded for current frame,
+    then ERR. Frame is advanced by `next_frame`.
+
+    :param replay: replay to feed
+    """
+
+    def __init__(self, replay: Replay) -> None:
+        self._frames = replay.event_frames
+        self._keys = replay.event_keys
+        self._frame = -1
+        self._next = 0
+
+    def next_frame(self) -> None:
+        """Switch to next frame, drop unread keys of previous one."""
+
+        self._frame += 1
+        while self._next < len(self._frames) and self._frames[self._next] < self._frame:
+            self._next += 1
+
+    def getch(self) -> int:
+        """Return next key recorded for current frame or ERR."""
+
+        if self._next < len(self._frames) and self._frames[self._next] == self._frame:
+            key = self._keys[self._next]
+            self._next += 1
+            return key
+
+        return ERR
+
+
+class ReplayVerifier:
+    """Frame listener that compares state digests with recorded ones.
+
+    :param replay: replay being played
+    """
+
+    def __init__(self, replay: Replay) -> None:
+        self._expected = replay.expected_digests()
+        self.checked = 0
+        self.diverged_at = None
+
+    def on_frame(self, app, dt: int) -> None:
+        """Check state digest if it was recorded for finished frame."""
+
+        expected = self._expected.get(app.frame_count)
+        if expected is None or self.diverged_at is not None:
+            return
+
+        self.checked += 1
+        if state_digest(app.state) != expected:
+            self.diverged_at = app.frame_count
+            LOG.warning("Replay diverged at frame %s", app.frame_count)
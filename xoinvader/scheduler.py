@@ -0,0 +1,213 @@
+"""System scheduler for the game tick.
+
+Tick is split into ordered phases, each phase runs its systems in order they
+were added. System is any callable that takes time delta in milliseconds.
+Systems can be disabled or throttled to run with lower frequency than the
+tick, throttled system receives time accumulated since its previous run.
+Scheduler measures wall time spent in each system and passes it to frame
+profiler when one is attached and enabled.
+"""
+
+import enum
+import time
+from collections.abc import Callable
+
+
+class Phase(enum.IntEnum):
+    """Game tick phases in order of execution."""
+
+    INPUT = 0
+    LEVEL = 1
+    ANIMATION = 2
+    MOVEMENT = 3
+    COLLISION = 4
+    CLEANUP = 5
+    RENDER = 6
+
+
+class SystemAlreadyScheduled(Exception):
+    """Raises on try to schedule system with already used name."""
+
+    def __init__(self, name) -> None:
+        super().__init__(f"System '{name}' is already scheduled.")
+
+
+# pylint: disable=too-many-instance-attributes
+class ScheduledSystem:
+    """Scheduled system with timing statistics.
+
+    :param str name: unique system name
+    :param callable func: system callable, takes time delta in milliseconds
+    :param Phase phase: phase to run system in
+    :param float rate: max frequency of system runs in Hz, None - every tick
+    """
+
+    def __init__(
+        self, name: str, func: Callable, phase: Phase, rate: float | None = None
+    ) -> None:
+        self.name = name
+        self.func = func
+        self.phase = phase
+        self.enabled = True
+
+        self._period = 0.0
+        self._pending = 0
+        self.rate = rate
+
+        self.calls = 0
+        self.last_time = 0.0
+        self.total_time = 0.0
+
+    @property
+    def rate(self) -> float | None:
+        """Max frequency of system runs in Hz.
+
+        :getter: yes
+        :setter: yes, None or 0 to run every tick
+        :type: float
+        """
+
+        return 1000.0 / self._period if self._period else None
+
+    @rate.setter
+    def rate(self, value: float | None) -> None:
+        if value is not None and value < 0:
+            raise ValueError("System rate must be positive.")
+
+        self._period = 1000.0 / value if value else 0.0
+        self._pending = 0
+
+    @property
+    def mean_time(self) -> float:
+        """Mean wall time of system run in milliseconds."""
+
+        return self.total_time / self.calls if self.calls else 0.0
+
+    def run(self, dt: int) -> None:
+        """Run system if it's enabled and its time has come.
+
+        :param dt: time delta in milliseconds
+        """
+
+        if not self.enabled:
+            return
+
+        if self._period:
+            self._pending += dt
+            if self._pending < self._period:
+                return
+            dt, self._pending = self._pending, 0
+
+        start = time.perf_counter()
+        self.func(dt)
+        self.last_time = (time.perf_counter() - start) * 1000
+
+        self.calls += 1
+        self.total_time += self.last_time
+
+
+class Scheduler:
+    """Run systems by phases."""
+
+    def __init__(self) -> None:
+        self._systems = {}
+        self._phases = {phase: [] for phase in Phase}
+        self.profiler = None
+        """Optional :class:`xoinvader.profiler.FrameProfiler`."""
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._systems
+
+    def __getitem__(self, name: str) -> ScheduledSystem:
+        return self._systems[name]
+
+    @property
+    def systems(self) -> list[ScheduledSystem]:
+        """All systems in order of execution."""
+
+        return [system for phase in Phase for system in self._phases[phase]]
+
+    def add(
+        self,
+        name: str,
+        func: Callable,
+        phase: Phase,
+        rate: float | None = None,
+        before: str | None = None,
+    ) -> ScheduledSystem:
+        """Schedule new system.
+
+        :param name: unique system name
+        :param func: system callable, takes time delta in milliseconds
+        :param phase: phase to run system in
+        :param rate: max frequency of system runs in Hz, None - every tick
+        :param before: name of system of the same phase to run before,
+        system is appended to the phase if not provided
+        :raise SystemAlreadyScheduled: if name is already used
+        """
+
+        if name in self._systems:
+            raise SystemAlreadyScheduled(name)
+
+        system = ScheduledSystem(name, func, phase, rate)
+        systems = self._phases[phase]
+
+        if before is None:
+            systems.append(system)
+        else:
+            other = self._systems[before]
+            if other.phase != phase:
+                raise ValueError(f"System '{before}' belongs to {other.phase.name} phase.")
+            systems.insert(systems.index(other), system)
+
+        self._systems[name] = system
+        return system
+
+    def remove(self, name: str) -> None:
+        """Remove system from schedule."""
+
+        system = self._systems.pop(name)
+        self._phases[system.phase].remove(system)
+
+    def run_phase(self, phase: Phase, dt: int) -> None:
+        """Run all systems of the phase.
+
+        :param phase: phase to run
+        :param dt: time delta in milliseconds
+        """
+
+        profiler = self.profiler
+        if profiler is None or not profiler.enabled:
+            for system in self._phases[phase]:
+                system.run(dt)
+            return
+
+        for system in self._phases[phase]:
+            calls = system.calls
+            system.run(dt)
+            if system.calls != calls:
+                profiler.record(system.name, system.last_time)
+
+    def run(self, dt: int, first: Phase = Phase.INPUT, last: Phase = Phase.RENDER) -> None:
+        """Run phases from first to last inclusive.
+
+        :param dt: time delta in milliseconds
+        :param first: first phase to run
+        :param last: last phase to run
+        """
+
+        for phase in Phase:
+            if first <= phase <= last:
+                self.run_phase(phase, dt)
+
+    def stats(self) -> dict[str, tuple[int, float, float]]:
+        """Return system timings.
+
+        :return: mapping name -> (calls, last time, mean time), times are
+        in milliseconds
+        """
+
+        return {
+            system.name: (system.calls, system.last_time, system.mean_time)
+            for system in self.systems
+        }
@@ -1,14 +1,14 @@
 """Enemy and player ships."""
 
+import functools
 import logging
-import random
 
 from xo1 import Renderable, Surface
 
 from xoinvader import app, collision
 from xoinvader.animation import AnimationManager
 from xoinvader.collision import Collider
-from xoinvader.common import _ROOT, Settings, get_config
+from xoinvader.common import _ROOT, RNG, Settings, get_config, load_surface
 from xoinvader.pickup import Pickup
 from xoinvader.utils import InfiniteList, Point, clamp
 from xoinvader.weapon import UM, Blaster, EBlaster, Laser, Weapon
@@ -20,6 +20,13 @@ LOG = logging.getLogger(__name__)
 CONFIG = get_config().ship
 
 
+@functools.cache
+def load_image(path) -> Surface:
+    """Load ship image, loaded images are shared between ships."""
+
+    return load_surface(path)
+
+
 # Think about composition
 class Ship(Renderable):
     """Base class for all ships. Contains basic ship logic."""
@@ -236,7 +243,7 @@ class GenericXEnemy(Ship):
 
     def __init__(self, pos) -> None:
         super().__init__(pos)
-        self._image = Surface.from_file(_ROOT / (CONFIG[self.type]["image"]))
+        self._image = load_image(_ROOT / (CONFIG[self.type]["image"]))
 
         self._collider = Collider.simple(self)
 
@@ -246,7 +253,7 @@ class GenericXEnemy(Ship):
 
         self._destroyed_by_player = False
 
-        self._animgr = AnimationManager()
+        self._animgr = AnimationManager(getattr(app.current().state, "animations", None))
 
     # TODO: rethink this method
     #       Problem of emerging such methods is more complex problem
@@ -256,7 +263,7 @@ class GenericXEnemy(Ship):
 
     def _maybe_drop_something(self) -> None:
         drop_chance = 0.4
-        if 1 - random.random() > drop_chance:
+        if 1 - RNG.random() > drop_chance:
             return
 
         drop = Pickup.from_droptable(self)
@@ -269,6 +276,12 @@ class GenericXEnemy(Ship):
         super().take_damage(amount)
         if self._hull <= 0:
             self._destroyed_by_player = True
+            # Wrecked ship stays in place until it's destroyed on update.
+            self._animgr.stop()
+
+    def destroy(self) -> None:
+        self._animgr.stop()
+        super().destroy()
 
     def update(self, dt) -> None:
         if self._hull <= 0:
@@ -296,7 +309,7 @@ class PlayerShip(Ship):
 
     def __init__(self, pos) -> None:
         super().__init__(pos)
-        self.image = Surface.from_file(_ROOT / (CONFIG[self.type]["image"]))
+        self.image = load_image(_ROOT / (CONFIG[self.type]["image"]))
 
         # FIXME: Center the ship where it's created
         self._pos = Point(
@@ -353,3 +366,27 @@ class PlayerShip(Ship):
     def collide(self, other, rect) -> None:
         self.take_damage(other.damage)
         other.destroy()
+
+
+def spawn_formation(ship_class, positions, clips=None) -> list[Ship]:
+    """Create ships of one type in batch.
+
+    Ships share image and collider geometry, colliders are registered in
+    collision manager at once. Add returned list to state with single call.
+
+    :param type ship_class: ship class
+    :param positions: (x, y) positions of ships
+    :param clips: position animation clips relative to ship position per
+    ship, None items or None for ships without animation
+    :return: created ships in order of positions
+    """
+
+    with app.current().state.collision.batch():
+        ships = [ship_class(Point(x, y)) for x, y in positions]
+
+    if clips is not None:
+        for ship, (x, y), clip in zip(ships, positions, clips):
+            if clip is not None:
+                ship.add_animation("", ship, "_pos", clip=clip, offset=Point(x, y))
+
+    return ships
@@ -0,0 +1,214 @@
+"""Snapshot of parsed TOML files.
+
+Pure-Python TOML parser is a noticeable share of game start. Snapshot keeps
+parsed data of config, level and sprite files in one marshal file. Entry is
+reused while source file has the same modification time and size, or the
+same content digest if only modification time changed, otherwise source is
+parsed again. Changed snapshot is written back by :meth:`TomlSnapshot.save`.
+
+Snapshot is stored in user cache directory, so source and installed trees
+stay clean. It can be built ahead of game start with
+`xoigame --build-snapshot`.
+"""
+
+import hashlib
+import logging
+import marshal
+import os
+import pathlib
+import sys
+import threading
+
+import toml
+
+
+LOG = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+"""Format version, snapshot of other version is ignored."""
+
+_HEADER = ("xoinvader-snapshot", SNAPSHOT_VERSION, sys.implementation.cache_tag)
+
+
+def cache_dir() -> pathlib.Path:
+    """Return user cache directory of the game.
+
+    It's `$XDG_CACHE_HOME/xoinvader`, or `~/.cache/xoinvader` if variable
+    isn't set or isn't absolute path.
+    """
+
+    base = os.environ.get("XDG_CACHE_HOME", "")
+    if not os.path.isabs(base):
+        base = os.path.join(os.path.expanduser("~"), ".cache")
+    return pathlib.Path(base) / "xoinvader"
+
+
+def plain(value):
+    """Convert parsed TOML into builtin types marshal can store.
+
+    Parser creates inline tables as dict subclasses, marshal accepts only
+    exact builtin types.
+    """
+
+    if isinstance(value, dict):
+        return {key: plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [plain(item) for item in value]
+    return value
+
+
+def digest(content: bytes) -> bytes:
+    """Return digest of source file content."""
+
+    return hashlib.blake2b(content, digest_size=16).digest()
+
+
+class TomlSnapshot:
+    """Cache of parsed TOML files backed by snapshot file.
+
+    Snapshot file is read on first load. Returned data is shared between
+    callers and with snapshot, it must not be changed.
+
+    :param path: snapshot file
+    """
+
+    def __init__(self, path) -> None:
+        self._path = path
+        self._entries = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @property
+    def path(self):
+        """Snapshot file.
+
+        :getter: yes
+        :setter: yes, loaded entries are dropped
+        :type: :class:`pathlib.Path`
+        """
+        return self._path
+
+    @path.setter
+    def path(self, value) -> None:
+        """Setter."""
+        with self._lock:
+            self._path = value
+            self._entries = None
+            self._dirty = False
+
+    @property
+    def dirty(self):
+        """If snapshot has entries not saved to file.
+
+        :getter: yes
+        :setter: no
+        :type: bool
+        """
+        return self._dirty
+
+    def _read(self) -> dict:
+        """Read entries from snapshot file, empty if it's missing or stale."""
+
+        try:
+            with open(self._path, "rb") as fd:
+                # Snapshot is local cache written by this class, not external
+                # input. Header pins format and interpreter, and every entry
+                # is checked against source by stat or blake2b digest.
+                header, entries = marshal.load(fd)  # noqa: S302
+        except FileNotFoundError:
+            return {}
+        except (OSError, EOFError, ValueError, TypeError) as exc:
+            LOG.warning("Snapshot %s is ignored: %s", self._path, exc)
+            return {}
+
+        if header != _HEADER or not isinstance(entries, dict):
+            LOG.info("Snapshot %s is ignored: format changed", self._path)
+            return {}
+
+        return entries
+
+    def _get_entries(self) -> dict:
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._read()
+            return self._entries
+
+    def load(self, source) -> dict:
+        """Return parsed TOML file, parsing it only if it changed.
+
+        :param source: path to TOML file
+        :raise toml.TomlDecodeError: on invalid file
+        """
+
+        key = os.path.abspath(source)
+        stat = os.stat(source)
+        entry = self._get_entries().get(key)
+        if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+            return entry[3]
+
+        with open(source, "rb") as fd:
+            content = fd.read()
+        content_digest = digest(content)
+
+        if entry is not None and entry[2] == content_digest:
+            data = entry[3]
+        else:
+            LOG.debug("Parsing %s", source)
+            data = plain(toml.loads(content.decode("utf-8")))
+
+        with self._lock:
+            self._entries[key] = (stat.st_mtime_ns, stat.st_size, content_digest, data)
+            self._dirty = True
+
+        return data
+
+    def prune(self) -> None:
+        """Drop entries of removed files."""
+
+        entries = self._get_entries()
+        with self._lock:
+            for key in [key for key in entries if not os.path.exists(key)]:
+                del entries[key]
+                self._dirty = True
+
+    def save(self) -> None:
+        """Write snapshot file if it has changed entries.
+
+        Errors are logged, game runs without snapshot then.
+        """
+
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = dict(self._entries)
+            self._dirty = False
+
+        temp = f"{self._path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            with open(temp, "wb") as fd:
+                marshal.dump((_HEADER, entries), fd)
+            # Readers see either old or new snapshot, never partial one.
+            os.replace(temp, self._path)
+        except (OSError, ValueError) as exc:
+            LOG.warning("Snapshot %s is not saved: %s", self._path, exc)
+            with self._lock:
+                self._dirty = True
+            return
+
+        LOG.debug("Snapshot %s is saved: %s files", self._path, len(entries))
+
+    def build(self, roots) -> int:
+        """Parse all TOML files under directories and save snapshot.
+
+        :param roots: directories to search TOML files in
+        :return: number of files in snapshot
+        """
+
+        paths = sorted(path for root in roots for path in pathlib.Path(root).rglob("*.toml"))
+        for path in paths:
+            self.load(path)
+
+        self.prune()
+        self.save()
+        return len(self._get_entries())
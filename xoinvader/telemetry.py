@@ -0,0 +1,254 @@
+"""Per-frame telemetry export and analysis.
+
+Telemetry sink is a frame listener that writes one JSON object per frame
+into JSON-lines file. Records are buffered and written by background thread,
+so game loop never waits for disk.
+
+Record fields:
+
+* ``frame`` - frame number
+* ``dt`` - frame time in milliseconds, simulated one in headless mode
+* ``wall`` - measured wall time of frame's work in milliseconds
+* ``objects`` - number of state objects
+* ``colliders`` - number of live colliders
+* ``pairs`` - collider pairs tested in last collision update
+* ``charges`` - number of alive weapon charges
+* ``systems`` - last wall time of scheduled systems in milliseconds
+
+Module is runnable to analyse recorded files::
+
+    $ python -m xoinvader.telemetry summary session.jsonl
+    $ python -m xoinvader.telemetry compare base.jsonl new.jsonl
+"""
+
+import argparse
+import json
+import logging
+import queue
+import sys
+import threading
+
+from xoinvader.utils import percentile
+
+
+LOG = logging.getLogger(__name__)
+
+BATCH_SIZE = 64
+"""Number of records passed to writer thread at once."""
+
+REGRESSION_THRESHOLD = 0.1
+"""Relative frame time growth treated as regression."""
+
+MIN_REGRESSION = 0.05
+"""Absolute time growth in milliseconds ignored as timer noise."""
+
+
+class TelemetrySink:
+    """Buffered JSON-lines telemetry writer.
+
+    :param str path: file to write records to
+    :param int batch_size: number of records buffered before hand off to
+    writer thread
+    """
+
+    def __init__(self, path: str, batch_size: int = BATCH_SIZE) -> None:
+        self._path = path
+        self._batch_size = batch_size
+        self._buffer = []
+        self._queue = queue.SimpleQueue()
+        self._fd = open(path, "w", encoding="utf-8")
+        self._thread = threading.Thread(
+            target=self._write, name="telemetry", daemon=True
+        )
+        self._thread.start()
+
+    def _write(self) -> None:
+        """Writer thread loop, None in queue stops it."""
+
+        encoder = json.JSONEncoder(separators=(",", ":"))
+        while (batch := self._queue.get()) is not None:
+            self._fd.write("".join(encoder.encode(record) + "\n" for record in batch))
+        self._fd.close()
+
+    def write(self, record: dict) -> None:
+        """Buffer record for writing."""
+
+        self._buffer.append(record)
+        if len(self._buffer) >= self._batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Pass buffered records to writer thread."""
+
+        if self._buffer:
+            self._queue.put(self._buffer)
+            self._buffer = []
+
+    def close(self) -> None:
+        """Write remaining records and wait for writer thread."""
+
+        if not self._thread.is_alive():
+            return
+
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+        LOG.info("Telemetry is saved to %s", self._path)
+
+    def on_frame(self, app, dt: int) -> None:
+        """Frame listener, writes record of finished frame."""
+
+        state = app.state
+        record = {
+            "frame": app.frame_count,
+            "dt": dt,
+            "wall": round(app.frame_time, 3),
+            "objects": len(state._objects),  # pylint: disable=protected-access
+        }
+
+        collision = getattr(state, "collision", None)
+        if collision is not None:
+            record["colliders"] = len(collision._colliders)  # pylint: disable=protected-access
+            record["pairs"] = collision.pairs_tested
+
+        charges = getattr(state, "charges", None)
+        if charges is not None:
+            record["charges"] = len(charges)
+
+        scheduler = getattr(state, "scheduler", None)
+        if scheduler is not None:
+            record["systems"] = {
+                system.name: round(system.last_time, 3) for system in scheduler.systems
+            }
+
+        self.write(record)
+
+
+def load(path: str) -> list[dict]:
+    """Load telemetry records from file."""
+
+    with open(path, encoding="utf-8") as fd:
+        return [json.loads(line) for line in fd if line.strip()]
+
+
+def summarize(records: list[dict]) -> dict[str, dict[str, float]]:
+    """Return percentiles of frame time and system timings.
+
+    :return: mapping name -> {"p50", "p95", "p99", "max"}, frame time goes
+    under "dt" name, measured frame wall time under "wall" name, total time
+    of all systems under "work" name
+    """
+
+    series = {
+        "dt": [record["dt"] for record in records],
+        "wall": [record["wall"] for record in records if "wall" in record],
+        "work": [],
+    }
+    for record in records:
+        systems = record.get("systems")
+        if not systems:
+            continue
+        series["work"].append(sum(systems.values()))
+        for name, value in systems.items():
+            series.setdefault(name, []).append(value)
+
+    summary = {}
+    for name, values in series.items():
+        if not values:
+            continue
+        values.sort()
+        summary[name] = {
+            "p50": percentile(values, 0.5),
+            "p95": percentile(values, 0.95),
+            "p99": percentile(values, 0.99),
+            "max": values[-1],
+        }
+
+    return summary
+
+
+def compare(
+    base: list[dict],
+    new: list[dict],
+    threshold: float = REGRESSION_THRESHOLD,
+    min_delta: float = MIN_REGRESSION,
+) -> list[str]:
+    """Detect frame and system time regressions.
+
+    :param base: baseline records
+    :param new: records to check
+    :param threshold: relative growth of p50 or p99 treated as regression
+    :param min_delta: growth in milliseconds below which timings are equal
+    :return: regression descriptions, empty if there are none
+    """
+
+    base_summary = summarize(base)
+    new_summary = summarize(new)
+    regressions = []
+
+    for name, old in base_summary.items():
+        current = new_summary.get(name)
+        if current is None:
+            continue
+
+        for key in ("p50", "p99"):
+            if current[key] - old[key] > max(old[key] * threshold, min_delta):
+                regressions.append(
+                    f"{name} {key}: {old[key]:.3f} -> {current[key]:.3f} ms"
+                )
+
+    return regressions
+
+
+def format_summary(summary: dict[str, dict[str, float]]) -> str:
+    """Return summary as human-readable table."""
+
+    lines = [f"{'':<12}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"]
+    for name, values in summary.items():
+        lines.append(f"{name:<12}" + "".join(f"{value:>9.3f}" for value in values.values()))
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Telemetry analysis entry point.
+
+    :return: exit code, 1 if comparison found regressions
+    """
+
+    parser = argparse.ArgumentParser(description="Analyse XOInvader telemetry.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    summary = commands.add_parser("summary", help="print timing percentiles")
+    summary.add_argument("path")
+
+    diff = commands.add_parser("compare", help="detect frame time regressions")
+    diff.add_argument("base")
+    diff.add_argument("new")
+    diff.add_argument(
+        "--threshold",
+        type=float,
+        default=REGRESSION_THRESHOLD,
+        help="relative growth treated as regression (default: %(default)s)",
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.command == "summary":
+        records = load(args.path)
+        print(f"Frames: {len(records)}")
+        print(format_summary(summarize(records)))
+        return 0
+
+    regressions = compare(load(args.base), load(args.new), args.threshold)
+    if not regressions:
+        print("No regressions.")
+        return 0
+
+    print("Regressions:")
+    for line in regressions:
+        print(f"  {line}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
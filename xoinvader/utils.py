@@ -3,10 +3,19 @@
 import copy
 import datetime
 import logging
+import math
+from array import array
 
 # FIXME: temporary backward compatibility
 from eaf.core import Vec3 as Point
 
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
 LOG_FORMAT = (
     "[%(asctime)s] %(levelname)-8s %(name)s[%(funcName)s]:%(lineno)s:  "
     "%(message)s"
@@ -59,6 +68,100 @@ def clamp(val, min_val, max_val):
     return min(max(val, min_val), max_val)
 
 
+def percentile(values, fraction):
+    """Return percentile of sorted values using nearest-rank method.
+
+    :param list values: sorted values
+    :param float fraction: percentile as fraction, e.g. 0.99
+    """
+
+    if not values:
+        raise ValueError("values must not be empty")
+
+    index = max(0, min(len(values) - 1, math.ceil(fraction * len(values)) - 1))
+    return values[index]
+
+
+def use_numpy(vectorize, name) -> bool:
+    """Resolve vectorization flag of batched system.
+
+    :param bool vectorize: requested flag, `None` means NumPy availability
+    :param str name: system name for error message
+    :raise ValueError: if vectorization is requested without NumPy
+    """
+
+    if vectorize is None:
+        return numpy is not None
+    if vectorize and numpy is None:
+        raise ValueError(f"NumPy is required for vectorized {name} system.")
+    return bool(vectorize)
+
+
+class Columns:
+    """Objects with their values kept in contiguous columns.
+
+    Struct of arrays storage of batched systems: value of object at index
+    `i` is at index `i` of every column. Removed object is replaced by the
+    last one, so removal is O(1) and storage stays dense. Columns and item
+    list are changed in place, references to them stay valid.
+
+    :param int count: number of columns
+    :param str typecode: `array.array` type code of columns
+    """
+
+    def __init__(self, count, typecode="d") -> None:
+        self.items = []
+        self.slots = {}
+        self.columns = tuple(array(typecode) for _ in range(count))
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, item) -> bool:
+        return item in self.slots
+
+    def add(self, item, *values) -> None:
+        """Append item with its values.
+
+        :param item: stored object
+        :param values: value for every column
+        :raise ValueError: if number of values doesn't match columns
+        """
+
+        if len(values) != len(self.columns):
+            raise ValueError(f"Expected {len(self.columns)} values, got {len(values)}.")
+
+        self.slots[item] = len(self.items)
+        self.items.append(item)
+        for column, value in zip(self.columns, values, strict=True):
+            column.append(value)
+
+    def remove(self, item) -> tuple:
+        """Remove item, last one takes its place.
+
+        :param item: stored object
+        :return: values of removed item
+        :raise KeyError: if item isn't stored
+        """
+
+        index = self.slots.pop(item)
+        values = tuple(column[index] for column in self.columns)
+
+        last = len(self.items) - 1
+        if index != last:
+            moved = self.items[last]
+            self.items[index] = moved
+            self.slots[moved] = index
+            for column in self.columns:
+                column[index] = column[last]
+
+        self.items.pop()
+        for column in self.columns:
+            column.pop()
+
+        return values
+
+
 class dotdict(dict):  # pylint: disable=invalid-name
     """Container for dot elements access."""
 